@@ -0,0 +1,45 @@
+"""Shared evaluation engine for mmJEE-Eval and JEEBench runs.
+
+Typical use from a notebook in ``eval/``::
+
+    from engine import Evaluator, MMJEE, create_backend, load_mmjee
+
+    backend = create_backend('gemini', api_keys=API_KEYS, model_name="gemini-2.5-pro")
+    evaluator = Evaluator(backend, load_mmjee(BASE_PATH), MMJEE, "gemini25_evaluation_results",
+                          run_prefix="gemini25", num_runs=10, image_dir=IMAGE_DIR)
+    await evaluator.run_evaluation()
+"""
+from .accumulator import AccuracyAccumulator, RunningStats
+from .accuracy_cube import AccuracyCube
+from .answer_key import AnswerKey, GoldAnswer, load_answer_key
+from .backends import BACKENDS, GenerationRequest, ModelBackend, create_backend, register_backend
+from .batch_scoring import BatchScorer, rescore_runs
+from .bootstrap import paired_bootstrap
+from .cache import ResponseCache
+from .correctness import CorrectnessTensor
+from .datasets import JEEBENCH, MMJEE, MULTIPLE, NUMERICAL, SINGLE, DatasetProfile, load_jeebench, load_mmjee
+from .evaluator import Evaluator
+from .passk import RunMatrix, pass_at_k, run_metrics
+from .prompts import create_question_prompt
+from .ratelimit import GCRA, KeyRateLimiter
+from .report import (analyze_convergence_and_variance, build_final_report, calculate_statistics, convergence_analysis,
+                     find_optimal_k)
+from .responses import ResponseStore
+from .run_loader import AllOf, LongerThan, is_incorrect, iter_results, load_runs
+from .scoring import extract_answer, extract_answer_with_rule, is_answer_correct
+from .state import EvaluationState, StateStore
+from .stopping import StoppingRule
+from .tensor_store import TensorStore
+from .warehouse import Warehouse
+
+__all__ = [
+    'AccuracyAccumulator', 'AccuracyCube', 'AllOf', 'AnswerKey', 'BACKENDS', 'BatchScorer',
+    'CorrectnessTensor', 'DatasetProfile', 'EvaluationState', 'Evaluator', 'GCRA', 'GenerationRequest',
+    'GoldAnswer', 'JEEBENCH', 'KeyRateLimiter', 'LongerThan', 'MMJEE', 'MULTIPLE', 'ModelBackend',
+    'NUMERICAL', 'ResponseCache', 'ResponseStore', 'RunMatrix', 'RunningStats', 'SINGLE', 'StateStore',
+    'StoppingRule', 'TensorStore', 'Warehouse', 'analyze_convergence_and_variance', 'build_final_report',
+    'calculate_statistics', 'convergence_analysis', 'create_backend', 'create_question_prompt',
+    'extract_answer', 'extract_answer_with_rule', 'find_optimal_k', 'is_answer_correct', 'is_incorrect',
+    'iter_results', 'load_answer_key', 'load_jeebench', 'load_mmjee', 'load_runs', 'paired_bootstrap',
+    'pass_at_k', 'register_backend', 'rescore_runs', 'run_metrics',
+]
@@ -0,0 +1,140 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from scipy import stats
+
+
+@dataclass
+class RunningStats:
+    """Welford mean/variance of a stream of values: O(1) per value, numerically stable"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # Sum of squared deviations from the running mean
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1)"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    @property
+    def sem(self) -> float:
+        return self.std / math.sqrt(self.count) if self.count > 1 else 0.0
+
+    def confidence_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """t-interval of the mean; collapses to the mean below two values or with zero spread"""
+        if self.count < 2 or self.sem == 0:
+            return self.mean, self.mean
+        half_width = stats.t.ppf((1 + confidence) / 2, self.count - 1) * self.sem
+        return self.mean - half_width, self.mean + half_width
+
+
+def convergence_curve(values: Sequence[float], confidence: float = 0.95) -> Dict[str, np.ndarray]:
+    """Running mean, std, SEM and t-interval of every prefix of values, from cumulative sums
+
+    Entry i describes the first i + 1 values. Sums are taken around the first
+    value, which keeps the one-pass variance accurate for accuracies that sit
+    far from zero.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    k = np.arange(1, len(values) + 1, dtype=np.float64)
+    if not len(values):
+        empty = np.zeros(0)
+        return {'k': k, 'mean': empty, 'std': empty, 'sem': empty, 'ci_low': empty, 'ci_high': empty}
+
+    deviations = values - values[0]
+    sums = np.cumsum(deviations)
+    squares = np.cumsum(deviations * deviations)
+    mean = values[0] + sums / k
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = np.where(k > 1, np.maximum(squares - sums * sums / k, 0.0) / (k - 1), 0.0)
+        std = np.sqrt(variance)
+        sem = std / np.sqrt(k)
+        half_width = np.where(k > 1, stats.t.ppf((1 + confidence) / 2, np.maximum(k - 1, 1)) * sem, 0.0)
+    return {'k': k, 'mean': mean, 'std': std, 'sem': sem, 'ci_low': mean - half_width, 'ci_high': mean + half_width}
+
+
+class AccuracyAccumulator:
+    """Running statistics of a sweep, updated as runs complete instead of recomputed from every run file
+
+    ``add_run`` folds a finished run in: its accuracy into a Welford
+    accumulator over runs, each of its answers into correct/total counters per
+    value of every ``categories`` field (subject, question_type, ...) and into
+    timing and token totals. Means, SEM, CIs and breakdowns are then read off in
+    constant time, and the full convergence curve comes from one vectorized
+    pass over the run accuracies (``convergence_curve``).
+    """
+
+    def __init__(self, categories: Iterable[str] = ()):
+        self.categories = tuple(categories)
+        self.runs = RunningStats()
+        self.run_accuracies: List[float] = []
+        self.slices: Dict[str, Dict] = {category: {} for category in self.categories}
+        self.answered = 0
+        self.correct = 0
+        self.inference_time = 0.0
+        self.total_tokens = 0.0  # Backends that report usage
+        self.duration = 0.0
+
+    @classmethod
+    def from_run_summaries(cls, all_run_summaries: Iterable[Dict],
+                           categories: Iterable[str] = ()) -> 'AccuracyAccumulator':
+        accumulator = cls(categories)
+        for run_summary in all_run_summaries:
+            accumulator.add_run(run_summary)
+        return accumulator
+
+    def add_result(self, result: Dict):
+        """Count one answered question"""
+        self.answered += 1
+        self.correct += bool(result['is_correct'])
+        self.inference_time += result.get('inference_time', 0.0)
+        self.total_tokens += result.get('total_tokens') or 0
+        for category in self.categories:
+            counts = self.slices[category].setdefault(result.get(category, 'Unknown'), [0, 0])
+            counts[0] += bool(result['is_correct'])
+            counts[1] += 1
+
+    def add_run(self, run_summary: Dict):
+        """Fold a completed run into the statistics"""
+        self.runs.add(run_summary['accuracy'])
+        self.run_accuracies.append(run_summary['accuracy'])
+        self.duration += run_summary.get('duration', 0.0)
+        for result in run_summary['results']:
+            self.add_result(result)
+
+    @property
+    def num_runs(self) -> int:
+        return self.runs.count
+
+    def statistics(self, confidence: float = 0.95) -> Dict:
+        """Same fields as calculate_statistics"""
+        return {
+            'num_runs': self.runs.count,
+            'mean_accuracy': self.runs.mean,
+            'std_accuracy': self.runs.std,
+            'sem_accuracy': self.runs.sem,
+            'min_accuracy': self.runs.minimum,
+            'max_accuracy': self.runs.maximum,
+            'confidence_interval_95': self.runs.confidence_interval(confidence),
+            'individual_accuracies': list(self.run_accuracies),
+        }
+
+    def convergence(self, confidence: float = 0.95) -> Dict[str, np.ndarray]:
+        return convergence_curve(self.run_accuracies, confidence)
+
+    def breakdown(self, category: str) -> Dict:
+        """{value: {'correct', 'total'}} answers per value of a category field"""
+        return {value: {'correct': correct, 'total': total}
+                for value, (correct, total) in self.slices.get(category, {}).items()}
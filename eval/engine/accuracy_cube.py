@@ -0,0 +1,150 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .state import write_json_atomic
+from .tensor_store import TensorStore
+
+logger = logging.getLogger(__name__)
+
+ACCURACY_CUBE_VERSION = 1
+CUBE_FILE = 'accuracy_cube.json'
+# Question-level dimensions, looked up in the store's question table (requires_image after store.annotate)
+QUESTION_DIMENSIONS = ('subject', 'question_type', 'language', 'year', 'requires_image')
+DIMENSIONS = ('model', 'run_id', *QUESTION_DIMENSIONS)
+
+
+def _question_cells(questions: pd.DataFrame):
+    """Cell index of every question, the dimension values of every cell and a fingerprint of both"""
+    values = pd.DataFrame({dimension: questions[dimension] if dimension in questions.columns else None
+                           for dimension in QUESTION_DIMENSIONS}, index=questions.index)
+    codes = values.groupby(list(QUESTION_DIMENSIONS), dropna=False, sort=False).ngroup().to_numpy()
+    _, first = np.unique(codes, return_index=True)
+    cells = values.iloc[first].reset_index(drop=True)
+    fingerprint = hashlib.sha1(pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy().tobytes())
+    return codes, cells, fingerprint.hexdigest()
+
+
+class AccuracyCube:
+    """(correct, total) answer counts per model × run × subject × question type × language × year × requires_image
+
+    Built from a TensorStore and saved next to it as ``accuracy_cube.json``;
+    ``from_store`` recounts only the runs the store added or replaced since
+    the cube was saved (all of them when the question table changed, e.g.
+    after ``store.annotate``). Every table and figure is then a roll-up of a
+    few thousand cells instead of a group-by over every answer::
+
+        cube = AccuracyCube.from_store(store)
+        cube.rollup(['model', 'subject'], where={'year': 2025})
+        cube.pivot('model', 'language')
+        cube.across_runs(['model'], where={'year': lambda year: year < 2025})
+    """
+
+    def __init__(self, cells: pd.DataFrame):
+        self.cells = cells
+
+    @classmethod
+    def load(cls, path) -> 'AccuracyCube':
+        """Saved cube (a store directory or the cube file itself), without opening the store"""
+        path = Path(path)
+        path = path / CUBE_FILE if path.is_dir() else path
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(pd.DataFrame(json.load(f)['cells']))
+
+    @classmethod
+    def from_store(cls, store: TensorStore, path=None) -> 'AccuracyCube':
+        """Cube of every run in the store, updated incrementally and saved (in the store directory by default)"""
+        path = Path(path) if path else store.directory / CUBE_FILE
+        codes, cell_values, fingerprint = _question_cells(store.questions)
+
+        saved_runs, cells = {}, None
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('version') == ACCURACY_CUBE_VERSION and saved.get('questions') == fingerprint:
+                saved_runs = {(entry['model'], entry['run_id']): entry for entry in saved['runs']}
+                cells = pd.DataFrame(saved['cells'])
+
+        runs = [{'model': entry['model'], 'run_id': entry['run_id'], 'offset': entry['offset'],
+                 'count': entry['count'], 'partial': entry['partial']} for entry in store.run_entries]
+        current = {(run['model'], run['run_id']) for run in runs}
+        changed = [run for run in runs if saved_runs.get((run['model'], run['run_id'])) != run]
+        if not changed and cells is not None and current == set(saved_runs):
+            return cls(cells)
+
+        frames = []
+        if cells is not None and len(cells):
+            keep = {key for key in current if key in saved_runs} - {(run['model'], run['run_id']) for run in changed}
+            run_keys = pd.Series(list(zip(cells['model'], cells['run_id'])), index=cells.index)
+            frames.append(cells[run_keys.isin(keep)])
+        for run in changed:
+            columns = store.run(run['model'], run['run_id'])
+            cell = codes[np.asarray(columns['question'], dtype=np.int64)]
+            total = np.bincount(cell, minlength=len(cell_values))
+            correct = np.bincount(cell, weights=columns['correct'], minlength=len(cell_values)).astype(np.int64)
+            present = np.flatnonzero(total)
+            frame = cell_values.iloc[present].reset_index(drop=True)
+            frame.insert(0, 'model', run['model'])
+            frame.insert(1, 'run_id', run['run_id'])
+            frame['partial'] = run['partial']
+            frame['correct'] = correct[present]
+            frame['total'] = total[present]
+            frames.append(frame)
+
+        columns = [*DIMENSIONS, 'partial', 'correct', 'total']
+        frames = [frame for frame in frames if len(frame)]
+        cells = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+        write_json_atomic(path, {'version': ACCURACY_CUBE_VERSION, 'questions': fingerprint, 'runs': runs,
+                                 'cells': {column: cells[column].tolist() for column in columns}})
+        logger.info(f"🧊 Counted {len(changed)} runs into {path} ({len(cells):,} cells)")
+        return cls(cells)
+
+    # --- queries
+
+    def select(self, where: Optional[Dict] = None, include_partial: bool = True) -> pd.DataFrame:
+        """Cells matching where: {dimension: value, list of values, or function of the column returning a mask}"""
+        mask = np.ones(len(self.cells), dtype=bool)
+        if not include_partial:
+            mask &= ~self.cells['partial'].to_numpy(dtype=bool)
+        for dimension, value in (where or {}).items():
+            column = self.cells[dimension]
+            if callable(value):
+                mask &= np.asarray(value(column), dtype=bool)
+            elif isinstance(value, (list, tuple, set, range)):
+                mask &= column.isin(list(value)).to_numpy()
+            else:
+                mask &= (column == value).to_numpy()
+        return self.cells[mask]
+
+    def rollup(self, by: Sequence[str] = ('model',), where: Optional[Dict] = None,
+               include_partial: bool = True) -> pd.DataFrame:
+        """Correct answers, answers and accuracy (%) per group of the matching cells (one row overall for by=())"""
+        by = list(by)
+        cells = self.select(where, include_partial)
+        if by:
+            summary = cells.groupby(by, dropna=False)[['correct', 'total']].sum().reset_index()
+        else:
+            summary = pd.DataFrame({'correct': [cells['correct'].sum()], 'total': [cells['total'].sum()]})
+        with np.errstate(invalid='ignore', divide='ignore'):
+            summary['accuracy'] = summary['correct'] / summary['total'] * 100
+        return summary
+
+    def pivot(self, index: str = 'model', columns: str = 'language', where: Optional[Dict] = None,
+              values: str = 'accuracy', include_partial: bool = True) -> pd.DataFrame:
+        """index × columns table of accuracy (%), correct or total, e.g. for a heatmap; unlabelled cells left out"""
+        summary = self.rollup([index, columns], where, include_partial).dropna(subset=[index, columns])
+        return summary.pivot(index=index, columns=columns, values=values)
+
+    def across_runs(self, by: Sequence[str] = ('model',), where: Optional[Dict] = None,
+                    include_partial: bool = True) -> pd.DataFrame:
+        """Mean, std, min and max over runs of each run's accuracy (%) per group"""
+        by = list(by)
+        per_run = self.rollup(['model', 'run_id', *[column for column in by if column not in ('model', 'run_id')]],
+                              where, include_partial)
+        summary = per_run.groupby(by, dropna=False)['accuracy'].agg(['mean', 'std', 'min', 'max', 'size'])
+        return summary.rename(columns={'size': 'runs'}).reset_index()
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, Optional
+
+import pandas as pd
+
+from .datasets import MULTIPLE, NUMERICAL, SINGLE, DatasetProfile
+from .scoring import _acceptable_values
+from .state import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+LETTERS = 'ABCD'
+ANSWER_KEY_VERSION = 1
+
+
+def letter_mask(text: str) -> int:
+    """Bitmask of the choice letters A-D appearing in an (upper-case) answer, A = bit 0"""
+    return sum(1 << i for i, letter in enumerate(LETTERS) if letter in text)
+
+
+def _parse_float(text: str) -> Optional[float]:
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class GoldAnswer:
+    """Gold answer of one question, parsed once into the form its kind is scored in
+
+    ``text`` is the normalized gold string every kind falls back to. Letter
+    questions carry ``mask`` (MCQ) and ``choice`` (single-letter answers, e.g.
+    Matching; -1 otherwise). Numerical questions carry the accepted values when
+    the dataset lists them, and the tolerance interval ``center ± tolerance``
+    (center is NaN when the gold answer is not a number).
+    """
+    kind: Optional[str]
+    text: str
+    mask: int = 0
+    choice: int = -1
+    center: float = math.nan
+    tolerance: float = 0.0
+    accepted: Optional[FrozenSet[float]] = None
+
+    @classmethod
+    def from_row(cls, question_data: pd.Series, profile: DatasetProfile) -> 'GoldAnswer':
+        text = str(question_data[profile.answer_column]).strip().upper()
+        kind = profile.kind(question_data[profile.type_column])
+        if kind in (SINGLE, MULTIPLE):
+            return cls(kind, text, mask=letter_mask(text), choice=LETTERS.find(text) if len(text) == 1 else -1)
+        if kind == NUMERICAL:
+            center = _parse_float(text)
+            center = math.nan if center is None else center
+            accepted = _acceptable_values(question_data)
+            return cls(kind, text, center=center,
+                       tolerance=abs(center) * 0.01 if abs(center) > 1 else 0.01,
+                       accepted=frozenset(accepted) if accepted is not None else None)
+        return cls(kind, text)
+
+    def is_correct(self, predicted_answer: str) -> bool:
+        """Same verdict as is_answer_correct, without touching the dataset row"""
+        predicted = str(predicted_answer).strip().upper()
+        if self.kind == SINGLE:
+            return predicted == self.text
+        if self.kind == MULTIPLE:
+            return letter_mask(predicted) == self.mask
+        if self.kind == NUMERICAL:
+            value = _parse_float(predicted)
+            if self.accepted is not None and value is not None:
+                return value in self.accepted
+            if predicted == self.text:
+                return True
+            return value is not None and abs(value - self.center) <= self.tolerance
+        return predicted == self.text
+
+    def to_record(self) -> list:
+        return [self.kind, self.text, self.mask, self.choice, self.center, self.tolerance,
+                sorted(self.accepted) if self.accepted is not None else None]
+
+    @classmethod
+    def from_record(cls, record: list) -> 'GoldAnswer':
+        kind, text, mask, choice, center, tolerance, accepted = record
+        return cls(kind, text, mask, choice, math.nan if center is None else center, tolerance,
+                   frozenset(accepted) if accepted is not None else None)
+
+
+class AnswerKey:
+    """Question id -> GoldAnswer for a whole dataset, built once instead of parsed per question and run
+
+    Build it from the question table with ``AnswerKey.from_frame``, or from the
+    dataset CSV with ``load_answer_key``, which keeps a parsed copy on disk.
+    """
+
+    def __init__(self, answers: Dict[str, GoldAnswer], profile_name: str):
+        self.answers = answers
+        self.profile_name = profile_name
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, profile: DatasetProfile) -> 'AnswerKey':
+        answers = {str(question_data[profile.id_column]): GoldAnswer.from_row(question_data, profile)
+                   for _, question_data in df.iterrows()}
+        if len(answers) < len(df):
+            logger.warning(f"{len(df) - len(answers)} duplicate question ids in {profile.name}; the last row wins")
+        return cls(answers, profile.name)
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def __contains__(self, question_id) -> bool:
+        return str(question_id) in self.answers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.answers)
+
+    def __getitem__(self, question_id) -> GoldAnswer:
+        return self.answers[str(question_id)]
+
+    def is_correct(self, question_id, predicted_answer: str) -> bool:
+        return self.answers[str(question_id)].is_correct(predicted_answer)
+
+    def save(self, path, source_digest: str):
+        write_json_atomic(path, {
+            'version': ANSWER_KEY_VERSION,
+            'profile': self.profile_name,
+            'source_digest': source_digest,
+            'answers': {question_id: answer.to_record() for question_id, answer in self.answers.items()},
+        })
+
+
+def load_answer_key(csv_path, profile: DatasetProfile, cache_path=None) -> AnswerKey:
+    """Answer key of a dataset CSV, read from ``{csv stem}.answer_key.json`` while the CSV is unchanged"""
+    csv_path = Path(csv_path)
+    cache_path = Path(cache_path) if cache_path else csv_path.with_name(f"{csv_path.stem}.answer_key.json")
+    with open(csv_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if (cached.get('version') == ANSWER_KEY_VERSION and cached.get('profile') == profile.name
+                    and cached.get('source_digest') == digest):
+                return AnswerKey({question_id: GoldAnswer.from_record(record)
+                                  for question_id, record in cached['answers'].items()}, profile.name)
+            logger.info(f"Answer key cache {cache_path} is stale, rebuilding")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not read answer key cache {cache_path}: {e}")
+
+    answer_key = AnswerKey.from_frame(pd.read_csv(csv_path), profile)
+    try:
+        answer_key.save(cache_path, digest)
+    except OSError as e:
+        logger.warning(f"Could not write answer key cache {cache_path}: {e}")
+    return answer_key
@@ -0,0 +1,26 @@
+from typing import Dict, Type
+
+from .base import GenerationRequest, ModelBackend
+
+BACKENDS: Dict[str, Type[ModelBackend]] = {}
+
+
+def register_backend(name: str):
+    """Class decorator making a backend available to create_backend under name"""
+    def decorator(cls: Type[ModelBackend]) -> Type[ModelBackend]:
+        BACKENDS[name] = cls
+        return cls
+    return decorator
+
+
+def create_backend(name: str, **kwargs) -> ModelBackend:
+    """Instantiate a registered backend by name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'. Available: {sorted(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
+
+
+# Imported for their registration side effect; SDKs are only imported when a backend is created
+from . import gemini, lmstudio, openai_compatible, random_baseline  # noqa: E402,F401
+
+__all__ = ['BACKENDS', 'GenerationRequest', 'ModelBackend', 'create_backend', 'register_backend']
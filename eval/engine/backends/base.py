@@ -0,0 +1,68 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..images import ImageProfile
+
+
+@dataclass
+class GenerationRequest:
+    """Everything a backend needs to answer one question of one run"""
+    prompt: str
+    question_id: str
+    question_type: str
+    run_id: int
+    run_seed: int
+    worker_idx: int = 0
+    images: List[Path] = field(default_factory=list)
+    image_payloads: List[bytes] = field(default_factory=list)  # images preprocessed for the backend's image_profile
+    metrics: Dict[str, float] = field(default_factory=dict)  # Filled in by the backend (waits, token counts, ...)
+
+
+class ModelBackend:
+    """Base class for model backends plugged into the evaluation engine
+
+    A backend owns the connection to one model and exposes ``num_workers``
+    independent lanes (API keys, local servers, ...). The engine decides which
+    lane serves each request through ``GenerationRequest.worker_idx`` and keeps
+    up to ``max_in_flight`` requests outstanding on every lane. Backends that set
+    an ``image_profile`` get their images preprocessed and cached ahead of the run.
+    Streaming backends feed chunks to a ``StreamingExtractor`` and, with
+    ``stop_after_tokens`` set, stop generating that many tokens after a \\boxed{}.
+    """
+    name = "backend"
+    prompt_style = 'concise'
+    max_in_flight = 1
+    image_profile: Optional[ImageProfile] = None
+    stream = False
+    stop_after_tokens: Optional[int] = None
+
+    @property
+    def num_workers(self) -> int:
+        return 1
+
+    async def generate(self, request: GenerationRequest) -> Optional[str]:
+        """Return the raw model response, or None if the backend gave up on the request"""
+        raise NotImplementedError
+
+    def sampling_config(self) -> Dict:
+        """Model and generation parameters that determine the response (part of the response cache key)"""
+        return {'backend': self.name}
+
+    def stream_config(self) -> Dict:
+        """Streaming settings that change the response text (a cut-off drops what follows the answer)"""
+        if self.stream and self.stop_after_tokens is not None:
+            return {'stop_after_tokens': self.stop_after_tokens}
+        return {}
+
+    def describe(self) -> str:
+        """One-line description used in logs and final reports"""
+        return self.name
+
+    def worker_delay(self, worker_idx: int) -> float:
+        """Seconds until the worker's lane can accept another request (used to avoid hoarding work)"""
+        return 0.0
+
+    def worker_stats(self) -> Optional[List[Dict]]:
+        """Cumulative per-worker counters (requests, rate-limit waits, ...), if the backend keeps any"""
+        return None
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import re
+from typing import Dict, List, Optional
+
+from ..images import ImageProfile
+from ..ratelimit import KeyRateLimiter
+from ..scoring import StreamingExtractor
+from . import register_backend
+from .base import GenerationRequest, ModelBackend
+
+logger = logging.getLogger(__name__)
+
+# Gemini counts every image as a fixed number of input tokens
+TOKENS_PER_IMAGE = 258
+
+
+def retry_delay_from_error(error: Exception) -> Optional[float]:
+    """Read the server-suggested retry delay ("retryDelay": "37s") out of a quota error"""
+    match = re.search(r"retry[ _-]?(?:delay|in)['\"]?\s*[:=]?\s*['\"]?(\d+(?:\.\d+)?)\s*s", str(error), re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+
+@register_backend('gemini')
+class DistributedGeminiClient(ModelBackend):
+    """Truly distributed Gemini API client across multiple keys"""
+    name = 'gemini'
+    prompt_style = 'concise'
+
+    def __init__(self, api_keys: List[str], model_name: str = "gemma-3-27b-it",
+                 requests_per_minute: float = 25, tokens_per_minute: Optional[float] = None,
+                 burst: float = 1, expected_output_tokens: int = 2048, max_in_flight: int = 4,
+                 generation_config: Optional[Dict] = None, image_profile: Optional[ImageProfile] = ImageProfile(),
+                 base_url: Optional[str] = None, stream: bool = False, stop_after_tokens: Optional[int] = None):
+        from google import genai
+
+        self.model_name = model_name
+        self.expected_output_tokens = expected_output_tokens
+        self.max_in_flight = max_in_flight
+        self.generation_config = generation_config  # e.g. {'temperature': 0}; None keeps the API defaults
+        self.image_profile = image_profile  # Original PNGs by default; the API resizes server-side
+        self.stream = stream or stop_after_tokens is not None
+        self.stop_after_tokens = stop_after_tokens  # Stop reading this many tokens after a \\boxed{} answer
+
+        # Validate API keys
+        valid_clients = []
+        valid_keys = []
+
+        for i, key in enumerate(api_keys):
+            if key and key != "YOUR_API_KEY_1" and len(key) > 10:  # Basic validation
+                try:
+                    # base_url points the SDK at another endpoint, e.g. the local mock server
+                    client = genai.Client(api_key=key, http_options={'base_url': base_url} if base_url else None)
+                    valid_clients.append(client)
+                    valid_keys.append(key)
+                    logger.info(f"API Key {i+1}: Valid ✓")
+                except Exception as e:
+                    logger.error(f"API Key {i+1}: Invalid - {e}")
+            else:
+                logger.warning(f"API Key {i+1}: Skipped (placeholder or empty)")
+
+        if not valid_clients:
+            raise ValueError("No valid API keys provided!")
+
+        self.clients = valid_clients
+        self.api_keys = valid_keys
+        self.rate_limiters = [
+            KeyRateLimiter(requests_per_minute, tokens_per_minute, burst=burst)
+            for _ in valid_keys
+        ]
+        # Caps concurrent calls per key; the rate limiter then spaces their start times
+        self.in_flight = [asyncio.Semaphore(max_in_flight) for _ in valid_keys]
+
+        logger.info(f"Initialized {len(valid_keys)} valid distributed Gemini clients for {model_name} "
+                    f"({requests_per_minute} RPM{f', {tokens_per_minute} TPM' if tokens_per_minute else ''}, "
+                    f"{max_in_flight} in flight per key)")
+
+    @property
+    def num_workers(self) -> int:
+        return len(self.clients)
+
+    def sampling_config(self) -> Dict:
+        return {'backend': self.name, 'model': self.model_name, 'config': self.generation_config,
+                **self.stream_config()}
+
+    def describe(self) -> str:
+        return f"{self.model_name} (via Gemini API, {len(self.clients)} keys)"
+
+    def estimate_tokens(self, request: GenerationRequest) -> int:
+        """Rough token cost of a request, charged to the TPM budget before sending"""
+        return len(request.prompt) // 4 + TOKENS_PER_IMAGE * len(request.images) + self.expected_output_tokens
+
+    def _build_contents(self, request: GenerationRequest) -> list:
+        """Images first, then the prompt, as in the OCR and mmJEE-Eval runs"""
+        if not request.images:
+            return [request.prompt]
+
+        if request.image_payloads:
+            from google.genai import types
+            return [types.Part.from_bytes(data=payload, mime_type=self.image_profile.mime_type)
+                    for payload in request.image_payloads] + [request.prompt]
+
+        from PIL import Image
+        return [Image.open(path) for path in request.images] + [request.prompt]
+
+    async def generate(self, request: GenerationRequest, max_retries: int = 3) -> Optional[str]:
+        """Generate content using specific client with rate limiting"""
+        async with self.in_flight[request.worker_idx]:
+            return await self._generate(request, max_retries)
+
+    async def _generate(self, request: GenerationRequest, max_retries: int) -> Optional[str]:
+        client_idx = request.worker_idx
+        client = self.clients[client_idx]
+        limiter = self.rate_limiters[client_idx]
+        contents = self._build_contents(request)
+        estimated_tokens = self.estimate_tokens(request)
+        request.metrics['rate_limit_wait'] = 0.0
+
+        for attempt in range(max_retries):
+            # Every attempt is a request against the key's quota
+            request.metrics['rate_limit_wait'] += await limiter.acquire(estimated_tokens)
+            try:
+                # Native async client: many calls per key in flight without tying up threads
+                if self.stream:
+                    return await self._stream(client, contents, estimated_tokens, request)
+
+                response = await client.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=contents,
+                    config=self.generation_config,
+                )
+                self._settle_usage(response, limiter, estimated_tokens, request)
+                return response.text
+
+            except Exception as e:
+                if "rate limit" in str(e).lower() or "quota" in str(e).lower() or "429" in str(e):
+                    # Back off the whole key, not just this request, so its other requests wait too
+                    wait_time = retry_delay_from_error(e) or (2 ** attempt) * 15
+                    logger.warning(f"Rate limit on client {client_idx}, attempt {attempt + 1}, pausing key for {wait_time:.0f}s")
+                    limiter.penalize(wait_time)
+                else:
+                    logger.error(f"Client {client_idx} error on attempt {attempt + 1}: {e}")
+                    if attempt == max_retries - 1:
+                        return None
+                    await asyncio.sleep(10)
+
+        return None
+
+    async def _stream(self, client, contents: list, estimated_tokens: int, request: GenerationRequest) -> Optional[str]:
+        """Stream the response into a StreamingExtractor, stopping early once the answer is in"""
+        extractor = StreamingExtractor(self.stop_after_tokens)
+        limiter = self.rate_limiters[request.worker_idx]
+        stream = await client.aio.models.generate_content_stream(
+            model=self.model_name,
+            contents=contents,
+            config=self.generation_config,
+        )
+        try:
+            async for chunk in stream:
+                # Usage arrives with the last chunks; a cut-off stream leaves the estimate in place
+                self._settle_usage(chunk, limiter, estimated_tokens, request)
+                if extractor.feed(chunk.text or ''):
+                    break
+        finally:
+            if hasattr(stream, 'aclose'):
+                await stream.aclose()
+        request.metrics.update(extractor.metrics())
+        return extractor.text
+
+    @staticmethod
+    def _settle_usage(response, limiter: KeyRateLimiter, estimated_tokens: int, request: GenerationRequest):
+        """Replace the token estimate with the usage the API reported, if it did"""
+        usage = getattr(response, 'usage_metadata', None)
+        total_tokens = getattr(usage, 'total_token_count', None) if usage else None
+        if total_tokens and total_tokens != request.metrics.get('total_tokens'):
+            limiter.settle(request.metrics.get('total_tokens', estimated_tokens), total_tokens)
+            request.metrics['total_tokens'] = total_tokens
+
+    def worker_delay(self, worker_idx: int) -> float:
+        return self.rate_limiters[worker_idx].ready_in()
+
+    def worker_stats(self) -> List[Dict]:
+        """Per-key request counts and time spent waiting on the rate limiter"""
+        return [limiter.summary() for limiter in self.rate_limiters]
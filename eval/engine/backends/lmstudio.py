@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from ..scoring import StreamingExtractor
+from . import register_backend
+from .base import GenerationRequest, ModelBackend
+
+logger = logging.getLogger(__name__)
+
+
+@register_backend('lmstudio')
+class LMStudioClient(ModelBackend):
+    """Local model client via the LM Studio SDK (InternVL3 8B, Qwen 2.5 VL 7B, ...)"""
+    name = 'lmstudio'
+    prompt_style = 'detailed'
+
+    def __init__(self, model_name: str = "internvl3-8b-instruct", config: Optional[Dict] = None,
+                 stream: bool = False, stop_after_tokens: Optional[int] = None):
+        import lmstudio as lms
+
+        self.lms = lms
+        self.model_name = model_name
+        self.config = config  # Prediction config, e.g. {'temperature': 0}; None keeps the model defaults
+        self.stream = stream or stop_after_tokens is not None
+        self.stop_after_tokens = stop_after_tokens
+
+        try:
+            # Initialize LM Studio model
+            self.model = lms.llm(model_name)
+            logger.info(f"✅ Model loaded successfully: {model_name}")
+
+            # Test the model with a simple query
+            test_response = self.model.respond("Hello, can you see this?")
+            logger.info(f"📝 Model test response: {test_response.content[:100]}...")
+
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize model {model_name}: {e}")
+            raise ValueError(f"Could not load model '{model_name}'. Please ensure LM Studio is running and the model is available.")
+
+    def sampling_config(self) -> Dict:
+        return {'backend': self.name, 'model': self.model_name, 'config': self.config, **self.stream_config()}
+
+    def describe(self) -> str:
+        return f"{self.model_name} (local, LM Studio)"
+
+    def _build_chat(self, request: GenerationRequest):
+        """Plain prompt for text questions, a chat with attached images otherwise"""
+        if not request.images:
+            return request.prompt
+
+        chat = self.lms.Chat()
+        chat.add_user_message(request.prompt, images=[self.lms.prepare_image(str(path)) for path in request.images])
+        return chat
+
+    def _respond(self, request: GenerationRequest, max_retries: int) -> Optional[str]:
+        """Blocking generation with retry logic, run on a worker thread"""
+        chat = self._build_chat(request)
+        for attempt in range(max_retries):
+            try:
+                logger.debug(f"🔄 Generating content (attempt {attempt + 1}/{max_retries})")
+
+                if self.stream:
+                    content = self._respond_stream(chat, request)
+                else:
+                    response = self.model.respond(chat, config=self.config)
+                    content = response.content if response else None
+
+                if content:
+                    return content
+                else:
+                    logger.warning(f"⚠️ Empty response on attempt {attempt + 1}")
+
+            except Exception as e:
+                logger.error(f"❌ Error on attempt {attempt + 1}: {e}")
+                if attempt == max_retries - 1:
+                    logger.error(f"💥 All {max_retries} attempts failed")
+                    return None
+
+                # Wait before retry
+                time.sleep(2 ** attempt)
+
+        return None
+
+    def _respond_stream(self, chat, request: GenerationRequest) -> str:
+        """Stream fragments into a StreamingExtractor, cancelling the prediction once the answer is in"""
+        extractor = StreamingExtractor(self.stop_after_tokens)
+        stream = self.model.respond_stream(chat, config=self.config)
+        for fragment in stream:
+            if extractor.feed(fragment.content, getattr(fragment, 'tokens_count', None)):
+                stream.cancel()
+                break
+        request.metrics.update(extractor.metrics())
+        return extractor.text
+
+    async def generate(self, request: GenerationRequest, max_retries: int = 3) -> Optional[str]:
+        """Generate content using the local model with retry logic"""
+        return await asyncio.to_thread(self._respond, request, max_retries)
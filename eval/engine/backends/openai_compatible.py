@@ -0,0 +1,176 @@
+import asyncio
+import base64
+import json
+import logging
+import mimetypes
+from typing import Dict, List, Optional, Union
+
+from ..images import ImageProfile
+from ..scoring import StreamingExtractor
+from . import register_backend
+from .base import GenerationRequest, ModelBackend
+
+logger = logging.getLogger(__name__)
+
+
+@register_backend('openai_compatible')
+class OpenAICompatibleClient(ModelBackend):
+    """Async client for local OpenAI-compatible servers (LM Studio, llama.cpp server, vLLM)
+
+    Unlike the LM Studio SDK backend, which answers one prompt at a time, this
+    keeps ``max_in_flight`` chat completions outstanding per server over a pooled
+    keep-alive connection, so the server's continuous batching is actually used.
+    Several servers (one per GPU box, say) can be given as a list of base URLs;
+    each becomes a worker. With ``stream`` the completion is read as server-sent
+    events; closing the stream after ``stop_after_tokens`` aborts the generation
+    on the server.
+    """
+    name = 'openai_compatible'
+    prompt_style = 'detailed'
+
+    def __init__(self, model_name: str = "internvl3-8b-instruct",
+                 base_url: Union[str, List[str]] = "http://localhost:1234/v1",
+                 max_in_flight: int = 4, api_key: Optional[str] = None,
+                 config: Optional[Dict] = None, timeout: float = 600.0,
+                 image_profile: Optional[ImageProfile] = ImageProfile(base64=True),
+                 stream: bool = False, stop_after_tokens: Optional[int] = None):
+        import httpx
+
+        self.httpx = httpx
+        self.model_name = model_name
+        self.base_urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        self.max_in_flight = max_in_flight
+        self.config = config or {}  # Extra request fields, e.g. {'temperature': 0, 'max_tokens': 4096}
+        self.timeout = timeout
+        self.image_profile = image_profile
+        self.stream = stream or stop_after_tokens is not None
+        self.stop_after_tokens = stop_after_tokens
+        self.headers = {'Authorization': f"Bearer {api_key}"} if api_key else {}
+
+        # One pooled client per server, created on first use inside the running event loop
+        self._clients = [None] * len(self.base_urls)
+        self._loop = None
+
+        for url in self.base_urls:
+            try:
+                response = httpx.get(f"{url}/models", headers=self.headers, timeout=10)
+                response.raise_for_status()
+                models = [model.get('id') for model in response.json().get('data', [])]
+                logger.info(f"✅ Server {url} is up, serving: {', '.join(models) or 'no models listed'}")
+            except Exception as e:
+                logger.error(f"❌ Could not reach {url}: {e}")
+                raise ValueError(f"Could not reach an OpenAI-compatible server at '{url}'. "
+                                 f"Please ensure it is running and serving '{model_name}'.")
+
+    @property
+    def num_workers(self) -> int:
+        return len(self.base_urls)
+
+    def sampling_config(self) -> Dict:
+        return {'backend': self.name, 'model': self.model_name, 'config': self.config, **self.stream_config()}
+
+    def describe(self) -> str:
+        servers = f"{len(self.base_urls)} servers" if len(self.base_urls) > 1 else self.base_urls[0]
+        return f"{self.model_name} (local, OpenAI-compatible, {servers})"
+
+    def _client(self, worker_idx: int):
+        """Pooled HTTP client of a server, rebuilt if the event loop changed (e.g. a new asyncio.run)"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._clients = [None] * len(self.base_urls)
+            self._loop = loop
+        if self._clients[worker_idx] is None:
+            self._clients[worker_idx] = self.httpx.AsyncClient(
+                base_url=self.base_urls[worker_idx],
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.httpx.Limits(max_connections=self.max_in_flight,
+                                         max_keepalive_connections=self.max_in_flight),
+            )
+        return self._clients[worker_idx]
+
+    def _build_messages(self, request: GenerationRequest) -> List[Dict]:
+        """Images first, then the prompt, as base64 data URLs in one user message"""
+        if not request.images:
+            return [{'role': 'user', 'content': request.prompt}]
+
+        if request.image_payloads:
+            # Already base64-encoded ahead of the run by the image cache
+            urls = [f"data:{self.image_profile.mime_type};base64,{payload.decode('ascii')}"
+                    for payload in request.image_payloads]
+        else:
+            urls = []
+            for path in request.images:
+                mime = mimetypes.guess_type(str(path))[0] or 'image/png'
+                with open(path, 'rb') as f:
+                    urls.append(f"data:{mime};base64,{base64.b64encode(f.read()).decode('ascii')}")
+
+        content = [{'type': 'image_url', 'image_url': {'url': url}} for url in urls]
+        content.append({'type': 'text', 'text': request.prompt})
+        return [{'role': 'user', 'content': content}]
+
+    async def generate(self, request: GenerationRequest, max_retries: int = 3) -> Optional[str]:
+        """Generate content on the worker's server with retry logic"""
+        client = self._client(request.worker_idx)
+        payload = {'model': self.model_name, 'messages': self._build_messages(request), **self.config}
+
+        for attempt in range(max_retries):
+            try:
+                logger.debug(f"🔄 Generating content (attempt {attempt + 1}/{max_retries})")
+
+                if self.stream:
+                    content = await self._stream(client, payload, request)
+                else:
+                    content = await self._complete(client, payload, request)
+                if content:
+                    return content
+                else:
+                    logger.warning(f"⚠️ Empty response on attempt {attempt + 1}")
+
+            except Exception as e:
+                logger.error(f"❌ Error on attempt {attempt + 1}: {e}")
+                if attempt == max_retries - 1:
+                    logger.error(f"💥 All {max_retries} attempts failed")
+                    return None
+
+                # Wait before retry
+                await asyncio.sleep(2 ** attempt)
+
+        return None
+
+    async def _complete(self, client, payload: Dict, request: GenerationRequest) -> Optional[str]:
+        response = await client.post('/chat/completions', json=payload)
+        response.raise_for_status()
+        body = response.json()
+
+        usage = body.get('usage') or {}
+        if usage.get('total_tokens'):
+            request.metrics['total_tokens'] = usage['total_tokens']
+
+        choices = body.get('choices') or []
+        return choices[0].get('message', {}).get('content') if choices else None
+
+    async def _stream(self, client, payload: Dict, request: GenerationRequest) -> Optional[str]:
+        """Read the completion as server-sent events, stopping early once the answer is in"""
+        extractor = StreamingExtractor(self.stop_after_tokens)
+        payload = {**payload, 'stream': True, 'stream_options': {'include_usage': True}}
+        async with client.stream('POST', '/chat/completions', json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    break
+                event = json.loads(data)
+
+                usage = event.get('usage') or {}
+                if usage.get('total_tokens'):
+                    request.metrics['total_tokens'] = usage['total_tokens']
+
+                choices = event.get('choices') or []
+                delta = (choices[0].get('delta') or {}).get('content') if choices else None
+                if delta and extractor.feed(delta):
+                    break  # Leaving the block closes the connection, which stops the generation
+        request.metrics.update(extractor.metrics())
+        return extractor.text
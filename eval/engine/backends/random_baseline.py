@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import random
+from typing import Dict, Optional, Tuple
+
+from . import register_backend
+from .base import GenerationRequest, ModelBackend
+
+logger = logging.getLogger(__name__)
+
+MCQ_CHOICES = ['A', 'B', 'C', 'D']
+
+
+@register_backend('random')
+class RandomBaselineBackend(ModelBackend):
+    """Random answer generator that follows question type patterns"""
+    name = 'random_baseline'
+
+    def __init__(self, num_workers: int = 1, latency: Optional[Tuple[float, float]] = (0.1, 0.5),
+                 max_in_flight: int = 1):
+        self._num_workers = num_workers
+        self.max_in_flight = max_in_flight
+        self.latency = latency
+        logger.info("Random baseline generator initialized")
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    def sampling_config(self) -> Dict:
+        # The latency draw comes from the same seeded generator as the answer
+        return {'backend': self.name, 'latency': self.latency}
+
+    @staticmethod
+    def random_answer(rng: random.Random, question_type: str) -> str:
+        """Draw a random answer matching the question type"""
+        if question_type == "MCQ-Single":
+            # Single choice from A, B, C, D
+            return rng.choice(MCQ_CHOICES)
+
+        elif question_type == "MCQ-Multiple":
+            # Multiple choices: 1-4 options randomly selected
+            num_choices = rng.randint(1, 4)
+            selected = rng.sample(MCQ_CHOICES, num_choices)
+            return ''.join(sorted(selected))
+
+        elif question_type == "Numerical":
+            # Random numerical answer between 0-999 with occasional decimals
+            if rng.random() < 0.3:  # 30% chance of decimal
+                return str(round(rng.uniform(0, 100), 2))
+            else:
+                return str(rng.randint(0, 999))
+
+        elif question_type == "Matching":
+            # Single choice for matching questions
+            return rng.choice(MCQ_CHOICES)
+
+        else:
+            # Fallback to single MCQ choice
+            logger.warning(f"Unknown question type: {question_type}, defaulting to MCQ-Single")
+            return rng.choice(MCQ_CHOICES)
+
+    async def generate(self, request: GenerationRequest) -> Optional[str]:
+        """Generate random answer based on question type"""
+        # Seeded per (run, question) so the answer does not depend on scheduling order
+        rng = random.Random(f"{request.run_seed}:{request.question_id}")
+
+        if self.latency:
+            # Small delay to simulate processing time
+            await asyncio.sleep(rng.uniform(*self.latency))
+
+        answer = self.random_answer(rng, request.question_type)
+        return f"Random answer: \\boxed{{{answer}}}"
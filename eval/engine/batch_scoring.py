@@ -0,0 +1,210 @@
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .answer_key import AnswerKey, letter_mask
+from .datasets import MULTIPLE, NUMERICAL, SINGLE
+
+logger = logging.getLogger(__name__)
+
+# Run files as written by the evaluator: {model}_run_XX_{timestamp}.json
+RUN_FILE_PATTERN = '*_run_[0-9][0-9]_*.json'
+# Unfinished runs: {prefix}_run_XX_partial.jsonl, or {prefix}_run_XX_partial_*.json snapshots of older versions
+PARTIAL_FILE_PATTERN = '*_run_[0-9][0-9]_partial*.json*'
+RUN_NAME_RE = re.compile(r'(.+)_run_(\d+)_')
+
+
+def encode_predictions(predicted: Sequence) -> Dict[str, np.ndarray]:
+    """Encode predicted answers once per distinct value, then broadcast to every row
+
+    Returns ``codes`` (row -> distinct prediction), and per distinct prediction:
+    ``text`` (normalized string), ``mask`` (4-bit A-D letter mask), ``value``
+    (float64, NaN when unparseable) and ``parsed`` (whether float() accepted it;
+    'nan' parses, to NaN). Model answers repeat heavily, so this is a few
+    thousand Python-level conversions however many rows there are.
+    """
+    codes, uniques = pd.factorize(pd.Series(predicted, dtype=object).map(str), use_na_sentinel=False)
+    text = np.array([value.strip().upper() for value in uniques], dtype=object)
+    mask = np.fromiter((letter_mask(value) for value in text), dtype=np.uint8, count=len(text))
+    values = np.full(len(text), np.nan)
+    parsed = np.zeros(len(text), dtype=bool)
+    for i, value in enumerate(text):
+        try:
+            values[i] = float(value)
+            parsed[i] = True
+        except ValueError:
+            pass
+    return {'codes': codes, 'text': text, 'mask': mask, 'value': values, 'parsed': parsed}
+
+
+class BatchScorer:
+    """Vectorized scoring of whole runs (or whole histories) against an AnswerKey
+
+    Gold answers are laid out as arrays indexed by question: kind code, letter
+    mask, numeric center and tolerance, and a code for the normalized gold text
+    drawn from the same vocabulary as the predictions, so string-equality rules
+    become integer comparisons. ``score`` gives the same verdict as
+    ``is_answer_correct`` for every row.
+    """
+
+    def __init__(self, answer_key: AnswerKey):
+        self.answer_key = answer_key
+        self.question_ids = list(answer_key)
+        self.question_index = {question_id: i for i, question_id in enumerate(self.question_ids)}
+        answers = [answer_key[question_id] for question_id in self.question_ids]
+
+        self.kind = np.array([answer.kind or '' for answer in answers], dtype=object)
+        self.text = np.array([answer.text for answer in answers], dtype=object)
+        self.mask = np.array([answer.mask for answer in answers], dtype=np.uint8)
+        self.center = np.array([answer.center for answer in answers], dtype=np.float64)
+        self.tolerance = np.array([answer.tolerance for answer in answers], dtype=np.float64)
+        self.accepted = {i: np.array(sorted(answer.accepted), dtype=np.float64)
+                         for i, answer in enumerate(answers) if answer.accepted is not None}
+        self.has_accepted = np.zeros(len(answers), dtype=bool)
+        self.has_accepted[list(self.accepted)] = True
+
+    def question_positions(self, question_ids: Sequence) -> np.ndarray:
+        """Answer-key position of every row (-1 for ids not in the key)"""
+        codes, uniques = pd.factorize(pd.Series(question_ids, dtype=object).map(str), use_na_sentinel=False)
+        positions = np.array([self.question_index.get(question_id, -1) for question_id in uniques], dtype=np.int64)
+        return positions[codes] if len(codes) else np.zeros(0, dtype=np.int64)
+
+    def score(self, question_ids: Sequence, predicted: Sequence) -> np.ndarray:
+        """Correctness of every (question_id, predicted) row; ids missing from the key score False"""
+        positions = self.question_positions(question_ids)
+        known = positions >= 0
+        if not known.all():
+            logger.warning(f"{int((~known).sum())} rows have question ids not in the answer key; scored as wrong")
+        gold = np.where(known, positions, 0)
+
+        encoded = encode_predictions(predicted)
+        codes = encoded['codes']
+
+        # One vocabulary for gold and predicted text: string equality becomes code equality
+        text_codes, _ = pd.factorize(np.concatenate([self.text, encoded['text']]))
+        gold_text = text_codes[:len(self.text)][gold]
+        text_equal = gold_text == text_codes[len(self.text):][codes]
+
+        kind = self.kind[gold]
+        value = encoded['value'][codes]
+        parsed = encoded['parsed'][codes]
+
+        with np.errstate(invalid='ignore'):
+            in_tolerance = parsed & (np.abs(value - self.center[gold]) <= self.tolerance[gold])
+        numerical = text_equal | in_tolerance
+
+        # Accepted-value lists replace the other numerical rules whenever the prediction parses
+        listed = (kind == NUMERICAL) & self.has_accepted[gold] & parsed & known
+        if listed.any():
+            rows = np.flatnonzero(listed)
+            rows = rows[np.argsort(gold[rows], kind='stable')]
+            groups, starts = np.unique(gold[rows], return_index=True)
+            for question, group_rows in zip(groups, np.split(rows, starts[1:])):
+                numerical[group_rows] = np.isin(value[group_rows], self.accepted[question])
+
+        correct = np.select(
+            [kind == SINGLE, kind == MULTIPLE, kind == NUMERICAL],
+            [text_equal, encoded['mask'][codes] == self.mask[gold], numerical],
+            default=text_equal,
+        )
+        return correct & known
+
+
+def _run_key(path: Path) -> Tuple[str, int]:
+    """(run prefix, run number) of a run or partial file name"""
+    match = RUN_NAME_RE.match(path.name)
+    return (match.group(1), int(match.group(2))) if match else (path.stem, -1)
+
+
+def run_files(source: Union[str, Path, Iterable], include_partial: bool = False) -> List[Path]:
+    """Run files below a directory (recursively), or the given paths
+
+    With ``include_partial``, runs that never completed are picked up from their
+    partial files (``partial_results/*_run_XX_partial.jsonl``, or the older
+    ``*_run_XX_partial_*.json`` snapshots; the largest snapshot of a run wins).
+    """
+    if isinstance(source, (str, Path)) and Path(source).is_dir():
+        paths = sorted(path for path in Path(source).rglob(RUN_FILE_PATTERN) if 'partial' not in path.name)
+        if include_partial:
+            completed = {_run_key(path) for path in paths}
+            partial = {}
+            for path in sorted(Path(source).rglob(PARTIAL_FILE_PATTERN)):
+                key = _run_key(path)
+                if key not in completed and (key not in partial or path.stat().st_size > partial[key].stat().st_size):
+                    partial[key] = path
+            paths.extend(sorted(partial.values()))
+        return paths
+    if isinstance(source, (str, Path)):
+        return [Path(source)]
+    return [Path(path) for path in source]
+
+
+def read_run_file(path: Path) -> Dict:
+    """A run file as {'model', 'run_id', 'results', 'partial', 'duration', 'timestamp'}
+
+    Reads completed run files, partial snapshots and partial journals alike;
+    duration and timestamp are None when the file does not record them.
+    """
+    prefix, run_id = _run_key(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == '.jsonl':
+            run = {'results': [json.loads(line) for line in f if line.strip()]}
+        else:
+            run = json.load(f)
+    results = run.get('results', [])
+    return {
+        'model': run.get('model') or (results[0].get('model') if results else None) or prefix,
+        'run_id': run.get('run_id', run_id),
+        'results': results,
+        'partial': 'partial' in path.name,
+        'duration': run.get('duration'),
+        'timestamp': run.get('timestamp'),
+    }
+
+
+def load_predictions(source: Union[str, Path, Iterable], fields: Sequence[str] = (),
+                     include_partial: bool = False) -> pd.DataFrame:
+    """One row per answered question of every run file: model, run_id, question_id, predicted and stored verdict
+
+    ``fields`` adds result fields as extra columns (e.g. 'subject', 'language');
+    ``include_partial`` adds the answers of unfinished runs (see run_files),
+    flagged in the ``partial`` column.
+    """
+    columns = ['model', 'run_id', 'question_id', 'predicted_answer', 'is_correct', 'source', 'partial', *fields]
+    frames = []
+    for path in run_files(source, include_partial):
+        run = read_run_file(path)
+        results = run['results']
+        frames.append(pd.DataFrame({
+            'model': run['model'],
+            'run_id': run['run_id'],
+            'question_id': [str(r.get('question_id')) for r in results],
+            'predicted_answer': [r.get('predicted_answer') for r in results],
+            'is_correct': [bool(r.get('is_correct')) for r in results],
+            'source': str(path),
+            'partial': run['partial'],
+            **{field: [r.get(field) for r in results] for field in fields},
+        }, columns=columns))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def rescore_runs(source: Union[str, Path, Iterable], answer_key: AnswerKey) -> pd.DataFrame:
+    """Score every stored prediction under the current rules
+
+    Adds ``rescored`` next to the verdict stored at run time; rows where the two
+    differ are the ones a scoring change (or a corrected answer key) flips.
+    """
+    predictions = load_predictions(source)
+    predictions['rescored'] = BatchScorer(answer_key).score(predictions['question_id'],
+                                                            predictions['predicted_answer'])
+    changed = int((predictions['rescored'] != predictions['is_correct']).sum())
+    logger.info(f"Rescored {len(predictions)} answers from {predictions['source'].nunique()} run files "
+                f"({changed} verdicts changed)")
+    return predictions
@@ -0,0 +1,197 @@
+"""Throughput benchmark of the evaluation harness against the local mock model server.
+
+Drives the real Evaluator (scheduler, rate limiting, journal, run files) at a
+MockModelServer with a known service-time distribution, so any gap between the
+measured and the ideal throughput is the harness, not the provider::
+
+    python -m engine.benchmark --questions 500 --runs 2 --in-flight 16 --latency lognormal:0.2:0.5
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .backends import create_backend
+from .datasets import JEEBENCH
+from .evaluator import Evaluator
+from .mock_server import LatencySpec, MockModelServer
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_TYPES = ('MCQ', 'MCQ(multiple)', 'Integer')
+BENCHMARK_GOLD = {'MCQ': 'B', 'MCQ(multiple)': 'AC', 'Integer': '12'}
+
+
+def synthetic_dataset(num_questions: int) -> pd.DataFrame:
+    """JEEBench-shaped text questions with distinct prompts"""
+    rows = []
+    for i in range(num_questions):
+        question_type = BENCHMARK_TYPES[i % len(BENCHMARK_TYPES)]
+        rows.append({
+            'index': i,
+            'subject': ('phy', 'chem', 'math')[i % 3],
+            'type': question_type,
+            'gold': BENCHMARK_GOLD[question_type],
+            'question': f"Benchmark question {i}: " + "a body of text of typical length. " * 20,
+        })
+    return pd.DataFrame(rows)
+
+
+class _TimedEvaluator(Evaluator):
+    """Evaluator that adds up the time spent checkpointing (journal, partial files, run files)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkpoint_time = 0.0
+        self.checkpoints = 0
+
+    def _record_result(self, *args, **kwargs):
+        start = time.perf_counter()
+        super()._record_result(*args, **kwargs)
+        self.checkpoint_time += time.perf_counter() - start
+        self.checkpoints += 1
+
+    def _complete_run(self, run_summary: Dict):
+        start = time.perf_counter()
+        super()._complete_run(run_summary)
+        self.checkpoint_time += time.perf_counter() - start
+
+
+def run_benchmark(num_questions: int = 200, num_runs: int = 2, backend: str = 'openai_compatible',
+                  num_workers: int = 1, max_in_flight: int = 8, latency: LatencySpec = ('lognormal', 0.2, 0.5),
+                  error_rate_429: float = 0.0, error_rate_5xx: float = 0.0, pipeline_runs: bool = False,
+                  requests_per_minute: float = 10000, seed: int = 0, results_dir: Optional[str] = None,
+                  stream: bool = False, stop_after_tokens: Optional[int] = None, token_interval: float = 0.0,
+                  trailing_tokens: int = 0) -> Dict:
+    """Run the evaluator against a fresh mock server and return throughput and latency figures
+
+    ``backend`` is 'openai_compatible' (one mock base URL per worker) or 'gemini'
+    (one fake API key per worker, the SDK pointed at the mock server). With
+    ``stream`` the mock server emits a word every ``token_interval`` seconds and
+    ``trailing_tokens`` words after the answer, which ``stop_after_tokens`` cuts.
+    """
+    df = synthetic_dataset(num_questions)
+    with MockModelServer(latency=latency, error_rate_429=error_rate_429, error_rate_5xx=error_rate_5xx,
+                         seed=seed, token_interval=token_interval, trailing_tokens=trailing_tokens) as server, \
+            tempfile.TemporaryDirectory() as temp_dir:
+        if backend == 'gemini':
+            model = create_backend('gemini', api_keys=[f"mock-api-key-{i:04d}" for i in range(num_workers)],
+                                   model_name='mock-model', requests_per_minute=requests_per_minute,
+                                   max_in_flight=max_in_flight, base_url=server.url,
+                                   stream=stream, stop_after_tokens=stop_after_tokens)
+        else:
+            model = create_backend('openai_compatible', model_name='mock-model',
+                                   base_url=[server.openai_base_url] * num_workers, max_in_flight=max_in_flight,
+                                   stream=stream, stop_after_tokens=stop_after_tokens)
+
+        evaluator = _TimedEvaluator(model, df, JEEBENCH, results_dir or temp_dir, run_prefix='benchmark',
+                                    num_runs=num_runs, pipeline_runs=pipeline_runs)
+        wall_start = time.perf_counter()
+        asyncio.run(evaluator.run_evaluation())
+        wall_time = time.perf_counter() - wall_start
+
+        # Release the files before the temporary directory goes away
+        evaluator.state_store.close()
+        if evaluator.response_store is not None:
+            evaluator.response_store.close()
+
+    results = [r for summary in evaluator.state.all_run_summaries for r in summary['results']]
+    latencies = np.array([r['inference_time'] for r in results]) if results else np.zeros(1)
+    ttfts = [r['ttft'] for r in results if 'ttft' in r]
+    boxed = [r['time_to_boxed'] for r in results if 'time_to_boxed' in r]
+    service_times = np.array(server.service_times) if server.service_times else np.zeros(1)
+    slots = num_workers * max_in_flight
+
+    # With every slot busy the harness could at best finish slots / mean service time questions per second
+    ideal_rate = slots / service_times.mean() if service_times.mean() > 0 else float('inf')
+    rate = len(results) / wall_time if wall_time > 0 else 0.0
+    return {
+        'backend': backend,
+        'questions': num_questions,
+        'runs': num_runs,
+        'slots': slots,
+        'answered': len(results),
+        'requests': sum(server.status_counts.values()),
+        'status_counts': dict(server.status_counts),
+        'wall_time': wall_time,
+        'questions_per_sec': rate,
+        'ideal_questions_per_sec': ideal_rate,
+        'efficiency': rate / ideal_rate if ideal_rate else 0.0,
+        # Client-side latency minus server service time: HTTP, event loop and bookkeeping per request
+        'scheduler_overhead_ms': max(latencies.mean() - service_times.mean(), 0.0) * 1000,
+        'latency_p50': float(np.percentile(latencies, 50)),
+        'latency_p95': float(np.percentile(latencies, 95)),
+        'latency_p99': float(np.percentile(latencies, 99)),
+        'checkpoint_ms_per_question': evaluator.checkpoint_time / max(evaluator.checkpoints, 1) * 1000,
+        'ttft_p50': float(np.percentile(ttfts, 50)) if ttfts else None,
+        'time_to_boxed_p50': float(np.percentile(boxed, 50)) if boxed else None,
+        'cut_off': sum(1 for r in results if r.get('stream_cut_off')),
+    }
+
+
+def format_benchmark(result: Dict) -> str:
+    lines = [
+        f"{'='*60}",
+        "HARNESS THROUGHPUT BENCHMARK (mock server)",
+        f"{'='*60}",
+        f"Backend: {result['backend']} | {result['questions']} questions x {result['runs']} runs | {result['slots']} slots",
+        f"Answered: {result['answered']} | Requests: {result['requests']} | Status: {result['status_counts']}",
+        f"Wall time: {result['wall_time']:.2f}s",
+        f"Throughput: {result['questions_per_sec']:.1f} q/s "
+        f"(ideal {result['ideal_questions_per_sec']:.1f} q/s, {result['efficiency']*100:.1f}% efficiency)",
+        f"Latency p50/p95/p99: {result['latency_p50']*1000:.0f} / {result['latency_p95']*1000:.0f} / "
+        f"{result['latency_p99']*1000:.0f} ms",
+        f"Scheduler overhead: {result['scheduler_overhead_ms']:.2f} ms/request",
+        f"Checkpoint cost: {result['checkpoint_ms_per_question']:.3f} ms/question",
+    ]
+    if result['ttft_p50'] is not None:
+        boxed = result['time_to_boxed_p50']
+        lines.append(f"Streaming p50: first token {result['ttft_p50']*1000:.0f} ms, "
+                     f"answer {f'{boxed*1000:.0f} ms' if boxed is not None else 'n/a'}, "
+                     f"{result['cut_off']} cut off after the answer")
+    return "\n".join(lines)
+
+
+def parse_latency(spec: str) -> LatencySpec:
+    """'0.2' or 'kind:param[:param]', e.g. 'lognormal:0.2:0.5', 'uniform:0.1:0.5'"""
+    kind, *params = spec.split(':')
+    if not params:
+        return float(kind)
+    return (kind, *map(float, params))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', choices=['openai_compatible', 'gemini'], default='openai_compatible')
+    parser.add_argument('--questions', type=int, default=200)
+    parser.add_argument('--runs', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--in-flight', type=int, default=8)
+    parser.add_argument('--latency', type=parse_latency, default=('lognormal', 0.2, 0.5))
+    parser.add_argument('--error-429', type=float, default=0.0)
+    parser.add_argument('--error-5xx', type=float, default=0.0)
+    parser.add_argument('--pipeline', action='store_true', help="Overlap consecutive runs")
+    parser.add_argument('--stream', action='store_true', help="Stream responses (reports time to first token)")
+    parser.add_argument('--stop-after-tokens', type=int, default=None, help="Cut streams this long after the answer")
+    parser.add_argument('--token-interval', type=float, default=0.0, help="Mock server seconds per streamed word")
+    parser.add_argument('--trailing-tokens', type=int, default=0, help="Mock server words after the answer")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    result = run_benchmark(num_questions=args.questions, num_runs=args.runs, backend=args.backend,
+                           num_workers=args.workers, max_in_flight=args.in_flight, latency=args.latency,
+                           error_rate_429=args.error_429, error_rate_5xx=args.error_5xx,
+                           pipeline_runs=args.pipeline, seed=args.seed, stream=args.stream,
+                           stop_after_tokens=args.stop_after_tokens, token_interval=args.token_interval,
+                           trailing_tokens=args.trailing_tokens)
+    print(format_benchmark(result))
+
+
+if __name__ == '__main__':
+    main()
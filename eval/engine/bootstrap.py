@@ -0,0 +1,107 @@
+import itertools
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .correctness import CorrectnessTensor
+
+logger = logging.getLogger(__name__)
+
+
+def _resample_accuracies(values: np.ndarray, answered: np.ndarray, slice_masks: np.ndarray,
+                         num_resamples: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Accuracy (%) of every model on every slice for num_resamples question resamples
+
+    Draws one set of question indices per resample, shared by all models and
+    slices, and turns them into per-question draw counts, so each slice's
+    accuracy is a weighted mean: counts[:, slice] @ values[slice].
+    Returns a (resamples, slices, models) array; NaN where a resample drew no
+    answered question of a slice.
+    """
+    rng = np.random.default_rng(seed)
+    num_questions = values.shape[0]
+    indices = rng.integers(0, num_questions, size=(num_resamples, num_questions))
+    indices += np.arange(num_resamples)[:, None] * num_questions
+    counts = np.bincount(indices.ravel(), minlength=num_resamples * num_questions)
+    counts = counts.reshape(num_resamples, num_questions).astype(np.float64)
+
+    accuracies = np.empty((num_resamples, len(slice_masks), values.shape[1]))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for s, mask in enumerate(slice_masks):
+            weights = counts[:, mask]
+            accuracies[:, s] = weights @ values[mask] / (weights @ answered[mask]) * 100
+    return accuracies
+
+
+def paired_bootstrap(tensor: CorrectnessTensor, num_resamples: int = 10_000, confidence: float = 0.95,
+                     fields: Optional[Sequence[str]] = None, seed: Optional[int] = None,
+                     workers: Optional[int] = None, chunk_size: int = 1000) -> Dict[str, pd.DataFrame]:
+    """Paired bootstrap CIs of every model's accuracy and of every pairwise difference, per slice
+
+    Questions are the resampling unit (each question's score is the share of a
+    model's runs that got it right), and every resample is applied to all
+    models at once, so differences keep the pairing of models answering the
+    same questions. Resamples are drawn in chunks of ``chunk_size`` across a
+    process pool; ``workers=0`` runs them in this process. Chunk seeds are
+    spawned from ``seed``, so results do not depend on the number of workers.
+
+    Returns ``accuracy`` (field, value, model, questions, accuracy, ci_low,
+    ci_high) and ``differences`` (field, value, model_a, model_b, difference,
+    ci_low, ci_high, p_value: two-sided share of resamples on the other side
+    of zero).
+    """
+    start_time = time.time()
+    question_accuracy = tensor.question_accuracy()
+    answered = ~np.isnan(question_accuracy)
+    values = np.where(answered, question_accuracy, 0.0)
+    answered = answered.astype(np.float64)
+
+    slices = tensor.slices(fields)
+    slice_masks = np.array(list(slices.values()))
+    chunks = [min(chunk_size, num_resamples - start) for start in range(0, num_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    if workers == 0 or len(chunks) == 1:
+        parts = [_resample_accuracies(values, answered, slice_masks, size, chunk_seed)
+                 for size, chunk_seed in zip(chunks, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_resample_accuracies, [values] * len(chunks), [answered] * len(chunks),
+                                  [slice_masks] * len(chunks), chunks, seeds))
+    resamples = np.concatenate(parts)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        point = np.stack([values[mask].sum(axis=0) / answered[mask].sum(axis=0) * 100 for mask in slice_masks])
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.nanpercentile(resamples, [tail, 100 - tail], axis=0)
+
+    accuracy_rows = []
+    for s, (field, value) in enumerate(slices):
+        for m, model in enumerate(tensor.models):
+            accuracy_rows.append({
+                'field': field, 'value': value, 'model': model,
+                'questions': int(answered[slice_masks[s], m].sum()),
+                'accuracy': point[s, m], 'ci_low': low[s, m], 'ci_high': high[s, m],
+            })
+
+    difference_rows = []
+    for a, b in itertools.combinations(range(len(tensor.models)), 2):
+        differences = resamples[:, :, a] - resamples[:, :, b]
+        diff_low, diff_high = np.nanpercentile(differences, [tail, 100 - tail], axis=0)
+        valid = (~np.isnan(differences)).sum(axis=0)
+        below = (differences <= 0).sum(axis=0) / np.maximum(valid, 1)
+        above = (differences >= 0).sum(axis=0) / np.maximum(valid, 1)
+        p_values = np.minimum(2 * np.minimum(below, above), 1.0)
+        for s, (field, value) in enumerate(slices):
+            difference_rows.append({
+                'field': field, 'value': value, 'model_a': tensor.models[a], 'model_b': tensor.models[b],
+                'difference': point[s, a] - point[s, b], 'ci_low': diff_low[s], 'ci_high': diff_high[s],
+                'p_value': p_values[s],
+            })
+
+    logger.info(f"Bootstrapped {num_resamples:,} resamples of {len(tensor.question_ids)} questions × "
+                f"{len(tensor.models)} models × {len(slices)} slices in {time.time() - start_time:.1f}s")
+    return {'accuracy': pd.DataFrame(accuracy_rows), 'differences': pd.DataFrame(difference_rows)}
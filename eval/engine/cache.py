@@ -0,0 +1,148 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .backends import GenerationRequest, ModelBackend
+from .images import image_digest
+
+logger = logging.getLogger(__name__)
+
+CACHE_POLICIES = ('use', 'refresh', 'bypass')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+class ResponseCache:
+    """On-disk cache of raw model responses in a single SQLite file
+
+    Entries are keyed by the backend's sampling config (model name and generation
+    parameters), the question id, a hash of the prompt and image bytes, and the
+    run seed, so a rerun of the same run replays its answers while a new run seed
+    or a changed temperature asks the model again. The file runs in WAL mode, so
+    several notebooks may share one cache.
+
+    policy:
+        'use'     - answer from the cache when possible, store new responses
+        'refresh' - always call the backend, overwrite what is stored
+        'bypass'  - neither read nor write the cache
+    Least recently used entries are evicted beyond ``max_entries`` or ``max_bytes``.
+    """
+
+    def __init__(self, path, policy: str = 'use', max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, evict_every: int = 100):
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"Unknown cache policy '{policy}'. Available: {list(CACHE_POLICIES)}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.policy = policy
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+        self.hits = 0
+        self.misses = 0
+        self._puts_since_evict = 0
+
+    def key(self, backend: ModelBackend, request: GenerationRequest) -> str:
+        """Cache key of a request: sampling config, question, prompt and image hashes, run seed"""
+        payload = {
+            'sampling': backend.sampling_config(),
+            # Image-only datasets share one prompt per question type, so the id keeps questions apart
+            'question_id': request.question_id,
+            'prompt': hashlib.sha256(request.prompt.encode('utf-8')).hexdigest(),
+            'images': [image_digest(path) for path in request.images],
+            'run_seed': request.run_seed,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def put(self, key: str, model: str, response: str):
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, response, size, created, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, response, len(response.encode('utf-8')), now, now),
+        )
+        self._puts_since_evict += 1
+        if self._puts_since_evict >= self.evict_every:
+            self.evict()
+
+    async def generate(self, backend: ModelBackend, request: GenerationRequest) -> Optional[str]:
+        """Answer a request from the cache, or from the backend (storing the response) on a miss"""
+        if self.policy == 'bypass':
+            request.metrics['cache'] = 'bypass'
+            return await backend.generate(request)
+
+        key = self.key(backend, request)
+        if self.policy == 'use':
+            cached = self.get(key)
+            if cached is not None:
+                self.hits += 1
+                request.metrics['cache'] = 'hit'
+                return cached
+
+        self.misses += 1
+        request.metrics['cache'] = 'miss'
+        response = await backend.generate(request)
+        if response:
+            self.put(key, backend.describe(), response)
+        return response
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond the size limits; returns the number removed"""
+        self._puts_since_evict = 0
+        removed = 0
+        if self.max_entries is not None:
+            removed += self.conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        if self.max_bytes is not None:
+            removed += self.conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM "
+                "(SELECT key, SUM(size) OVER (ORDER BY last_access DESC) AS total FROM responses) "
+                "WHERE total > ?)",
+                (self.max_bytes,),
+            ).rowcount
+        if removed:
+            logger.info(f"🧹 Evicted {removed} cached responses")
+        return removed
+
+    def stats(self) -> Dict:
+        entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'bytes': size}
+
+    def clear(self, model: Optional[str] = None) -> int:
+        """Delete all entries, or only those of one model (as given by ``backend.describe()``)"""
+        if model is None:
+            return self.conn.execute("DELETE FROM responses").rowcount
+        return self.conn.execute("DELETE FROM responses WHERE model = ?", (model,)).rowcount
+
+    def close(self):
+        self.conn.close()
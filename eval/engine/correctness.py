@@ -0,0 +1,81 @@
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .batch_scoring import load_predictions
+
+logger = logging.getLogger(__name__)
+
+# Result fields models are compared across
+SLICE_FIELDS = ('subject', 'question_type', 'language', 'year')
+
+
+class CorrectnessTensor:
+    """Question × run × model correctness of several models answering the same questions
+
+    ``correct`` and ``observed`` are (questions, runs, models) boolean arrays.
+    Runs are numbered per model in run_id order, so models with fewer runs (or
+    runs that stopped part-way) leave cells unobserved rather than wrong.
+    ``labels`` holds the slice fields of every question (subject, type, ...).
+    """
+
+    def __init__(self, correct: np.ndarray, observed: np.ndarray, question_ids: Sequence[str],
+                 models: Sequence[str], run_ids: Dict[str, List], labels: pd.DataFrame):
+        self.correct = correct
+        self.observed = observed
+        self.question_ids = list(question_ids)
+        self.models = list(models)
+        self.run_ids = run_ids
+        self.labels = labels
+
+    @classmethod
+    def from_predictions(cls, predictions: pd.DataFrame, fields: Sequence[str] = SLICE_FIELDS) -> 'CorrectnessTensor':
+        """Lay out a load_predictions frame; a (model, run, question) answered twice keeps the last row"""
+        question_codes, question_ids = pd.factorize(predictions['question_id'].astype(str), sort=True)
+        model_codes, models = pd.factorize(predictions['model'].astype(str), sort=True)
+        run_codes = (predictions.assign(_model=model_codes)
+                     .groupby('_model')['run_id'].rank(method='dense').to_numpy(dtype=np.int64) - 1)
+        shape = (len(question_ids), int(run_codes.max()) + 1 if len(run_codes) else 0, len(models))
+
+        correct = np.zeros(shape, dtype=bool)
+        observed = np.zeros(shape, dtype=bool)
+        correct[question_codes, run_codes, model_codes] = predictions['is_correct'].to_numpy(dtype=bool)
+        observed[question_codes, run_codes, model_codes] = True
+
+        run_ids = {model: sorted(predictions.loc[model_codes == i, 'run_id'].unique().tolist())
+                   for i, model in enumerate(models)}
+        present = [field for field in fields if field in predictions.columns]
+        labels = (predictions.assign(question_id=predictions['question_id'].astype(str))
+                  .groupby('question_id')[present].first().reindex(list(question_ids)))
+        return cls(correct, observed, question_ids, models, run_ids, labels)
+
+    @classmethod
+    def from_runs(cls, source: Union[str, Path, Iterable], fields: Sequence[str] = SLICE_FIELDS,
+                  include_partial: bool = False) -> 'CorrectnessTensor':
+        """Tensor of every run file below a directory (or of the given run files), optionally with unfinished runs"""
+        return cls.from_predictions(load_predictions(source, fields=fields, include_partial=include_partial), fields)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.correct.shape
+
+    def question_accuracy(self) -> np.ndarray:
+        """(questions, models) share of a model's runs that got each question right; NaN if never answered"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.correct.sum(axis=1) / self.observed.sum(axis=1)
+
+    def accuracy(self) -> pd.Series:
+        """Accuracy (%) per model, every answered question weighted equally"""
+        return pd.Series(np.nanmean(self.question_accuracy(), axis=0) * 100, index=self.models)
+
+    def slices(self, fields: Sequence[str] = None) -> Dict[Tuple[str, str], np.ndarray]:
+        """Question mask of the whole set ('overall', 'all') and of every value of every slice field"""
+        masks = {('overall', 'all'): np.ones(len(self.question_ids), dtype=bool)}
+        for field in self.labels.columns if fields is None else fields:
+            values = self.labels[field].astype(str).to_numpy()
+            for value in sorted(set(values)):
+                masks[(field, value)] = values == value
+        return masks
@@ -0,0 +1,74 @@
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Answer kinds shared by every benchmark; dataset-specific type labels map onto these
+SINGLE = "single"
+MULTIPLE = "multiple"
+NUMERICAL = "numerical"
+
+
+@dataclass(frozen=True)
+class DatasetProfile:
+    """Column layout and question-type semantics of one benchmark"""
+    name: str
+    id_column: str
+    type_column: str
+    answer_column: str
+    subject_column: str = 'subject'
+    question_column: Optional[str] = None  # Question text, if the question is given as text
+    image_column: Optional[str] = None  # Image filename, if the question is given as an image
+    metadata_columns: Tuple[str, ...] = ()
+    type_kinds: Dict[str, str] = field(default_factory=dict)
+    report_categories: Tuple[str, ...] = ('subject', 'question_type')
+
+    def kind(self, question_type: str) -> Optional[str]:
+        """Map a dataset question type onto SINGLE / MULTIPLE / NUMERICAL (None for free-form)"""
+        return self.type_kinds.get(question_type)
+
+
+JEEBENCH = DatasetProfile(
+    name='JEEBench',
+    id_column='index',
+    type_column='type',
+    answer_column='gold',
+    question_column='question',
+    type_kinds={'MCQ': SINGLE, 'MCQ(multiple)': MULTIPLE, 'Integer': NUMERICAL},
+)
+
+MMJEE = DatasetProfile(
+    name='mmJEE-Eval',
+    id_column='question_id',
+    type_column='question_type',
+    answer_column='answer',
+    image_column='image_filename',
+    metadata_columns=('year', 'paper', 'language', 'image_filename'),
+    type_kinds={'MCQ-Single': SINGLE, 'Matching': SINGLE, 'MCQ-Multiple': MULTIPLE, 'Numerical': NUMERICAL},
+    report_categories=('language', 'subject', 'question_type', 'year'),
+)
+
+MMJEE_CSV = "jee_advanced_combined_fixed.csv"
+
+
+def load_jeebench() -> pd.DataFrame:
+    """Load the JEEBench test split from the Hugging Face hub"""
+    from datasets import load_dataset
+
+    logger.info("Loading JEEBench dataset...")
+    df = pd.DataFrame(load_dataset("daman1209arora/jeebench")['test'])
+    logger.info(f"Loaded JEEBench dataset with {len(df)} questions")
+    logger.info(f"Question types: {df['type'].value_counts().to_dict()}")
+    logger.info(f"Subjects: {df['subject'].value_counts().to_dict()}")
+    return df
+
+
+def load_mmjee(base_path: str) -> pd.DataFrame:
+    """Load the mmJEE-Eval question table from the dataset folder"""
+    df = pd.read_csv(Path(base_path) / MMJEE_CSV)
+    logger.info(f"Loaded mmJEE-Eval dataset with {len(df)} questions")
+    return df
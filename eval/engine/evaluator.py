@@ -0,0 +1,606 @@
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .accumulator import AccuracyAccumulator
+from .answer_key import AnswerKey
+from .backends import GenerationRequest, ModelBackend
+from .cache import ResponseCache
+from .datasets import DatasetProfile
+from .images import ImageCache
+from .prompts import create_question_prompt
+from .report import build_final_report
+from .responses import ResponseStore
+from .scheduler import WorkerStats, run_work_queue
+from .scoring import extract_answer_with_rule
+from .stopping import StoppingRule
+from .state import EvaluationState, StateStore, new_state, run_file_name, to_json_serializable, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+
+class Evaluator:
+    """Repeated evaluation runs of one model backend over one dataset, with resume support
+
+    The evaluator owns scheduling, checkpointing, scoring and reporting; everything
+    model-specific lives in the backend. Results land in ``results_dir`` as
+    ``{run_prefix}_run_XX_{timestamp}.json`` files, one per completed run.
+    With ``pipeline_runs`` the next run's questions are scheduled while the
+    previous run drains instead of after it (see ``run_pipelined``). Responses go
+    through ``response_cache`` when one is given, so reruns cost no model calls.
+    Full responses are kept in ``responses.sqlite`` beside the run files (see
+    ``ResponseStore``) unless ``store_responses`` is off. With a ``stopping_rule``
+    no further runs are scheduled once the completed ones meet it, so
+    ``num_runs`` becomes a cap rather than a fixed count.
+    """
+
+    def __init__(self, backend: ModelBackend, df: pd.DataFrame, profile: DatasetProfile,
+                 results_dir: str, run_prefix: str, num_runs: int = 10,
+                 random_seed: Optional[int] = None, image_dir: Optional[str] = None,
+                 checkpoint_every: int = 5, partial_every: int = 25, pipeline_runs: bool = False,
+                 response_cache: Optional[ResponseCache] = None, store_responses: bool = True,
+                 image_cache_dir: Optional[str] = None, answer_key: Optional[AnswerKey] = None,
+                 stopping_rule: Optional[StoppingRule] = None):
+        self.backend = backend
+        self.df = df.reset_index(drop=True)
+        self.profile = profile
+        self.run_prefix = run_prefix
+        self.num_runs = num_runs
+        self.random_seed = random_seed
+        self.checkpoint_every = checkpoint_every
+        self.partial_every = partial_every
+        self.pipeline_runs = pipeline_runs
+        self.response_cache = response_cache
+        self.stopping_rule = stopping_rule
+        self.stop_reason: Optional[str] = None  # Why the stopping rule ended the sweep early
+
+        # Gold answers parsed once, not per question and run
+        self.answer_key = answer_key if answer_key is not None else AnswerKey.from_frame(self.df, profile)
+
+        # Images are looked up by filename anywhere below image_dir
+        self.image_paths = {}
+        if profile.image_column and image_dir:
+            self.image_paths = {path.name: path for path in Path(image_dir).rglob('*.png')}
+            logger.info(f"Indexed {len(self.image_paths)} question images under {image_dir}")
+
+        # Images preprocessed for the backend once, ahead of the run, shared by every model with the same profile
+        self.image_cache = None
+        if self.image_paths and backend.image_profile is not None:
+            self.image_cache = ImageCache(image_cache_dir or Path(image_dir) / ".image_cache", backend.image_profile)
+
+        # Results and state management
+        self.results_dir = Path(results_dir)
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.partial_dir = self.results_dir / "partial_results"
+        self.partial_dir.mkdir(exist_ok=True)
+        self._partial_written: Dict[int, int] = {}  # run_id -> results already in its partial file
+
+        self.response_store = ResponseStore(self.results_dir / "responses.sqlite") if store_responses else None
+        self.state_store = StateStore(self.results_dir, fsync_every=checkpoint_every)
+        self.state_file = self.state_store.state_file
+        self.state = self.load_or_create_state()
+
+        # Control flags
+        self.stop_requested = False  # Set from outside to interrupt the sweep
+        self.interrupted = False
+
+        logger.info(f"Results will be saved to: {self.results_dir}")
+        logger.info(f"Running {num_runs} evaluations of {backend.describe()} with {backend.num_workers} worker(s), "
+                    f"{backend.max_in_flight} request(s) in flight each")
+
+    def load_or_create_state(self) -> EvaluationState:
+        """Load existing state or create new one"""
+        state = self.state_store.load()
+        if state is None:
+            logger.info("Creating new evaluation state")
+            state = new_state(len(self.df) * self.num_runs)
+        # Not persisted: rebuilt once from the completed runs, then kept up to date run by run
+        state.stats = AccuracyAccumulator.from_run_summaries(state.all_run_summaries, self.profile.report_categories)
+        return state
+
+    def save_state(self):
+        """Save current evaluation state (the journal already holds every answered question)"""
+        self.state_store.save(self.state)
+
+    def _run_results(self, run_id: int) -> List[Dict]:
+        """Result list of a run: the current one, or a later run the pipeline already started"""
+        if run_id == self.state.current_run:
+            return self.state.current_run_results
+        return self.state.pending_run_results.setdefault(run_id, [])
+
+    def _advance_run(self, run_id: int):
+        """Make run_id the current run, picking up any results it collected while pipelined"""
+        self.state.current_run = run_id
+        self.state.current_run_results = self.state.pending_run_results.pop(run_id, [])
+
+    def check_stopping_rule(self) -> bool:
+        """True once the completed runs meet the stopping rule (if any); checked after every run"""
+        if self.stop_reason is None and self.stopping_rule is not None and self.state.all_run_summaries:
+            self.stop_reason = self.stopping_rule.check(self.state.stats)
+            if self.stop_reason:
+                logger.info(f"🛑 No further runs after {len(self.state.all_run_summaries)}: {self.stop_reason}")
+        return self.stop_reason is not None
+
+    def _should_stop(self) -> bool:
+        return self.stop_requested or self.stop_reason is not None
+
+    def run_seed(self, run_id: int) -> int:
+        """Seed used for the question order (and any backend sampling) of a run"""
+        return run_id + (self.random_seed or 0)
+
+    def run_order(self, run_id: int) -> List[int]:
+        """Shuffled dataset positions for a run, reproducible from the run seed"""
+        return list(self.df.sample(frac=1, random_state=self.run_seed(run_id)).index)
+
+    def build_request(self, question_data: pd.Series, run_id: int, worker_idx: int) -> GenerationRequest:
+        """Turn a dataset row into a backend request"""
+        images = []
+        if self.profile.image_column:
+            image_path = self.image_paths.get(str(question_data[self.profile.image_column]))
+            if image_path is not None:
+                images.append(image_path)
+
+        image_payloads = []
+        if self.image_cache is not None and images:
+            image_payloads = [self.image_cache.get(path) for path in images]
+            if any(payload is None for payload in image_payloads):
+                image_payloads = []  # Not prepared; the backend reads the files itself
+
+        return GenerationRequest(
+            prompt=create_question_prompt(question_data, self.profile, self.backend.prompt_style),
+            question_id=str(question_data[self.profile.id_column]),
+            question_type=str(question_data[self.profile.type_column]),
+            run_id=run_id,
+            run_seed=self.run_seed(run_id),
+            worker_idx=worker_idx,
+            images=images,
+            image_payloads=image_payloads,
+        )
+
+    def prepare_images(self, workers: Optional[int] = None):
+        """Preprocess every question image for the backend before the first request"""
+        if self.image_cache is None:
+            return
+        paths = [self.image_paths[name] for name in self.df[self.profile.image_column].astype(str).unique()
+                 if name in self.image_paths]
+        added = self.image_cache.prepare(paths, workers)
+        logger.info(f"🖼️ {len(paths)} images ready for {self.backend.describe()} ({added} newly preprocessed)")
+
+    async def evaluate_single_question(self, worker_idx: int, question_data: pd.Series, run_id: int, question_idx: int) -> Optional[Dict]:
+        """Evaluate a single question on one backend worker"""
+        question_id = str(question_data[self.profile.id_column])
+        try:
+            request = self.build_request(question_data, run_id, worker_idx)
+
+            start_time = time.time()
+            if self.response_cache is not None:
+                response_text = await self.response_cache.generate(self.backend, request)
+            else:
+                response_text = await self.backend.generate(request)
+            inference_time = time.time() - start_time
+
+            if not response_text:
+                logger.error(f"Failed to get response for question {question_id}")
+                return None
+
+            kind = self.profile.kind(question_data[self.profile.type_column])
+            predicted_answer, extraction_rule = extract_answer_with_rule(response_text, kind)
+            is_correct = self.answer_key.is_correct(question_id, predicted_answer)
+
+            # Log each completion
+            status = "[OK]" if is_correct else "[FAIL]"
+            logger.info(f"Worker {worker_idx} | Run {run_id} | Q{question_idx+1}: {status} ({inference_time:.1f}s)")
+
+            result = {
+                'run_id': run_id,
+                'question_idx': question_idx,
+                'client_idx': worker_idx,
+                'question_id': question_id,
+                'subject': question_data[self.profile.subject_column],
+                'question_type': question_data[self.profile.type_column],
+            }
+            for column in self.profile.metadata_columns:
+                result[column] = question_data.get(column)
+            if self.profile.question_column:
+                question_text = question_data[self.profile.question_column]
+                result['question_text'] = question_text[:200] + "..." if len(question_text) > 200 else question_text
+            result.update({
+                'correct_answer': str(question_data[self.profile.answer_column]),
+                'predicted_answer': predicted_answer,
+                'extraction_rule': extraction_rule,
+                'is_correct': bool(is_correct),
+                'inference_time': inference_time,
+                'model': self.run_prefix,
+            })
+            if self.response_store is not None:
+                # The run file only points at the store; the full text is addressed by (model, run_id, question_id).
+                # Compressing and writing happen off the event loop so concurrent requests keep flowing
+                await asyncio.to_thread(self.response_store.put, self.run_prefix, run_id, question_id, response_text)
+                result['response_store'] = self.response_store.path.name
+            else:
+                result['full_response'] = response_text[:1000] + "..." if len(response_text) > 1000 else response_text  # Truncate for storage
+            result.update(request.metrics)
+            return result
+        except Exception as e:
+            logger.error(f"Error evaluating question {question_id}: {e}")
+            return None
+
+    def _record_result(self, run_id: int, question_idx: int, question_data: pd.Series, result: Optional[Dict]):
+        """Add one finished question to the state and its journal record to disk"""
+        if result is None:
+            failure = {
+                'run_id': run_id,
+                'question_idx': question_idx,
+                'question_id': str(question_data[self.profile.id_column]),
+            }
+            self.state.failed_questions.append(failure)
+            self.state_store.append('failed', failure)
+            return
+
+        results = self._run_results(run_id)
+        results.append(result)
+        self.state.completed_questions += 1
+        self.state_store.append('result', result)
+        done = len(results)
+
+        if self.partial_every and done % self.partial_every == 0:
+            self.save_partial_run_results(run_id)
+
+    async def process_questions_parallel(self, questions_with_indices: List[Tuple[int, pd.Series]], run_id: int) -> List[WorkerStats]:
+        """Process questions across the backend workers from one shared queue"""
+        num_workers = self.backend.num_workers
+        slots = self.backend.max_in_flight
+        logger.info(f"🎯 {len(questions_with_indices)} questions queued for {num_workers} worker(s) "
+                    f"x {slots} in flight")
+
+        async def handle(worker_idx: int, item: Tuple[int, pd.Series]) -> bool:
+            question_idx, question_data = item
+            result = await self.evaluate_single_question(worker_idx, question_data, run_id, question_idx)
+            self._record_result(run_id, question_idx, question_data, result)
+            return result is not None
+
+        worker_stats = await run_work_queue(
+            questions_with_indices, num_workers, handle,
+            slots_per_worker=slots,
+            worker_delay=self.backend.worker_delay,
+            should_stop=self._should_stop,
+        )
+
+        for stats in worker_stats:
+            logger.info(f"✅ Worker {stats.worker_idx} finished: {stats.completed} successful, {stats.failed} failed")
+        return worker_stats
+
+    async def run_single_evaluation_run(self, run_id: int) -> Optional[Dict]:
+        """Run a single evaluation run, resuming any questions already answered"""
+        logger.info(f"\n{'='*60}")
+        logger.info(f"Starting Run {run_id}/{self.num_runs}")
+        logger.info(f"{'='*60}")
+
+        if run_id != self.state.current_run:
+            self._advance_run(run_id)
+
+        done = {r['question_idx'] for r in self.state.current_run_results}
+        if done:
+            logger.info(f"🔄 Resuming Run {run_id}: {len(done)}/{len(self.df)} questions already answered")
+
+        questions_with_indices = [
+            (question_idx, self.df.iloc[position])
+            for question_idx, position in enumerate(self.run_order(run_id))
+            if question_idx not in done
+        ]
+
+        run_start_time = time.time()
+        worker_stats = await self.process_questions_parallel(questions_with_indices, run_id)
+        run_duration = time.time() - run_start_time
+
+        if self.stop_requested:
+            logger.info(f"⏹️ Stop requested, Run {run_id} left incomplete")
+            return None
+
+        return self._build_run_summary(run_id, run_duration,
+                                       [stats.summary(run_duration) for stats in worker_stats])
+
+    def _build_run_summary(self, run_id: int, run_duration: float, worker_throughput: List[Dict]) -> Optional[Dict]:
+        """Summarise the finished current run; None if none of its questions produced a result"""
+        results = sorted(self._run_results(run_id), key=lambda r: r['question_idx'])
+        if not results:
+            logger.error(f"No valid results for run {run_id}")
+            return None
+
+        # Calculate accuracy
+        correct_count = sum(1 for r in results if r['is_correct'])
+        accuracy = (correct_count / len(results)) * 100
+
+        run_summary = {
+            'run_id': run_id,
+            'model': self.run_prefix,
+            'model_name': self.backend.describe(),
+            'random_seed': self.random_seed,
+            'run_random_seed': self.run_seed(run_id),
+            'total_questions': len(results),
+            'correct_answers': correct_count,
+            'accuracy': accuracy,
+            'duration': run_duration,
+            'avg_time_per_question': run_duration / len(results),
+            'failed_questions': len(self.df) - len(results),
+            'rate_limit_wait': sum(r.get('rate_limit_wait', 0.0) for r in results),
+            'cache_hits': sum(1 for r in results if r.get('cache') == 'hit'),
+            'worker_throughput': worker_throughput,
+            'worker_stats': self.backend.worker_stats(),
+            'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S"),
+            'results': results
+        }
+        streamed = [r for r in results if 'ttft' in r]
+        if streamed:
+            boxed = [r['time_to_boxed'] for r in streamed if 'time_to_boxed' in r]
+            run_summary['streaming'] = {
+                'ttft_p50': float(np.median([r['ttft'] for r in streamed])),
+                'time_to_boxed_p50': float(np.median(boxed)) if boxed else None,
+                'cut_off': sum(1 for r in streamed if r.get('stream_cut_off')),
+            }
+
+        logger.info(f"Run {run_id} completed: {accuracy:.2f}% accuracy ({correct_count}/{len(results)}) in {run_duration:.1f}s")
+        logger.info(f"Average time per question: {run_summary['avg_time_per_question']:.1f}s")
+        for throughput in run_summary['worker_throughput']:
+            logger.info(f"Worker {throughput['worker_idx']}: {throughput['completed']} questions, "
+                        f"{throughput['questions_per_hour']:.0f} questions/hour")
+        if run_summary['cache_hits']:
+            logger.info(f"Answered from the response cache: {run_summary['cache_hits']}/{len(results)}")
+        if run_summary['rate_limit_wait']:
+            logger.info(f"Time spent waiting on rate limits: {run_summary['rate_limit_wait']:.1f}s")
+        if 'streaming' in run_summary:
+            streaming = run_summary['streaming']
+            boxed = streaming['time_to_boxed_p50']
+            logger.info(f"Streaming: median time to first token {streaming['ttft_p50']:.1f}s, "
+                        f"to answer {f'{boxed:.1f}s' if boxed is not None else 'n/a'}, "
+                        f"{streaming['cut_off']} cut off after the answer")
+
+        return run_summary
+
+    def partial_file(self, run_id: int) -> Path:
+        """Live partial results of a run: one JSON record per answered question"""
+        return self.partial_dir / f"{self.run_prefix}_run_{run_id:02d}_partial.jsonl"
+
+    def save_partial_run_results(self, run_id: int):
+        """Append the run's results since the last flush to its partial file"""
+        results = self._run_results(run_id)
+        written = self._partial_written.get(run_id)
+        # The first flush of a session rewrites the file, which may predate a resume
+        mode = 'w' if written is None else 'a'
+        new_results = results[written or 0:]
+        if mode == 'a' and not new_results:
+            return
+
+        try:
+            with open(self.partial_file(run_id), mode, encoding='utf-8') as f:
+                for result in new_results:
+                    f.write(json.dumps(to_json_serializable(result), ensure_ascii=False) + "\n")
+            self._partial_written[run_id] = len(results)
+            logger.debug(f"💾 Partial results of Run {run_id}: {len(results)} questions")
+        except Exception as e:
+            logger.error(f"❌ Error saving partial results: {e}")
+
+    def save_run_results(self, run_summary: Dict):
+        """Save results for a single run"""
+        filename = run_file_name(run_summary)
+        write_json_atomic(self.results_dir / filename, run_summary)
+
+        # The completed run supersedes its partial results (and snapshots from older versions)
+        for partial_file in self.partial_dir.glob(f"{self.run_prefix}_run_{run_summary['run_id']:02d}_partial*.json*"):
+            partial_file.unlink()
+        self._partial_written.pop(run_summary['run_id'], None)
+
+        logger.info(f"Run {run_summary['run_id']} results saved to: {filename}")
+
+    def _complete_run(self, run_summary: Dict):
+        """Write a finished run, record it in the state and move on to the next run"""
+        run_id = run_summary['run_id']
+        self.save_run_results(run_summary)
+
+        # Update state
+        self.state.all_run_summaries.append(run_summary)
+        self.state.stats.add_run(run_summary)
+        self._advance_run(run_id + 1)
+
+        # The run file now holds the run's results; drop them from the journal
+        self.state_store.compact(self.state)
+
+        # Print progress
+        completed_runs = len(self.state.all_run_summaries)
+        progress = (run_id / self.num_runs) * 100
+        elapsed = time.time() - self.state.start_time
+        eta = (elapsed / completed_runs) * (self.num_runs - run_id)
+
+        low, high = self.state.stats.runs.confidence_interval()
+        logger.info(f"Progress: {progress:.1f}% | ETA: {eta/3600:.1f}h | Avg accuracy so far: "
+                    f"{self.state.stats.runs.mean:.2f}% (95% CI {low:.2f}-{high:.2f}%)")
+        self.check_stopping_rule()
+
+    async def run_pipelined(self):
+        """Evaluate all remaining runs from one queue so a run starts while the previous one drains
+
+        Questions are queued run after run, so workers move on to run k+1 as soon as
+        run k has nothing left to hand out instead of idling behind its stragglers.
+        Results keep their own run_id and run seed, and runs are still summarised and
+        written one at a time, in order, once every question of the run has returned.
+        Run durations therefore overlap: each spans first dispatch to last answer.
+        """
+        first_run = self.state.current_run
+        outstanding = {}  # run_id -> questions not yet answered or failed
+        items = []
+        for run_id in range(first_run, self.num_runs + 1):
+            existing = (self.state.current_run_results if run_id == first_run
+                        else self.state.pending_run_results.get(run_id, []))
+            done = {r['question_idx'] for r in existing}
+            pending = [(run_id, question_idx, position)
+                       for question_idx, position in enumerate(self.run_order(run_id))
+                       if question_idx not in done]
+            outstanding[run_id] = len(pending)
+            items.extend(pending)
+
+        num_workers = self.backend.num_workers
+        slots = self.backend.max_in_flight
+        logger.info(f"🎯 {len(items)} questions of runs {first_run}-{self.num_runs} queued for "
+                    f"{num_workers} worker(s) x {slots} in flight (pipelined)")
+
+        run_start: Dict[int, float] = {}
+        run_workers: Dict[int, Dict[int, WorkerStats]] = defaultdict(dict)
+
+        def finish_ready_runs():
+            # Runs close strictly in order, so a fast run k+1 waits for run k's last question
+            while (not self._should_stop() and self.state.current_run <= self.num_runs
+                   and outstanding.get(self.state.current_run, 0) == 0):
+                run_id = self.state.current_run
+                run_duration = time.time() - run_start.get(run_id, time.time())
+                worker_throughput = [stats.summary(run_duration)
+                                     for _, stats in sorted(run_workers.pop(run_id, {}).items())]
+                run_summary = self._build_run_summary(run_id, run_duration, worker_throughput)
+                if run_summary:
+                    self._complete_run(run_summary)
+                else:
+                    self._advance_run(run_id + 1)
+
+        async def handle(worker_idx: int, item: Tuple[int, int, int]) -> bool:
+            run_id, question_idx, position = item
+            if run_id not in run_start:
+                run_start[run_id] = time.time()
+                logger.info(f"Starting Run {run_id}/{self.num_runs}")
+            question_data = self.df.iloc[position]
+
+            start = time.monotonic()
+            result = await self.evaluate_single_question(worker_idx, question_data, run_id, question_idx)
+            stats = run_workers[run_id].setdefault(worker_idx, WorkerStats(worker_idx))
+            stats.busy_time += time.monotonic() - start
+            if result is None:
+                stats.failed += 1
+            else:
+                stats.completed += 1
+
+            self._record_result(run_id, question_idx, question_data, result)
+            outstanding[run_id] -= 1
+            finish_ready_runs()
+            return result is not None
+
+        # Runs fully answered before an interruption only need writing out
+        finish_ready_runs()
+        await run_work_queue(
+            items, num_workers, handle,
+            slots_per_worker=slots,
+            worker_delay=self.backend.worker_delay,
+            should_stop=self._should_stop,
+        )
+        if self.stop_requested:
+            logger.info(f"⏹️ Stop requested, Run {self.state.current_run} left incomplete")
+
+    async def run_evaluation(self):
+        """Run complete evaluation with resume capability"""
+        logger.info(f"Starting {self.profile.name} evaluation of {self.backend.describe()}")
+        logger.info(f"Dataset: {len(self.df)} questions")
+        logger.info(f"Total runs planned: {self.num_runs}")
+
+        try:
+            self.prepare_images()
+
+            # Resume from where we left off, unless the runs so far already meet the stopping rule
+            self.check_stopping_rule()
+            if self.pipeline_runs:
+                await self.run_pipelined()
+            else:
+                for run_id in range(self.state.current_run, self.num_runs + 1):
+                    if self._should_stop():
+                        break
+
+                    run_summary = await self.run_single_evaluation_run(run_id)
+                    if run_summary:
+                        self._complete_run(run_summary)
+
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            logger.info("Evaluation interrupted by user")
+            self.interrupted = True
+        except Exception as e:
+            logger.error(f"Error during evaluation: {e}")
+        finally:
+            # Always save final state
+            self.save_state()
+
+            # Generate final report if we have results
+            if self.state.all_run_summaries:
+                self.generate_final_report()
+
+        logger.info("Evaluation session ended!")
+
+    def generate_final_report(self):
+        """Generate comprehensive final report"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_file = self.results_dir / f"{self.run_prefix}_final_report_{timestamp}.txt"
+
+        report_content = build_final_report(
+            title=f"{self.profile.name} {self.backend.describe()} Evaluation Report",
+            model=self.backend.describe(),
+            dataset=self.profile.name,
+            num_questions=len(self.df),
+            num_runs=self.num_runs,
+            all_run_summaries=self.state.all_run_summaries,
+            categories=self.profile.report_categories,
+            stop_reason=self.stop_reason,
+            accumulator=self.state.stats,
+        )
+
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(report_content)
+
+        logger.info(f"Final report saved to: {report_file}")
+        logger.info(f"Pass@1 Accuracy: {self.state.stats.runs.mean:.2f}% ± {self.state.stats.runs.std:.2f}%")
+
+    def print_progress(self):
+        """Print current progress without running evaluation"""
+        state = self.state
+
+        print(f"\n{'='*60}")
+        print("CURRENT EVALUATION PROGRESS")
+        print(f"{'='*60}")
+        print(f"Model: {self.backend.describe()}")
+        print(f"Current Run: {state.current_run}/{self.num_runs}")
+        print(f"Questions in Current Run: {len(state.current_run_results)}/{len(self.df)}")
+        print(f"Completed Questions: {state.completed_questions:,}/{state.total_questions:,}")
+        print(f"Progress: {(state.completed_questions/state.total_questions)*100:.1f}%")
+
+        if state.current_run_results:
+            current_correct = sum(1 for r in state.current_run_results if r['is_correct'])
+            current_accuracy = (current_correct / len(state.current_run_results)) * 100
+            print(f"Current Run {state.current_run} so far: {current_accuracy:.1f}% ({current_correct}/{len(state.current_run_results)})")
+
+        if state.all_run_summaries:
+            print(f"Completed Runs: {len(state.all_run_summaries)}")
+            print(f"Average Accuracy: {state.stats.runs.mean:.2f}% ± {state.stats.runs.std:.2f}%")
+
+            elapsed = time.time() - state.start_time
+            eta = (elapsed / len(state.all_run_summaries)) * (self.num_runs - len(state.all_run_summaries))
+            print(f"Elapsed Time: {elapsed/3600:.1f}h")
+            print(f"Estimated Time Remaining: {eta/3600:.1f}h")
+
+        if state.failed_questions:
+            print(f"Failed Questions: {len(state.failed_questions)}")
+
+        print(f"Last Save: {datetime.fromtimestamp(state.last_save_time).strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"State File: {self.state_file}")
+        print(f"{'='*60}\n")
+
+    def reset_state(self) -> List[Path]:
+        """Delete saved state and partial results so the next run starts fresh"""
+        removed = self.state_store.remove()
+        for partial_file in self.partial_dir.glob(f"{self.run_prefix}_run_*_partial*.json*"):
+            partial_file.unlink()
+            removed.append(partial_file)
+        self._partial_written = {}
+        self.state = new_state(len(self.df) * self.num_runs)
+        self.state.stats = AccuracyAccumulator(self.profile.report_categories)
+        return removed
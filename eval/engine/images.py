@@ -0,0 +1,154 @@
+import base64
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from .state import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+MIME_TYPES = {'PNG': 'image/png', 'JPEG': 'image/jpeg', 'WEBP': 'image/webp'}
+SUFFIX_FORMATS = {'.png': 'PNG', '.jpg': 'JPEG', '.jpeg': 'JPEG', '.webp': 'WEBP'}
+
+
+@lru_cache(maxsize=4096)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    """SHA-256 of a file; keyed on mtime and size so edited images are hashed again"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def image_digest(path: Path) -> str:
+    """Content hash of an image file"""
+    stat = os.stat(path)
+    return _file_digest(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@dataclass(frozen=True)
+class ImageProfile:
+    """How a backend wants its images: longest side, encoding format and quality, base64 or raw"""
+    max_side: Optional[int] = None  # None keeps the original size
+    format: str = 'PNG'
+    quality: int = 90  # JPEG/WEBP only
+    base64: bool = False  # Store base64 text (for JSON APIs) instead of raw bytes
+
+    @property
+    def mime_type(self) -> str:
+        return MIME_TYPES[self.format]
+
+    @property
+    def key(self) -> str:
+        return f"{self.format.lower()}_{self.max_side or 'full'}_q{self.quality}{'_b64' if self.base64 else ''}"
+
+
+def preprocess_image(path: str, profile: ImageProfile) -> bytes:
+    """Ready-to-send payload of one image file (runs in a worker process)"""
+    if profile.max_side is None and SUFFIX_FORMATS.get(Path(path).suffix.lower()) == profile.format:
+        # Already in the wanted format and size: send the file as is, no decode/re-encode
+        with open(path, 'rb') as f:
+            data = f.read()
+    else:
+        from PIL import Image
+
+        with Image.open(path) as image:
+            if profile.max_side and max(image.size) > profile.max_side:
+                image.thumbnail((profile.max_side, profile.max_side), Image.LANCZOS)
+            if profile.format == 'JPEG' and image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            buffer = io.BytesIO()
+            if profile.format in ('JPEG', 'WEBP'):
+                image.save(buffer, format=profile.format, quality=profile.quality)
+            else:
+                image.save(buffer, format=profile.format)
+            data = buffer.getvalue()
+    return base64.b64encode(data) if profile.base64 else data
+
+
+class ImageCache:
+    """Content-addressed store of preprocessed image payloads for one image profile
+
+    Payloads are appended to ``{profile.key}.bin`` and located through a JSON
+    index keyed by the SHA-256 of the source file, so the same crop is prepared
+    once however many models, runs or dataset copies use it. Lookups read
+    straight from a memory map of the data file. ``prepare`` fills the store in
+    a process pool before a run starts, which takes image decoding and encoding
+    out of the per-request path. One process should prepare a store at a time.
+    """
+
+    def __init__(self, directory, profile: ImageProfile = ImageProfile()):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.profile = profile
+        self.data_file = self.directory / f"{profile.key}.bin"
+        self.index_file = self.directory / f"{profile.key}.idx.json"
+
+        self.index: Dict[str, Tuple[int, int]] = {}  # content hash -> (offset, length)
+        if self.index_file.exists():
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.index = {digest: tuple(entry) for digest, entry in json.load(f).items()}
+        self._file = None
+        self._map = None
+        self._open()
+
+    def _open(self):
+        if self.data_file.exists() and self.data_file.stat().st_size:
+            self._file = open(self.data_file, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def prepare(self, paths: Iterable[Path], workers: Optional[int] = None) -> int:
+        """Preprocess every image not yet in the store; returns how many were added
+
+        ``workers=0`` preprocesses in this process (no pool).
+        """
+        missing = {}
+        for path in paths:
+            digest = image_digest(path)
+            if digest not in self.index and digest not in missing:
+                missing[digest] = str(path)
+        if not missing:
+            return 0
+
+        logger.info(f"🖼️ Preprocessing {len(missing)} images for profile {self.profile.key}")
+        if workers == 0:
+            payloads = [preprocess_image(path, self.profile) for path in missing.values()]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                payloads = list(pool.map(preprocess_image, missing.values(),
+                                         [self.profile] * len(missing), chunksize=16))
+
+        # The map has to be released before the data file grows (required on Windows)
+        self.close()
+        with open(self.data_file, 'ab') as f:
+            offset = f.tell()
+            for digest, payload in zip(missing, payloads):
+                f.write(payload)
+                self.index[digest] = (offset, len(payload))
+                offset += len(payload)
+        write_json_atomic(self.index_file, self.index)
+        self._open()
+        return len(missing)
+
+    def get(self, path: Path) -> Optional[bytes]:
+        """Payload of an image, or None if it has not been prepared"""
+        entry = self.index.get(image_digest(path))
+        if entry is None or self._map is None:
+            return None
+        offset, length = entry
+        return self._map[offset:offset + length]
@@ -0,0 +1,279 @@
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# ('fixed', s) | ('uniform', low, high) | ('lognormal', median, sigma) | ('exponential', mean)
+LatencySpec = Union[float, Tuple]
+
+DEFAULT_ANSWERS = ('A', 'B', 'C', 'D', 'AC', 'BD', '12', '0.5')
+# What a model keeps writing after its answer
+PADDING_WORDS = ('Let', 'me', 'double-check', 'this', 'result', 'once', 'more.')
+
+
+def sample_latency(spec: LatencySpec, rng: random.Random) -> float:
+    """Draw one service time from a latency spec"""
+    if isinstance(spec, (int, float)):
+        return float(spec)
+    kind, *params = spec
+    if kind == 'fixed':
+        return float(params[0])
+    if kind == 'uniform':
+        return rng.uniform(*params)
+    if kind == 'lognormal':
+        median, sigma = params
+        return median * rng.lognormvariate(0.0, sigma)
+    if kind == 'exponential':
+        return rng.expovariate(1.0 / params[0])
+    raise ValueError(f"Unknown latency distribution '{kind}'")
+
+
+class MockModelServer:
+    """Local stand-in for a model API speaking the Gemini and OpenAI-compatible request shapes
+
+    Serves ``POST /v1beta/models/{model}:generateContent`` (Gemini REST) and
+    ``POST /v1/chat/completions`` plus ``GET /v1/models`` (OpenAI-compatible),
+    answering with a canned response ending in ``\\boxed{...}`` after a service
+    time drawn from ``latency``. Streamed requests (``:streamGenerateContent``,
+    or ``"stream": true``) get the service time as time to first token, then one
+    word every ``token_interval`` seconds as server-sent events;
+    ``trailing_tokens`` words of padding after the answer let a client's early
+    cut-off show up in ``cancelled_streams``. A share of requests fails with 429 (carrying a
+    Gemini-style retryDelay) or 500 instead. Every draw is seeded by the request
+    body and how often that body was seen, so a benchmark replays identically
+    however the requests interleave.
+
+    ``answer`` maps the prompt to the boxed answer; by default one of
+    ``DEFAULT_ANSWERS`` is picked per prompt.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: LatencySpec = ('lognormal', 0.2, 0.5),
+                 error_rate_429: float = 0.0, error_rate_5xx: float = 0.0, retry_delay: float = 1.0,
+                 completion_tokens: int = 400, answer: Optional[Callable[[str], str]] = None,
+                 answers: Sequence[str] = DEFAULT_ANSWERS, seed: int = 0,
+                 token_interval: float = 0.0, trailing_tokens: int = 0):
+        self.latency = latency
+        self.error_rate_429 = error_rate_429
+        self.error_rate_5xx = error_rate_5xx
+        self.retry_delay = retry_delay
+        self.completion_tokens = completion_tokens
+        self.answer = answer
+        self.answers = list(answers)
+        self.seed = seed
+        self.token_interval = token_interval
+        self.trailing_tokens = trailing_tokens
+
+        self._lock = threading.Lock()
+        self._seen = Counter()
+        self.service_times: List[float] = []
+        self.status_counts = Counter()
+        self.cancelled_streams = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; without this, Nagle + delayed ACK add ~40 ms
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def do_GET(self):
+                if self.path.rstrip('/').endswith('/models'):
+                    self._send(200, {'object': 'list', 'data': [{'id': 'mock-model', 'object': 'model'}]})
+                else:
+                    self._send(404, {'error': {'code': 404, 'message': 'Not found'}})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                path = self.path.split('?')[0]
+                if ':generateContent' in path:
+                    status, payload = server.handle(body, 'gemini')
+                elif ':streamGenerateContent' in path:
+                    status, payload = server.handle(body, 'gemini', stream=True)
+                elif path.rstrip('/').endswith('/chat/completions'):
+                    stream = bool(json.loads(body or b'{}').get('stream'))
+                    status, payload = server.handle(body, 'openai', stream=stream)
+                else:
+                    status, payload = 404, {'error': {'code': 404, 'message': 'Not found'}}
+                if isinstance(payload, list):
+                    self._send_events(payload)
+                else:
+                    self._send(status, payload)
+
+            def _send(self, status: int, payload: Dict):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_events(self, events: List):
+                """Server-sent events in chunked encoding, one event per token interval"""
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                try:
+                    for i, event in enumerate(events):
+                        if i and server.token_interval:
+                            time.sleep(server.token_interval)
+                        data = f"data: {event if isinstance(event, str) else json.dumps(event)}\r\n\r\n".encode('utf-8')
+                        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+                        self.wfile.flush()
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client stopped reading (early cut-off)
+                    with server._lock:
+                        server.cancelled_streams += 1
+                    self.close_connection = True
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    def start(self) -> 'MockModelServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 Mock model server listening on {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'MockModelServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.service_times = []
+            self.status_counts = Counter()
+            self.cancelled_streams = 0
+
+    def handle(self, body: bytes, shape: str, stream: bool = False) -> Tuple[int, Union[Dict, List]]:
+        """Serve one request body in the given API shape; blocks for the drawn service time
+
+        Successful streamed requests return the list of events to send instead of one payload.
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            self._seen[digest] += 1
+            rng = random.Random(f"{self.seed}:{digest}:{self._seen[digest]}")
+
+        prompt = self._prompt(json.loads(body or b'{}'), shape)
+        service_time = sample_latency(self.latency, rng)
+        roll = rng.random()
+        time.sleep(service_time)
+
+        if roll < self.error_rate_429:
+            status, payload = 429, self._rate_limit_error(shape)
+        elif roll < self.error_rate_429 + self.error_rate_5xx:
+            status, payload = 500, {'error': {'code': 500, 'message': 'Internal error (injected)', 'status': 'INTERNAL'}}
+        else:
+            answer = self.answer(prompt) if self.answer else random.Random(f"{self.seed}:{prompt}").choice(self.answers)
+            text = f"Working through the problem step by step.\n\nFinal answer: \\boxed{{{answer}}}"
+            text += ''.join(f" {PADDING_WORDS[i % len(PADDING_WORDS)]}" for i in range(self.trailing_tokens))
+            if stream:
+                status, payload = 200, self._stream_events(shape, text, len(prompt) // 4)
+            else:
+                status, payload = 200, self._completion(shape, text, len(prompt) // 4)
+
+        with self._lock:
+            self.service_times.append(service_time)
+            self.status_counts[status] += 1
+        return status, payload
+
+    @staticmethod
+    def _prompt(request: Dict, shape: str) -> str:
+        """Text parts of the request, concatenated"""
+        texts = []
+        if shape == 'gemini':
+            for content in request.get('contents', []):
+                texts.extend(part['text'] for part in content.get('parts', []) if 'text' in part)
+        else:
+            for message in request.get('messages', []):
+                content = message.get('content')
+                if isinstance(content, str):
+                    texts.append(content)
+                else:
+                    texts.extend(part['text'] for part in content or [] if part.get('type') == 'text')
+        return "\n".join(texts)
+
+    def _rate_limit_error(self, shape: str) -> Dict:
+        message = f"Resource has been exhausted (injected). Please retry in {self.retry_delay:g}s."
+        error = {'code': 429, 'message': message, 'status': 'RESOURCE_EXHAUSTED'}
+        if shape == 'gemini':
+            error['details'] = [{'@type': 'type.googleapis.com/google.rpc.RetryInfo',
+                                 'retryDelay': f"{self.retry_delay:g}s"}]
+        return {'error': error}
+
+    def _completion(self, shape: str, text: str, prompt_tokens: int) -> Dict:
+        total_tokens = prompt_tokens + self.completion_tokens
+        if shape == 'gemini':
+            return {
+                'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'},
+                                'finishReason': 'STOP', 'index': 0}],
+                'usageMetadata': {'promptTokenCount': prompt_tokens,
+                                  'candidatesTokenCount': self.completion_tokens,
+                                  'totalTokenCount': total_tokens},
+                'modelVersion': 'mock-model',
+            }
+        return {
+            'id': 'chatcmpl-mock',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': 'mock-model',
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': self.completion_tokens,
+                      'total_tokens': total_tokens},
+        }
+
+    def _stream_events(self, shape: str, text: str, prompt_tokens: int) -> List:
+        """The completion split into one event per word, usage on the last event"""
+        words = re.findall(r'\s*\S+', text)
+        events = []
+        for i, word in enumerate(words):
+            last = i == len(words) - 1
+            if shape == 'gemini':
+                event = {'candidates': [{'content': {'parts': [{'text': word}], 'role': 'model'}, 'index': 0}],
+                         'modelVersion': 'mock-model'}
+                if last:
+                    event['candidates'][0]['finishReason'] = 'STOP'
+                    event['usageMetadata'] = {'promptTokenCount': prompt_tokens,
+                                              'candidatesTokenCount': self.completion_tokens,
+                                              'totalTokenCount': prompt_tokens + self.completion_tokens}
+            else:
+                event = {'id': 'chatcmpl-mock', 'object': 'chat.completion.chunk', 'model': 'mock-model',
+                         'choices': [{'index': 0, 'delta': {'content': word},
+                                      'finish_reason': 'stop' if last else None}]}
+            events.append(event)
+        if shape == 'openai':
+            events.append({'id': 'chatcmpl-mock', 'object': 'chat.completion.chunk', 'model': 'mock-model',
+                           'choices': [], 'usage': {'prompt_tokens': prompt_tokens,
+                                                    'completion_tokens': self.completion_tokens,
+                                                    'total_tokens': prompt_tokens + self.completion_tokens}})
+            events.append('[DONE]')
+        return events
@@ -0,0 +1,189 @@
+import itertools
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .backends.random_baseline import MCQ_CHOICES
+from .datasets import NUMERICAL, DatasetProfile
+from .scoring import _acceptable_values, extract_answer, is_answer_correct
+
+logger = logging.getLogger(__name__)
+
+# Question types RandomBaselineBackend.random_answer draws multi-letter or numerical answers for;
+# every other type gets a single letter
+MULTIPLE_CHOICE_TYPE = "MCQ-Multiple"
+NUMERICAL_TYPE = "Numerical"
+
+# Numerical draws: 70% randint(0, 999), 30% round(uniform(0, 100), 2)
+INTEGER_VALUES = np.arange(1000, dtype=np.float64)
+DECIMAL_VALUES = np.arange(10001, dtype=np.float64) / 100
+DECIMAL_WEIGHTS = np.full(10001, 1 / 10000)
+DECIMAL_WEIGHTS[[0, -1]] = 1 / 20000  # Only half a rounding bucket at either end of [0, 100)
+
+# How simulate() draws runs, stated here only (summaries and the formatted report quote it). Drawing answers and
+# scoring them gives the same distribution exactly when hit_probability is right, which the tests check
+SIMULATION_METHOD = ("one binomial per group of questions with equal closed-form hit probability "
+                     "(answers are not drawn and scored)")
+
+
+def letter_outcomes(question_type: str) -> List[Tuple[str, float]]:
+    """Every answer RandomBaselineBackend can give to a letter question, with its probability"""
+    if question_type != MULTIPLE_CHOICE_TYPE:
+        return [(letter, 1 / len(MCQ_CHOICES)) for letter in MCQ_CHOICES]
+    outcomes = []
+    for size in range(1, len(MCQ_CHOICES) + 1):
+        subsets = list(itertools.combinations(MCQ_CHOICES, size))
+        outcomes.extend((''.join(subset), 1 / len(MCQ_CHOICES) / len(subsets)) for subset in subsets)
+    return outcomes
+
+
+def numerical_hit_probability(correct: str, acceptable: Optional[list]) -> float:
+    """Chance a random numerical answer passes is_answer_correct, evaluated over every possible draw"""
+    values = np.concatenate([INTEGER_VALUES, DECIMAL_VALUES])
+    weights = np.concatenate([np.full(1000, 0.7 / 1000), 0.3 * DECIMAL_WEIGHTS])
+
+    if acceptable is not None:
+        hits = np.isin(values, np.asarray(acceptable, dtype=np.float64))
+    else:
+        try:
+            correct_num = float(correct)
+        except ValueError:
+            return 0.0  # Only an identical string would match, and every draw parses as a number
+        tolerance = abs(correct_num) * 0.01 if abs(correct_num) > 1 else 0.01
+        hits = np.abs(values - correct_num) <= tolerance
+    return float(weights[hits].sum())
+
+
+class RandomBaselineModel:
+    """Closed-form and vectorized Monte-Carlo random baseline over a whole dataset
+
+    ``hit_probability`` holds, per question, the exact chance that the random
+    baseline backend's answer is scored correct. It enumerates every answer the
+    backend can draw and applies the evaluator's scoring rules: the real
+    extractor and scorer for letter answers, the same arithmetic in NumPy for
+    the 11,000 possible numerical draws. From that follow:
+
+    - the expected score, overall and per question type (closed form);
+    - the exact distribution of a run's correct count (Poisson-binomial), hence
+      exact confidence bands for a single run's accuracy;
+    - ``simulate``: accuracies of any number of runs in one batch from a seeded
+      NumPy Generator, drawn as ``SIMULATION_METHOD`` says; a million runs take
+      about a second.
+    """
+
+    def __init__(self, df: pd.DataFrame, profile: DatasetProfile):
+        self.df = df.reset_index(drop=True)
+        self.profile = profile
+        self.question_types = self.df[profile.type_column].astype(str).to_numpy()
+        self.hit_probability = np.array([self._hit_probability(row) for _, row in self.df.iterrows()])
+
+    def _hit_probability(self, question_data: pd.Series) -> float:
+        question_type = str(question_data[self.profile.type_column])
+        kind = self.profile.kind(question_data[self.profile.type_column])
+
+        if question_type == NUMERICAL_TYPE and kind == NUMERICAL:
+            correct = str(question_data[self.profile.answer_column]).strip().upper()
+            return numerical_hit_probability(correct, _acceptable_values(question_data))
+        if question_type == NUMERICAL_TYPE:
+            logger.warning(f"Numerical answers scored as {kind}: not covered by the closed form, counted as misses")
+            return 0.0
+
+        # A handful of letter outcomes: score each one exactly as a real response would be
+        return sum(probability for answer, probability in letter_outcomes(question_type)
+                   if is_answer_correct(extract_answer(f"Random answer: \\boxed{{{answer}}}", kind),
+                                        question_data, self.profile))
+
+    @property
+    def num_questions(self) -> int:
+        return len(self.hit_probability)
+
+    def expected_accuracy(self) -> float:
+        """Expected accuracy (%) of one random run"""
+        return float(self.hit_probability.mean() * 100)
+
+    def expected_by_type(self) -> Dict[str, Dict]:
+        """Expected score per question type: questions, expected correct and accuracy (%)"""
+        by_type = {}
+        for question_type in sorted(set(self.question_types)):
+            probabilities = self.hit_probability[self.question_types == question_type]
+            by_type[question_type] = {
+                'questions': len(probabilities),
+                'expected_correct': float(probabilities.sum()),
+                'expected_accuracy': float(probabilities.mean() * 100),
+            }
+        return by_type
+
+    def correct_count_distribution(self) -> np.ndarray:
+        """Exact probability of every possible number of correct answers in one run (Poisson-binomial)"""
+        pmf = np.zeros(self.num_questions + 1)
+        pmf[0] = 1.0
+        for n, p in enumerate(self.hit_probability, start=1):
+            pmf[1:n + 1] = pmf[1:n + 1] * (1 - p) + pmf[:n] * p
+            pmf[0] *= 1 - p
+        return pmf
+
+    def confidence_band(self, level: float = 0.95) -> Tuple[float, float]:
+        """Exact central interval of a single run's accuracy (%)"""
+        cdf = np.cumsum(self.correct_count_distribution())
+        tail = (1 - level) / 2
+        low = int(np.searchsorted(cdf, tail))
+        high = int(np.searchsorted(cdf, 1 - tail))
+        return low / self.num_questions * 100, high / self.num_questions * 100
+
+    def simulate(self, num_runs: int, seed: Optional[int] = None) -> np.ndarray:
+        """Accuracy (%) of num_runs random runs, drawn in one vectorized batch (see SIMULATION_METHOD)"""
+        rng = np.random.default_rng(seed)
+        groups = defaultdict(int)
+        for p in self.hit_probability:
+            groups[p] += 1
+
+        correct = np.zeros(num_runs, dtype=np.int64)
+        for p, count in groups.items():
+            if p > 0:
+                correct += rng.binomial(count, p, size=num_runs)
+        return correct / self.num_questions * 100
+
+    def summary(self, num_runs: int = 1_000_000, seed: Optional[int] = None, level: float = 0.95) -> Dict:
+        """Closed-form expectation and band next to a Monte-Carlo sample of num_runs runs"""
+        start_time = time.time()
+        accuracies = self.simulate(num_runs, seed)
+        tail = (1 - level) / 2 * 100
+        return {
+            'num_questions': self.num_questions,
+            'expected_accuracy': self.expected_accuracy(),
+            'expected_by_type': self.expected_by_type(),
+            'exact_band': self.confidence_band(level),
+            'simulated_runs': num_runs,
+            'simulated_mean': float(accuracies.mean()),
+            'simulated_std': float(accuracies.std(ddof=1)) if num_runs > 1 else 0.0,
+            'simulated_band': (float(np.percentile(accuracies, tail)), float(np.percentile(accuracies, 100 - tail))),
+            'simulation_time': time.time() - start_time,
+            'simulation_method': SIMULATION_METHOD,
+        }
+
+
+def format_random_baseline(summary: Dict, level: float = 0.95) -> str:
+    lines = [
+        f"{'='*60}",
+        "RANDOM BASELINE (closed form + Monte Carlo)",
+        f"{'='*60}",
+        f"Questions: {summary['num_questions']}",
+        f"Expected accuracy: {summary['expected_accuracy']:.3f}%",
+        f"Exact {level*100:.0f}% band of one run: "
+        f"{summary['exact_band'][0]:.2f}% - {summary['exact_band'][1]:.2f}%",
+        f"Simulated {summary['simulated_runs']:,} runs: {summary['simulated_mean']:.3f}% "
+        f"± {summary['simulated_std']:.3f}% "
+        f"(band {summary['simulated_band'][0]:.2f}% - {summary['simulated_band'][1]:.2f}%, "
+        f"{summary['simulation_time']:.2f}s)",
+        f"  Simulation: {summary.get('simulation_method', SIMULATION_METHOD)}",
+        "",
+        "Expected accuracy by question type:",
+    ]
+    for question_type, stats in summary['expected_by_type'].items():
+        lines.append(f"  {question_type:12s}: {stats['expected_accuracy']:6.3f}% "
+                     f"({stats['expected_correct']:.2f}/{stats['questions']} expected correct)")
+    return "\n".join(lines)
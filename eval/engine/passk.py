@@ -0,0 +1,110 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .correctness import CorrectnessTensor
+
+# Set bits of every byte value
+POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+
+def pass_at_k(answered: np.ndarray, correct: np.ndarray, max_k: Optional[int] = None) -> np.ndarray:
+    """Unbiased pass@k of every question for k = 1..max_k, from n answered runs with c correct
+
+    pass@k = 1 - C(n-c, k) / C(n, k), evaluated as 1 - prod_{i<k} (n-c-i) / (n-i)
+    with a cumulative product over k. Returns a (questions, max_k) array, NaN
+    where a question has fewer than k answered runs.
+    """
+    answered = np.asarray(answered, dtype=np.float64)[:, None]
+    correct = np.asarray(correct, dtype=np.float64)[:, None]
+    max_k = int(answered.max(initial=0)) if max_k is None else max_k
+    i = np.arange(max_k, dtype=np.float64)[None, :]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        factors = np.clip((answered - correct - i) / (answered - i), 0.0, 1.0)
+        estimate = 1.0 - np.cumprod(factors, axis=1)
+    return np.where(i < answered, estimate, np.nan)
+
+
+class RunMatrix:
+    """Question × run correctness of one model, bit-packed along the runs (8 runs per byte)
+
+    ``observed`` marks the runs that answered a question, so unfinished runs
+    and missing answers are skipped rather than scored wrong. Per-question
+    answered and correct counts are popcounts of the packed rows.
+    """
+
+    def __init__(self, model: str, correct_bits: np.ndarray, observed_bits: np.ndarray, num_runs: int,
+                 question_ids: Sequence[str], labels: pd.DataFrame):
+        self.model = model
+        self.correct_bits = correct_bits
+        self.observed_bits = observed_bits
+        self.num_runs = num_runs
+        self.question_ids = list(question_ids)
+        self.labels = labels
+        self.answered = POPCOUNT[observed_bits].sum(axis=1, dtype=np.int64)
+        self.correct = POPCOUNT[correct_bits & observed_bits].sum(axis=1, dtype=np.int64)
+
+    @classmethod
+    def from_tensor(cls, tensor: CorrectnessTensor, model: str) -> 'RunMatrix':
+        m = tensor.models.index(model)
+        num_runs = len(tensor.run_ids[model])
+        return cls(model, np.packbits(tensor.correct[:, :num_runs, m], axis=1),
+                   np.packbits(tensor.observed[:, :num_runs, m], axis=1), num_runs,
+                   tensor.question_ids, tensor.labels)
+
+    def unpack(self) -> np.ndarray:
+        """(questions, runs) correctness as booleans"""
+        return np.unpackbits(self.correct_bits & self.observed_bits, axis=1, count=self.num_runs).astype(bool)
+
+    def pass_at_k(self, max_k: Optional[int] = None) -> np.ndarray:
+        return pass_at_k(self.answered, self.correct, max_k)
+
+    def metrics(self, mask: Optional[np.ndarray] = None, max_k: Optional[int] = None) -> Dict:
+        """Pass@k for every k, majority-vote accuracy and run-to-run consistency (in %) over the masked questions
+
+        Majority vote counts a question as solved when more than half of its
+        runs got it right (half credit on a tie). Consistency is the mean share
+        of runs agreeing with a question's majority outcome; ``unanimous`` is the
+        share of questions every run got right, or every run got wrong.
+        """
+        mask = (self.answered > 0) if mask is None else mask & (self.answered > 0)
+        answered, correct = self.answered[mask], self.correct[mask]
+        max_k = self.num_runs if max_k is None else max_k
+        metrics = {'questions': int(mask.sum()), 'runs': self.num_runs}
+        if not len(answered):
+            return metrics
+
+        # Mean over the questions with at least k answered runs; NaN for a k no question reaches
+        estimates = pass_at_k(answered, correct, max_k)
+        valid = ~np.isnan(estimates)
+        counts = valid.sum(axis=0)
+        sums = np.where(valid, estimates, 0.0).sum(axis=0)
+        means = np.divide(sums, counts, out=np.full(max_k, np.nan), where=counts > 0)
+        for k, value in enumerate(means * 100, start=1):
+            metrics[f'pass@{k}'] = value
+        metrics['majority_vote'] = float(np.mean(np.sign(2 * correct - answered) + 1) / 2 * 100)
+        metrics['consistency'] = float(np.mean(np.maximum(correct, answered - correct) / answered) * 100)
+        metrics['unanimous'] = float(np.mean((correct == 0) | (correct == answered)) * 100)
+        return metrics
+
+
+def pack_runs(tensor: CorrectnessTensor) -> Dict[str, RunMatrix]:
+    """RunMatrix of every model in a tensor"""
+    return {model: RunMatrix.from_tensor(tensor, model) for model in tensor.models}
+
+
+def run_metrics(tensor: CorrectnessTensor, fields: Optional[Sequence[str]] = None,
+                max_k: Optional[int] = None) -> pd.DataFrame:
+    """Pass@k, majority vote and consistency of every model, overall and per slice (subject, type, ...)
+
+    ``max_k`` defaults to the most runs any model has; a model's pass@k for k
+    beyond its runs is NaN.
+    """
+    max_k = tensor.shape[1] if max_k is None else max_k
+    slices = tensor.slices(fields)
+    rows: List[Dict] = []
+    for model, matrix in pack_runs(tensor).items():
+        for (field, value), mask in slices.items():
+            rows.append({'model': model, 'field': field, 'value': value, **matrix.metrics(mask, max_k)})
+    return pd.DataFrame(rows)
@@ -0,0 +1,80 @@
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .datasets import DatasetProfile, MULTIPLE, NUMERICAL, SINGLE
+
+# "concise" is the prompt used for the hosted API models, "detailed" the one used for
+# the small local models, which need to be told explicitly where to put the final answer.
+PREAMBLES: Dict[str, str] = {
+    'concise': "",
+    'detailed': "You are an expert at solving JEE (Joint Entrance Examination) problems. Please solve this question step by step.\n\n",
+}
+
+INSTRUCTIONS: Dict[str, Dict[Optional[str], str]] = {
+    'concise': {
+        SINGLE: """This is a multiple choice question. Please analyze the question carefully, reason step-by-step and provide your answer.
+
+For this question:
+- Choose exactly ONE option (A, B, C, or D)
+- Format your answer in \\boxed{} as just one letter (e.g., \\boxed{A})""",
+        MULTIPLE: """This is a multiple choice question where multiple options can be correct. Please analyze the question carefully, reason step-by-step and provide your answer.
+
+For this question:
+- Choose ONE OR MORE options (A, B, C, and/or D)
+- Format your answer in \\boxed{} with letters (e.g., \\boxed{ABC} or \\boxed{B})""",
+        NUMERICAL: """This is a numerical question. Please analyze the question carefully, reason step-by-step and provide your answer.
+
+For this question:
+- Provide a numerical value
+- Round to appropriate decimal places if needed
+- Format your answer in \\boxed{} (e.g., \\boxed{2.5} or \\boxed{42})""",
+        None: """Please analyze the question carefully, reason step-by-step and provide your answer.
+Format your answer in \\boxed{} (e.g., \\boxed{A} for MCQ or \\boxed{42} for numerical)""",
+    },
+    'detailed': {
+        SINGLE: """This is a multiple choice question. Please analyze the question carefully, reason step-by-step and provide your answer.
+
+For this question:
+- Choose exactly ONE option (A, B, C, or D)
+- Show your reasoning clearly
+- Format your final answer in \\boxed{} as just one letter (e.g., \\boxed{A})
+
+Your response should end with your final answer in the format \\boxed{X} where X is the correct option.""",
+        MULTIPLE: """This is a multiple choice question where multiple options can be correct. Please analyze the question carefully, reason step-by-step and provide your answer.
+
+For this question:
+- Choose ONE OR MORE options (A, B, C, and/or D)
+- Show your reasoning clearly
+- Format your final answer in \\boxed{} with letters (e.g., \\boxed{ABC} or \\boxed{B})
+
+Your response should end with your final answer in the format \\boxed{X} where X contains all correct options.""",
+        NUMERICAL: """This is a numerical question. Please analyze the question carefully, reason step-by-step and provide your answer.
+
+For this question:
+- Provide a numerical value
+- Show your complete calculation
+- Round to appropriate decimal places if needed
+- Format your final answer in \\boxed{} (e.g., \\boxed{2.5} or \\boxed{42})
+
+Your response should end with your final answer in the format \\boxed{X} where X is the numerical answer.""",
+        None: """Please analyze the question carefully, reason step-by-step and provide your answer.
+Show your complete reasoning and format your final answer in \\boxed{} (e.g., \\boxed{A} for MCQ or \\boxed{42} for numerical)""",
+    },
+}
+
+IMAGE_QUESTION_TEXT = "The question (with its options, if any) is shown in the attached image."
+
+
+def create_question_prompt(question_data: pd.Series, profile: DatasetProfile, style: str = 'concise') -> str:
+    """Create appropriate prompt based on question type"""
+    kind = profile.kind(question_data[profile.type_column])
+
+    if profile.question_column:
+        question_text = question_data[profile.question_column]
+    else:
+        question_text = IMAGE_QUESTION_TEXT
+
+    prompt = f"{PREAMBLES[style]}Question: {question_text}\n\n"
+    prompt += INSTRUCTIONS[style][kind]
+    return prompt
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class GCRA:
+    """Generic cell rate algorithm over one per-minute budget (requests or tokens)
+
+    The whole state is the theoretical arrival time ``tat`` of the next unit, so a
+    reservation is O(1). Reservations are taken up front and never awaited
+    half-way, which makes the bucket safe to share between coroutines without a
+    lock: concurrent callers simply queue behind each other's reservations.
+    """
+    __slots__ = ('interval', 'capacity', 'tat')
+
+    def __init__(self, per_minute: float, burst: float = 1.0):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.interval = 60.0 / per_minute  # Seconds per unit
+        self.capacity = max(burst, 1.0) * self.interval  # How far ahead of "now" tat may run
+        self.tat = 0.0
+
+    def reserve(self, cost: float, now: float) -> float:
+        """Book cost units and return the time at which they may be used
+
+        Conformance is checked before the cost is charged, so a single request larger
+        than the burst (a long prompt against a small token burst) still goes out at
+        once when the bucket is idle and only delays the requests behind it.
+        """
+        tat = max(self.tat, now)
+        self.tat = tat + cost * self.interval
+        return max(now, tat + self.interval - self.capacity)
+
+    def peek(self, now: float) -> float:
+        """Earliest time a unit-cost reservation made now could be used, without booking it"""
+        return max(now, max(self.tat, now) + self.interval - self.capacity)
+
+    def adjust(self, delta_cost: float):
+        """Correct an earlier reservation once the real cost is known"""
+        self.tat += delta_cost * self.interval
+
+
+class KeyRateLimiter:
+    """Requests-per-minute and optional tokens-per-minute limits for one API key"""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: Optional[float] = None,
+                 burst: float = 1.0, token_burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.requests = GCRA(requests_per_minute, burst)
+        self.tokens = None
+        if tokens_per_minute:
+            # Default token burst: six seconds' worth of the budget
+            self.tokens = GCRA(tokens_per_minute, token_burst or tokens_per_minute / 10)
+        self.clock = clock
+        self.blocked_until = 0.0
+
+        # Wait statistics
+        self.num_requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self, tokens: float = 0) -> float:
+        """Reserve capacity for one request and return how long the caller must wait"""
+        now = self.clock()
+        ready = max(now, self.blocked_until)
+        start = self.requests.reserve(1, ready)
+        if self.tokens is not None and tokens:
+            start = max(start, self.tokens.reserve(tokens, ready))
+        delay = start - now
+
+        self.num_requests += 1
+        self.total_wait += delay
+        self.max_wait = max(self.max_wait, delay)
+        return delay
+
+    def ready_in(self) -> float:
+        """Seconds until this key could send its next request (0 if it can send now)"""
+        now = self.clock()
+        return self.requests.peek(max(now, self.blocked_until)) - now
+
+    async def acquire(self, tokens: float = 0) -> float:
+        """Wait until the request may be sent; returns the seconds waited"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def settle(self, estimated_tokens: float, actual_tokens: float):
+        """Charge the token budget with the difference between estimate and actual usage"""
+        if self.tokens is not None and actual_tokens:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+    def penalize(self, seconds: float):
+        """Hold every request on this key for the given time (after a 429 from the provider)"""
+        self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+
+    def summary(self) -> Dict:
+        return {
+            'requests': self.num_requests,
+            'total_wait': self.total_wait,
+            'avg_wait': self.total_wait / self.num_requests if self.num_requests else 0.0,
+            'max_wait': self.max_wait,
+        }
@@ -0,0 +1,165 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .accumulator import AccuracyAccumulator, convergence_curve
+
+
+def calculate_statistics(all_run_summaries: List[Dict]) -> Dict:
+    """Calculate overall statistics across all runs"""
+    return AccuracyAccumulator.from_run_summaries(all_run_summaries).statistics()
+
+
+def convergence_analysis(accuracies: List[float]) -> Dict:
+    """Running mean, spread and CI of every prefix of k ≥ 3 runs, in one vectorized pass"""
+    curve = convergence_curve(accuracies)
+    first = 2  # Prefixes of fewer than 3 runs are not analyzed
+    k = curve['k'][first:]
+    means, stds, sems = curve['mean'][first:], curve['std'][first:], curve['sem'][first:]
+    ci_low, ci_high = curve['ci_low'][first:], curve['ci_high'][first:]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        previous_means = curve['mean'][first - 1:-1]
+        relative_changes = np.abs(means - previous_means) / previous_means * 100
+        stability = np.where(means > 0, stds / means * 100, np.inf)
+    if len(relative_changes):
+        relative_changes[0] = np.inf
+
+    convergence_data = {
+        'k_values': k.astype(int).tolist(),
+        'running_means': means.tolist(),
+        'running_stds': stds.tolist(),
+        'running_sems': sems.tolist(),
+        'confidence_intervals': list(zip(ci_low.tolist(), ci_high.tolist())),
+        'relative_changes': relative_changes.tolist(),
+        'stability_metrics': stability.tolist(),
+        'cost_effectiveness': ((ci_high - ci_low) * k).tolist(),
+    }
+    convergence_data['optimal_k_recommendations'] = find_optimal_k(convergence_data)
+    return convergence_data
+
+
+def analyze_convergence_and_variance(all_run_summaries: List[Dict]) -> Dict:
+    """Analyze convergence for optimal k determination"""
+    return convergence_analysis([summary['accuracy'] for summary in all_run_summaries])
+
+
+def find_optimal_k(convergence_data: Dict) -> Dict:
+    """Find optimal k using multiple criteria"""
+    k_values = convergence_data['k_values']
+    relative_changes = convergence_data['relative_changes']
+    confidence_intervals = convergence_data['confidence_intervals']
+
+    recommendations = {}
+
+    # Convergence threshold
+    stable_change_threshold = 2.0
+    for k, rel_change in zip(k_values, relative_changes):
+        if rel_change < stable_change_threshold and k >= 5:
+            recommendations['convergence_threshold'] = {
+                'k': k,
+                'reason': f'First k where relative change < {stable_change_threshold}%',
+                'relative_change': rel_change
+            }
+            break
+
+    # CI width thresholds
+    target_ci_widths = [1.0, 2.0, 3.0, 5.0]
+    for target_width in target_ci_widths:
+        for k, ci in zip(k_values, confidence_intervals):
+            ci_width = ci[1] - ci[0]
+            if ci_width <= target_width and k >= 5:
+                recommendations[f'ci_width_{target_width}'] = {
+                    'k': k,
+                    'reason': f'First k achieving CI width ≤ {target_width}%',
+                    'ci_width': ci_width
+                }
+                break
+
+    # Pragmatic minimum
+    for k, ci in zip(k_values, confidence_intervals):
+        ci_width = ci[1] - ci[0]
+        if k >= 10 and ci_width <= 4.0:
+            recommendations['pragmatic_minimum'] = {
+                'k': k,
+                'reason': 'Pragmatic balance: k≥10 with CI width ≤4%',
+                'ci_width': ci_width
+            }
+            break
+
+    return recommendations
+
+
+def build_final_report(title: str, model: str, dataset: str, num_questions: int, num_runs: int,
+                       all_run_summaries: List[Dict], categories: Iterable[str],
+                       stop_reason: Optional[str] = None,
+                       accumulator: Optional[AccuracyAccumulator] = None) -> str:
+    """Render the plain-text final report shared by every model
+
+    Pass the sweep's running ``accumulator`` to report without rescanning every
+    run's results; it must cover ``categories`` and exactly ``all_run_summaries``.
+    """
+    if accumulator is None:
+        accumulator = AccuracyAccumulator.from_run_summaries(all_run_summaries, categories)
+    run_stats = accumulator.statistics()
+    convergence_data = convergence_analysis(accumulator.run_accuracies)
+
+    report_content = f"""{title}
+{'='*80}
+
+Evaluation Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Model: {model}
+Dataset: {dataset} ({num_questions} questions)
+Completed Runs: {len(all_run_summaries)}/{num_runs}{f' (stopped early: {stop_reason})' if stop_reason else ''}
+
+PERFORMANCE SUMMARY
+{'-'*40}
+Mean Accuracy: {run_stats['mean_accuracy']:.2f}% ± {run_stats['std_accuracy']:.2f}%
+Standard Error: {run_stats['sem_accuracy']:.2f}%
+95% Confidence Interval: [{run_stats['confidence_interval_95'][0]:.2f}%, {run_stats['confidence_interval_95'][1]:.2f}%]
+Range: {run_stats['min_accuracy']:.2f}% - {run_stats['max_accuracy']:.2f}%
+
+OPTIMAL k RECOMMENDATIONS FOR COST-EFFECTIVE EVALUATION
+{'-'*60}
+"""
+
+    recommendations = convergence_data['optimal_k_recommendations']
+    for rec_name in ['pragmatic_minimum', 'convergence_threshold', 'ci_width_2.0']:
+        if rec_name in recommendations:
+            rec = recommendations[rec_name]
+            report_content += f"{rec_name.replace('_', ' ').title()}: k = {rec['k']} ({rec['reason']})\n"
+
+    report_content += f"\nPERFORMANCE BREAKDOWN\n{'-'*40}\n"
+
+    # Performance by category
+    for category in categories:
+        report_content += f"\nBy {category.title()}:\n"
+        for cat_value, stats_dict in sorted(accumulator.breakdown(category).items(), key=lambda item: str(item[0])):
+            accuracy = (stats_dict['correct'] / stats_dict['total']) * 100
+            report_content += f"  {cat_value}: {accuracy:.2f}% ({stats_dict['correct']}/{stats_dict['total']})\n"
+
+    # Add individual run accuracies
+    report_content += f"\nINDIVIDUAL RUN ACCURACIES\n{'-'*40}\n"
+    for summary in all_run_summaries:
+        report_content += f"Run {summary['run_id']}: {summary['accuracy']:.2f}% ({summary['correct_answers']}/{summary['total_questions']})\n"
+
+    # Add timing information
+    if accumulator.answered:
+        avg_inference_time = accumulator.inference_time / accumulator.answered
+        total_inference_time = accumulator.inference_time
+        total_duration = accumulator.duration
+        report_content += f"\nTIMING ANALYSIS\n{'-'*40}\n"
+        report_content += f"Average inference time per question: {avg_inference_time:.2f}s\n"
+        report_content += f"Total inference time: {total_inference_time/3600:.2f}h\n"
+        report_content += f"Total wall-clock time: {total_duration/3600:.2f}h\n"
+        if total_duration > 0:
+            report_content += f"Questions per hour: {accumulator.answered/(total_duration/3600):.0f}\n"
+
+    # Add convergence analysis summary
+    if len(convergence_data['k_values']) > 5:
+        report_content += f"\nCONVERGENCE ANALYSIS\n{'-'*40}\n"
+        report_content += f"For reliable estimates (±2% CI width): k ≥ {recommendations.get('ci_width_2.0', {}).get('k', 'N/A')}\n"
+        report_content += f"For stable convergence (<2% change): k ≥ {recommendations.get('convergence_threshold', {}).get('k', 'N/A')}\n"
+
+    return report_content
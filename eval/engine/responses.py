@@ -0,0 +1,162 @@
+import logging
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    model TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    question_id TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    dict_id INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (model, run_id, question_id)
+);
+CREATE TABLE IF NOT EXISTS dictionaries (
+    dict_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data BLOB NOT NULL
+);
+"""
+
+
+class ResponseStore:
+    """Full model responses, compressed, in a sidecar SQLite file next to the run files
+
+    Run JSONs only keep the store's file name under ``response_store``; the text
+    itself is addressed by (model, run_id, question_id), i.e. the ``model``,
+    ``run_id`` and ``question_id`` fields every result already has. Responses are
+    zstd-compressed when the ``zstandard`` package is installed (zlib otherwise),
+    and once enough responses exist ``train_dictionary`` builds a shared zstd
+    dictionary that makes the many short, similar responses compress far better.
+    Safe to call from worker threads (the evaluator writes through asyncio.to_thread):
+    compressors and the connection are used under one lock.
+    """
+
+    def __init__(self, path, level: int = 10):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.level = level
+
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+        try:
+            import zstandard
+            self.zstd = zstandard
+        except ImportError:
+            self.zstd = None
+            logger.info("zstandard not installed, compressing responses with zlib")
+
+        self._compressors = {}
+        self._decompressors = {}
+        self._lock = threading.Lock()
+        row = self.conn.execute("SELECT MAX(dict_id) FROM dictionaries").fetchone()
+        self.dict_id = row[0] or 0
+
+    def _dictionary(self, dict_id: int):
+        data = self.conn.execute("SELECT data FROM dictionaries WHERE dict_id = ?", (dict_id,)).fetchone()[0]
+        return self.zstd.ZstdCompressionDict(data)
+
+    def _compress(self, text: str):
+        raw = text.encode('utf-8')
+        if self.zstd is None:
+            codec, dict_id, data = 'zlib', 0, zlib.compress(raw, 9)
+        else:
+            if self.dict_id not in self._compressors:
+                kwargs = {'dict_data': self._dictionary(self.dict_id)} if self.dict_id else {}
+                self._compressors[self.dict_id] = self.zstd.ZstdCompressor(level=self.level, **kwargs)
+            codec, dict_id, data = 'zstd', self.dict_id, self._compressors[self.dict_id].compress(raw)
+        # Very short responses can come out larger than they went in
+        return (codec, dict_id, data) if len(data) < len(raw) else ('raw', 0, raw)
+
+    def _decompress(self, codec: str, dict_id: int, data: bytes) -> str:
+        if codec == 'raw':
+            return data.decode('utf-8')
+        if codec == 'zlib':
+            return zlib.decompress(data).decode('utf-8')
+        if self.zstd is None:
+            raise RuntimeError("Response was stored with zstd; install the 'zstandard' package to read it")
+        if dict_id not in self._decompressors:
+            kwargs = {'dict_data': self._dictionary(dict_id)} if dict_id else {}
+            self._decompressors[dict_id] = self.zstd.ZstdDecompressor(**kwargs)
+        return self._decompressors[dict_id].decompress(data).decode('utf-8')
+
+    def put(self, model: str, run_id: int, question_id: str, text: str):
+        with self._lock:
+            codec, dict_id, data = self._compress(text)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (model, run_id, question_id, codec, dict_id, size, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (model, run_id, str(question_id), codec, dict_id, len(text), data),
+            )
+
+    def get(self, model: str, run_id: int, question_id: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT codec, dict_id, data FROM responses WHERE model = ? AND run_id = ? AND question_id = ?",
+                (model, run_id, str(question_id)),
+            ).fetchone()
+            return self._decompress(*row) if row else None
+
+    def get_run(self, model: str, run_id: int) -> Dict[str, str]:
+        """All responses of one run, by question_id"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT question_id, codec, dict_id, data FROM responses WHERE model = ? AND run_id = ?",
+                (model, run_id),
+            ).fetchall()
+            return {question_id: self._decompress(codec, dict_id, data)
+                    for question_id, codec, dict_id, data in rows}
+
+    def response_sizes(self, model: str, run_id: int) -> Dict[str, int]:
+        """Length in characters of every stored response of one run, by question_id, without decompressing"""
+        with self._lock:
+            rows = self.conn.execute("SELECT question_id, size FROM responses WHERE model = ? AND run_id = ?",
+                                     (model, run_id))
+            return dict(rows.fetchall())
+
+    def fill(self, results: List[Dict]) -> List[Dict]:
+        """Put the full response back into results loaded from a run JSON (in place)"""
+        runs = {}
+        for result in results:
+            key = (result['model'], result['run_id'])
+            if key not in runs:
+                runs[key] = self.get_run(*key)
+            text = runs[key].get(str(result['question_id']))
+            if text is not None:
+                result['full_response'] = text
+        return results
+
+    def train_dictionary(self, dict_size: int = 112640, max_samples: int = 5000) -> int:
+        """Train a zstd dictionary on stored responses; later writes use it. Returns its id"""
+        if self.zstd is None:
+            raise RuntimeError("Training a dictionary needs the 'zstandard' package")
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT codec, dict_id, data FROM responses ORDER BY RANDOM() LIMIT ?", (max_samples,)
+            ).fetchall()
+            samples = [self._decompress(*row).encode('utf-8') for row in rows]
+            dictionary = self.zstd.train_dictionary(dict_size, samples)
+            cursor = self.conn.execute("INSERT INTO dictionaries (data) VALUES (?)", (dictionary.as_bytes(),))
+            self.dict_id = cursor.lastrowid
+        logger.info(f"📚 Trained response dictionary {self.dict_id} on {len(samples)} responses")
+        return self.dict_id
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count, raw, stored = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM responses"
+            ).fetchone()
+        return {'responses': count, 'chars': raw, 'stored_bytes': stored,
+                'ratio': raw / stored if stored else 0.0}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,311 @@
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import marshal
+import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from .batch_scoring import _run_key, run_files
+from .responses import ResponseStore
+
+logger = logging.getLogger(__name__)
+
+ResultFilter = Callable[[Dict], bool]
+
+# The line opening the results array of an indented run file (write_json_atomic writes indent=2)
+_RESULTS_LINE = re.compile(rb'^(\s*)"results"\s*:\s*\[\s*(\])?\s*(,)?\s*$')
+# Parsed files of this process, keyed like the disk cache
+_MEMORY_CACHE: Dict[str, pd.DataFrame] = {}
+
+
+def _loads(data: Union[str, bytes]):
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def is_incorrect(result: Dict) -> bool:
+    """Filter: answers scored wrong"""
+    return result.get('is_correct', True) is False
+
+
+class _ResponseLengths:
+    """Lengths of the responses a run file's results keep in a ResponseStore, read once per run"""
+
+    def __init__(self, path: Path):
+        self.directories = (path.parent, path.parent.parent)  # Partial files sit in partial_results/
+        self.stores: Dict[str, Optional[ResponseStore]] = {}
+        self.runs: Dict[Tuple, Dict[str, int]] = {}
+
+    def get(self, result: Dict) -> int:
+        name = result.get('response_store')
+        if not name:
+            return 0
+        key = (name, result.get('model'), result.get('run_id'))
+        if key not in self.runs:
+            if name not in self.stores:
+                path = next((directory / name for directory in self.directories if (directory / name).exists()), None)
+                self.stores[name] = ResponseStore(path) if path else None
+            store = self.stores[name]
+            self.runs[key] = store.response_sizes(key[1], key[2]) if store else {}
+        return self.runs[key].get(str(result.get('question_id')), 0)
+
+
+def _bind(where: Optional[ResultFilter], path: Path) -> Optional[ResultFilter]:
+    """The filter as applied to one run file (filters that look at the run's response store bind to it here)"""
+    return where.for_file(path) if hasattr(where, 'for_file') else where
+
+
+@dataclass(frozen=True)
+class LongerThan:
+    """Filter: results whose text field (the model's full response by default) is longer than length characters
+
+    Runs written with ``store_responses`` keep the response in the run's
+    ResponseStore instead of under ``full_response``; their length is then
+    read from the store (the loaders bind the filter to each file for that).
+    """
+    length: int
+    field: str = 'full_response'
+
+    def __call__(self, result: Dict, response_lengths: Optional[_ResponseLengths] = None) -> bool:
+        text = result.get(self.field)
+        if text is None and response_lengths is not None and self.field == 'full_response':
+            return response_lengths.get(result) > self.length
+        return len(text or '') > self.length
+
+    def for_file(self, path: Path) -> ResultFilter:
+        return functools.partial(self, response_lengths=_ResponseLengths(path))
+
+
+@dataclass(frozen=True)
+class AllOf:
+    """Filter: results passing every one of filters"""
+    filters: Tuple[ResultFilter, ...]
+
+    def __call__(self, result: Dict) -> bool:
+        return all(where(result) for where in self.filters)
+
+    def for_file(self, path: Path) -> ResultFilter:
+        return AllOf(tuple(_bind(where, path) for where in self.filters))
+
+
+def _stream_run_file(path: Path, where: Optional[ResultFilter], header: Dict) -> Iterator[Dict]:
+    """Results of an indented run file that pass where, parsed one record at a time
+
+    Run files are written one field per line, and JSON strings never span
+    lines, so a record of the results array is the block of lines from a
+    ``{`` to the ``}`` at the same indentation. Each block is decoded on its own
+    (with orjson when installed); only the current record is held in memory.
+    The other top-level fields go into header once the file has been read.
+    Documents in any other layout are parsed whole.
+    """
+    with open(path, 'rb') as f:
+        first = f.readline()
+        if first.strip() != b'{':
+            document = _loads(first + f.read())
+            results = document.pop('results', [])
+            header.update(document)
+            yield from (record for record in results if where is None or where(record))
+            return
+
+        head, top_indent = [first], None
+        for line in f:
+            if top_indent is None:
+                top_indent = line[:len(line) - len(line.lstrip())]
+            opening = _RESULTS_LINE.match(line)
+            if opening is None or opening.group(1) != top_indent or opening.group(2):
+                head.append(line)  # A header field, or an empty results array
+                continue
+            record, indent = [], None
+            for line in f:
+                stripped = line.strip()
+                if indent is None:
+                    if stripped in (b']', b'],'):
+                        head.append(opening.group(1) + b'"results": []' + stripped[1:] + b'\n')
+                        break
+                    if stripped != b'{':
+                        record_data = _loads(stripped.rstrip(b','))  # A record written on one line
+                        if where is None or where(record_data):
+                            yield record_data
+                        continue
+                    indent = line[:len(line) - len(line.lstrip())]
+                    record = [line]
+                    continue
+                record.append(line)
+                if stripped in (b'}', b'},') and line.startswith(indent + b'}'):
+                    record_data = _loads(b''.join(record).rstrip().rstrip(b','))
+                    if where is None or where(record_data):
+                        yield record_data
+                    record, indent = [], None
+        header.update(_loads(b''.join(head)))
+        header.pop('results', None)
+
+
+def _read_run(path: Path, where: Optional[ResultFilter]) -> Tuple[Dict, List[Dict]]:
+    """Top-level fields and (filtered) results of a run file"""
+    where = _bind(where, path)
+    if path.suffix == '.jsonl':
+        with open(path, 'rb') as f:
+            records = [_loads(line) for line in f if line.strip()]
+        return {}, [record for record in records if where is None or where(record)]
+    if where is None:
+        with open(path, 'rb') as f:
+            header = _loads(f.read())
+        return header, header.pop('results', [])
+    header = {}
+    return header, list(_stream_run_file(path, where, header))
+
+
+def iter_results(path: Union[str, Path], where: Optional[ResultFilter] = None) -> Iterator[Dict]:
+    """Results of a run file (complete, partial snapshot or partial journal) that pass where, one at a time
+
+    Records are decoded one by one and dropped as soon as they fail the
+    filter, so the parsed run is never held in memory as a whole.
+    """
+    path = Path(path)
+    where = _bind(where, path)
+    if path.suffix == '.jsonl':
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    record = _loads(line)
+                    if where is None or where(record):
+                        yield record
+        return
+    yield from _stream_run_file(path, where, {})
+
+
+def _filter_key(where: Optional[ResultFilter]) -> Optional[str]:
+    """Stable cache key of a filter, or None when it has none
+
+    The engine's filter dataclasses are keyed by value. Plain module-level
+    functions are keyed by name and compiled code, so editing one invalidates
+    its cache (a function that reads a global must not depend on it changing).
+    Lambdas, closures and other callables are not cached.
+    """
+    if where is None:
+        return ''
+    if isinstance(where, AllOf):
+        keys = [_filter_key(inner) for inner in where.filters]
+        return None if None in keys else f"AllOf({', '.join(keys)})"
+    if isinstance(where, LongerThan):
+        return repr(where)
+    if inspect.isfunction(where) and where.__closure__ is None and '<' not in where.__qualname__:
+        digest = hashlib.sha1(marshal.dumps(where.__code__)).hexdigest()
+        return f"{where.__module__}.{where.__qualname__}:{digest}"
+    return None
+
+
+def _cache_key(path: Path, where: Optional[ResultFilter], columns: Optional[Sequence[str]],
+               run_fields: Sequence[str]) -> Optional[str]:
+    where_key = _filter_key(where)
+    if where_key is None:
+        return None
+    stat = os.stat(path)
+    key = f"{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}|{where_key}|{columns}|{list(run_fields)}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def load_run_frame(path: Union[str, Path], where: Optional[ResultFilter] = None,
+                   columns: Optional[Sequence[str]] = None, run_fields: Sequence[str] = ()) -> pd.DataFrame:
+    """Columnar frame of one run file's (filtered) results, with model, run_id, source and partial columns
+
+    Without a filter the file is parsed in one go, with orjson when it is
+    installed; with one, records are streamed (``iter_results``). ``run_fields``
+    are top-level fields of the run file (e.g. total_questions) copied onto
+    every row. A file that cannot be parsed gives an empty frame and a warning.
+    """
+    path = Path(path)
+    prefix, run_number = _run_key(path)
+    try:
+        header, results = _read_run(path, where)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {path}: {e}")
+        header, results = {}, []
+    if columns is not None:
+        results = [{column: result.get(column) for column in columns} for result in results]
+
+    frame = pd.DataFrame(results, columns=list(columns) if columns is not None else None)
+    model = header.get('model') or (results[0].get('model') if results and 'model' in results[0] else None) or prefix
+    # Results repeat their run's model and run_id; the run-level values become the leading columns
+    frame = frame.drop(columns=[column for column in ('model', 'run_id') if column in frame.columns])
+    frame.insert(0, 'model', model)
+    frame.insert(1, 'run_id', header.get('run_id', run_number))
+    for field in run_fields:
+        frame[field] = header.get(field)
+    frame['source'] = str(path)
+    frame['partial'] = 'partial' in path.name
+    return frame
+
+
+def load_runs(source: Union[str, Path, Iterable], where: Optional[ResultFilter] = None,
+              columns: Optional[Sequence[str]] = None, include_partial: bool = False,
+              workers: Optional[int] = None, cache_dir: Optional[Union[str, Path]] = None,
+              run_fields: Sequence[str] = ()) -> pd.DataFrame:
+    """One row per (filtered) result of every run file below a directory, or of the given files
+
+    Files are parsed in a process pool (``workers=0`` parses in this process).
+    Parsed files are cached by path, mtime, size, filter, columns and
+    run_fields: in memory for the session and, with ``cache_dir``, as pickles
+    on disk. Filters must be picklable: module-level functions such as
+    ``is_incorrect``, or ``LongerThan(70)`` and ``AllOf((is_incorrect, LongerThan(70)))``.
+    Only filters with a stable key (see ``_filter_key``) are cached; others,
+    e.g. lambdas in a single-process load, are parsed every time.
+    """
+    paths = run_files(source, include_partial)
+    cache_dir = Path(cache_dir) if cache_dir else None
+    if cache_dir:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+    if _filter_key(where) is None:
+        logger.info(f"Filter {where!r} has no stable cache key: parsing every file")
+
+    frames: Dict[Path, pd.DataFrame] = {}
+    pending: List[Tuple[Path, Optional[str]]] = []
+    for path in paths:
+        key = _cache_key(path, where, columns, run_fields)
+        if key is None:
+            pending.append((path, key))
+        elif key in _MEMORY_CACHE:
+            frames[path] = _MEMORY_CACHE[key]
+        elif cache_dir and (cache_dir / f"{key}.pkl").exists():
+            with open(cache_dir / f"{key}.pkl", 'rb') as f:
+                frames[path] = _MEMORY_CACHE[key] = pickle.load(f)
+        else:
+            pending.append((path, key))
+
+    if pending:
+        logger.info(f"📂 Parsing {len(pending)} run files ({len(paths) - len(pending)} cached)")
+        if workers == 0 or len(pending) == 1:
+            parsed = [load_run_frame(path, where, columns, run_fields) for path, _ in pending]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(load_run_frame, [path for path, _ in pending], [where] * len(pending),
+                                       [columns] * len(pending), [run_fields] * len(pending)))
+        for (path, key), frame in zip(pending, parsed):
+            frames[path] = frame
+            if key is None:
+                continue
+            _MEMORY_CACHE[key] = frame
+            if cache_dir:
+                temp_file = cache_dir / f"{key}.pkl.tmp"
+                with open(temp_file, 'wb') as f:
+                    pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+                temp_file.replace(cache_dir / f"{key}.pkl")
+
+    if not frames:
+        return pd.DataFrame(columns=['model', 'run_id', *(columns or []), *run_fields, 'source', 'partial'])
+    # Files with no matching results should not decide the column order
+    ordered = [frames[path] for path in paths if len(frames[path])] or [frames[path] for path in paths]
+    return pd.concat(ordered, ignore_index=True)
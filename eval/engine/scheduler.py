@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+@dataclass
+class WorkerStats:
+    """Throughput counters of one backend worker (API key, local server, ...) during a run"""
+    worker_idx: int
+    completed: int = 0
+    failed: int = 0
+    busy_time: float = 0.0  # Request-seconds in flight (summed over concurrent requests)
+    idle_time: float = 0.0  # Seconds spent waiting for the backend to accept work
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    def summary(self, wall_time: float) -> Dict:
+        return {
+            'worker_idx': self.worker_idx,
+            'completed': self.completed,
+            'failed': self.failed,
+            'busy_time': self.busy_time,
+            'idle_time': self.idle_time,
+            'peak_in_flight': self.peak_in_flight,
+            'questions_per_hour': self.completed / wall_time * 3600 if wall_time > 0 else 0.0,
+        }
+
+
+async def run_work_queue(items: Iterable[T], num_workers: int,
+                         handle: Callable[[int, T], Awaitable[bool]],
+                         slots_per_worker: int = 1,
+                         worker_delay: Callable[[int], float] = lambda worker_idx: 0.0,
+                         should_stop: Callable[[], bool] = lambda: False) -> List[WorkerStats]:
+    """Process items with num_workers workers pulling from one shared queue
+
+    Nothing is assigned up front: a worker takes the next item only when it is
+    free and its backend lane can send (``worker_delay`` returns 0), so a slow or
+    throttled key simply takes fewer items and the run finishes when total
+    capacity, not the slowest key, has worked through the queue. Every worker
+    runs ``slots_per_worker`` pullers, i.e. keeps that many requests in flight.
+    ``handle`` returns True when the item produced a result.
+    """
+    queue = deque(items)
+    stats = [WorkerStats(worker_idx) for worker_idx in range(num_workers)]
+
+    async def worker(worker_idx: int, slot: int):
+        worker_stats = stats[worker_idx]
+        # Stagger start-up slightly so workers do not hit the backend in lockstep
+        await asyncio.sleep(0.01 * (worker_idx + slot * num_workers))
+
+        while queue and not should_stop():
+            # Do not take work while this lane is throttled; other workers drain the queue meanwhile
+            delay = worker_delay(worker_idx)
+            if delay > 0:
+                worker_stats.idle_time += delay
+                await asyncio.sleep(delay)
+                continue
+            if not queue:
+                break
+
+            item = queue.popleft()
+            worker_stats.in_flight += 1
+            worker_stats.peak_in_flight = max(worker_stats.peak_in_flight, worker_stats.in_flight)
+            start = time.monotonic()
+            try:
+                ok = await handle(worker_idx, item)
+            except Exception as e:
+                logger.error(f"❌ Worker {worker_idx} error: {e}")
+                ok = False
+            worker_stats.busy_time += time.monotonic() - start
+            worker_stats.in_flight -= 1
+
+            if ok:
+                worker_stats.completed += 1
+            else:
+                worker_stats.failed += 1
+
+            done = worker_stats.completed + worker_stats.failed
+            if done % 25 == 0:
+                logger.info(f"📊 Worker {worker_idx}: {done} done, {len(queue)} left in queue")
+
+    await asyncio.gather(*(
+        worker(worker_idx, slot)
+        for worker_idx in range(num_workers)
+        for slot in range(max(slots_per_worker, 1))
+    ))
+    return stats
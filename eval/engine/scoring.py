@@ -0,0 +1,300 @@
+import ast
+import logging
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .datasets import DatasetProfile, MULTIPLE, NUMERICAL, SINGLE
+
+logger = logging.getLogger(__name__)
+
+# Fallbacks when the response has no \boxed{} answer: the last explicit answer marker wins;
+# "Therefore" only counts when there is none
+ANSWER_PATTERNS = [
+    r'\*\*Answer:\*\*\s*(.+)',
+    r'Answer:\s*(.+)',
+    r'Final answer:\s*(.+)',
+    r'The answer is:\s*(.+)',
+    r'Therefore,?\s*(.+)',
+]
+WEAK_ANSWER_PATTERNS = {r'Therefore,?\s*(.+)'}
+# Hindi-medium responses: "अंतिम उत्तर" (final answer), "सही उत्तर" (correct answer), "उत्तर" (answer)
+HINDI_ANSWER_PATTERNS = [
+    r'(?:अंतिम|सही)\s*उत्तर\s*(?:है)?\s*[:：-]\s*(.+)',
+    r'उत्तर\s*(?:है)?\s*[:：-]\s*(.+)',
+]
+
+# Explicit markers in one alternation, one named group per pattern, so a single pass finds every hit. The weak
+# markers get their own pass: in one alternation their greedy capture would swallow an explicit marker later on
+# the same line ("Therefore, the Answer: B")
+_MARKERS = [(f'pattern:{i}', pattern) for i, pattern in enumerate(ANSWER_PATTERNS)] + \
+           [(f'hindi:{i}', pattern) for i, pattern in enumerate(HINDI_ANSWER_PATTERNS)]
+
+
+def _marker_re(weak: bool) -> re.Pattern:
+    return re.compile('|'.join(f'(?:{pattern.replace("(.+)", f"(?P<m{i}>.+)")})'
+                               for i, (_, pattern) in enumerate(_MARKERS)
+                               if (pattern in WEAK_ANSWER_PATTERNS) == weak), re.IGNORECASE)
+
+
+_MARKER_RE = _marker_re(weak=False)
+_WEAK_MARKER_RE = _marker_re(weak=True)
+
+BOXED = '\\boxed'
+# \text{...}, \mathrm{...} and friends around an answer: keep the contents
+_WRAPPER_RE = re.compile(r'\\(?:text|textbf|textrm|mathrm|mathbf|mbox|rm|bf)\s*\{([^{}]*)\}')
+_FRACTION_RE = re.compile(r'^(-?)\\[dt]?frac\s*\{\s*(-?\d+\.?\d*)\s*\}\s*\{\s*(-?\d+\.?\d*)\s*\}$')
+# Hindi option labels (क ख ग घ) standing alone, bracketed or not (not inside a word), and Devanagari digits
+_HINDI_OPTION_RE = re.compile(r'(?<![\u0900-\u097F])([कखगघ])(?![\u0900-\u097F])')
+_HINDI_OPTIONS = {'क': 'A', 'ख': 'B', 'ग': 'C', 'घ': 'D'}
+_DEVANAGARI_DIGITS = str.maketrans('०१२३४५६७८९', '0123456789')
+
+
+def _last_boxed(text: str) -> Optional[str]:
+    """Contents of the last \\boxed{...} with balanced braces, scanning back from the end of the text"""
+    end = len(text)
+    while True:
+        start = text.rfind(BOXED, 0, end)
+        if start < 0:
+            return None
+        i = start + len(BOXED)
+        while i < len(text) and text[i] == ' ':
+            i += 1
+        if i < len(text) and text[i] == '{':
+            depth = 0
+            for j in range(i, len(text)):
+                if text[j] == '{':
+                    depth += 1
+                elif text[j] == '}':
+                    depth -= 1
+                    if depth == 0:
+                        if text[i + 1:j].strip():
+                            return text[i + 1:j]
+                        break
+        # Empty, unclosed (truncated output) or not a braced argument: try the previous one
+        end = start
+
+
+def _last_marker(text: str) -> Optional[Tuple[str, str]]:
+    """(answer, rule) of the last explicit answer marker, else of the last weak one"""
+    for marker_re in (_MARKER_RE, _WEAK_MARKER_RE):
+        matches = list(marker_re.finditer(text))
+        if matches:
+            match = matches[-1]
+            return match.group(match.lastgroup), _MARKERS[int(match.lastgroup[1:])][0]
+    return None
+
+
+def _clean_latex(answer: str) -> str:
+    """Unwrap \\text{}/\\mathrm{}-style wrappers and drop math delimiters"""
+    previous = None
+    while previous != answer:
+        previous, answer = answer, _WRAPPER_RE.sub(r'\1', answer)
+    answer = _HINDI_OPTION_RE.sub(lambda m: _HINDI_OPTIONS[m.group(1)], answer)
+    return answer.replace('$', '').translate(_DEVANAGARI_DIGITS).strip()
+
+
+def extract_answer_with_rule(response_text: str, kind: Optional[str]) -> Tuple[str, str]:
+    """Extract the final answer from a model response, and name the rule that found it
+
+    Rules, in order: ``boxed`` (last \\boxed{} with balanced braces, so
+    \\boxed{\\frac{1}{2}} works), ``pattern:N`` / ``hindi:N`` (last answer
+    marker, N indexing ANSWER_PATTERNS / HINDI_ANSWER_PATTERNS), ``last_line``.
+    Long reasoning traces are searched from the end, not re-scanned per rule.
+    """
+    try:
+        answer = _last_boxed(response_text)
+        if answer is not None:
+            rule = 'boxed'
+        else:
+            marker = _last_marker(response_text)
+            if marker is not None:
+                answer, rule = marker[0].strip(), marker[1]
+            if not answer:
+                # Take last line as fallback
+                answer, rule = response_text.strip().rsplit('\n', 1)[-1].strip(), 'last_line'
+        answer = _clean_latex(answer)
+
+        # Clean up answer based on question type
+        if kind == SINGLE:
+            # Extract single letter
+            match = re.search(r'[ABCD]', answer.upper())
+            return (match.group(0) if match else answer[:10]), rule
+        elif kind == MULTIPLE:
+            # Extract multiple letters
+            letters = re.findall(r'[ABCD]', answer.upper())
+            unique_letters = sorted(set(letters))
+            return (''.join(unique_letters) if unique_letters else answer[:20]), rule
+        elif kind == NUMERICAL:
+            fraction = _FRACTION_RE.match(answer)
+            if fraction and float(fraction.group(3)) != 0:
+                sign, numerator, denominator = fraction.groups()
+                value = float(numerator) / float(denominator) * (-1 if sign else 1)
+                return f"{value:.6f}".rstrip('0').rstrip('.'), rule
+            # Extract number
+            number_match = re.search(r'-?\d+\.?\d*', answer)
+            return (number_match.group(0) if number_match else answer[:20]), rule
+
+        return answer[:50], rule
+    except Exception as e:
+        logger.error(f"Error extracting answer: {e}")
+        return response_text[:50], 'error'
+
+
+def extract_answer(response_text: str, kind: Optional[str]) -> str:
+    """Extract the final answer from model response"""
+    return extract_answer_with_rule(response_text, kind)[0]
+
+
+class StreamingExtractor:
+    """Incremental \\boxed{} watcher for streamed responses
+
+    ``feed`` each chunk as it arrives; only text not yet scanned (plus an
+    unclosed box) is looked at again, so a long stream costs one pass overall.
+    It records time to first token and to the last completed \\boxed{}, and
+    with ``stop_after_tokens`` set, ``feed`` returns True once that many tokens
+    followed the last box without a new one, i.e. when the model has given its
+    answer and is only padding. Tokens are taken from the backend when it
+    reports them, else estimated at ``chars_per_token``.
+    """
+
+    def __init__(self, stop_after_tokens: Optional[int] = None, chars_per_token: float = 4.0):
+        self.stop_after_tokens = stop_after_tokens
+        self.chars_per_token = chars_per_token
+        self.start_time = time.time()
+        self.first_token_time: Optional[float] = None
+        self.boxed_time: Optional[float] = None
+        self.answer: Optional[str] = None  # Contents of the last complete \\boxed{}
+        self.tokens_after_answer = 0.0
+        self.cut_off = False
+        self._chunks: List[str] = []
+        self._tail = ''  # Text from the first position not yet scanned for a complete box
+
+    @property
+    def text(self) -> str:
+        return ''.join(self._chunks)
+
+    def feed(self, chunk: str, tokens: Optional[int] = None) -> bool:
+        """Add a chunk; True when generation can stop"""
+        if not chunk:
+            return False
+        now = time.time()
+        if self.first_token_time is None:
+            self.first_token_time = now
+        self._chunks.append(chunk)
+        self._tail += chunk
+
+        found = False
+        after_answer = 0  # Characters after the last captured box, counted before the tail is trimmed
+        while True:
+            start = self._tail.find(BOXED)
+            if start < 0:
+                # Keep just enough to recognise a marker split across chunks
+                self._tail = self._tail[-(len(BOXED) - 1):]
+                break
+            span = self._box_span(start)
+            if span is None:
+                self._tail = self._tail[start:]  # Unclosed box: wait for more text
+                break
+            content = self._tail[span[0]:span[1]]
+            self._tail = self._tail[span[1] + 1:]
+            if content.strip():
+                self.answer, found = content, True
+                after_answer = len(self._tail)
+
+        if found:
+            self.boxed_time = now
+            self.tokens_after_answer = after_answer / self.chars_per_token
+        elif self.answer is not None:
+            self.tokens_after_answer += tokens if tokens is not None else len(chunk) / self.chars_per_token
+
+        if self.stop_after_tokens is not None and self.answer is not None \
+                and self.tokens_after_answer >= self.stop_after_tokens:
+            self.cut_off = True
+        return self.cut_off
+
+    def _box_span(self, start: int) -> Optional[Tuple[int, int]]:
+        """(content start, closing brace) of the box at ``start`` in the tail; None while it is unclosed"""
+        i = start + len(BOXED)
+        while i < len(self._tail) and self._tail[i] == ' ':
+            i += 1
+        if i >= len(self._tail):
+            return None
+        if self._tail[i] != '{':
+            return i, i - 1  # Not a braced argument: nothing to capture, skip the marker
+        depth = 0
+        for j in range(i, len(self._tail)):
+            if self._tail[j] == '{':
+                depth += 1
+            elif self._tail[j] == '}':
+                depth -= 1
+                if depth == 0:
+                    return i + 1, j
+        return None
+
+    def metrics(self) -> Dict[str, float]:
+        """Latency figures for GenerationRequest.metrics"""
+        metrics = {}
+        if self.first_token_time is not None:
+            metrics['ttft'] = self.first_token_time - self.start_time
+        if self.boxed_time is not None:
+            metrics['time_to_boxed'] = self.boxed_time - self.start_time
+        if self.cut_off:
+            metrics['stream_cut_off'] = True
+        return metrics
+
+
+def _acceptable_values(question_data: pd.Series) -> Optional[list]:
+    """Return the expanded list of accepted numerical answers, if the dataset provides one"""
+    expanded = question_data.get('expanded_answer')
+    acceptable = question_data.get('acceptable_values')
+    if not isinstance(acceptable, str) or pd.isna(expanded) or not expanded:
+        return None
+    try:
+        return [float(value) for value in ast.literal_eval(acceptable)]
+    except (ValueError, SyntaxError, TypeError):
+        return None
+
+
+def is_answer_correct(predicted_answer: str, question_data: pd.Series, profile: DatasetProfile) -> bool:
+    """Check if predicted answer is correct"""
+    try:
+        predicted = str(predicted_answer).strip().upper()
+        correct = str(question_data[profile.answer_column]).strip().upper()
+        kind = profile.kind(question_data[profile.type_column])
+
+        if kind == SINGLE:
+            return predicted == correct
+        elif kind == MULTIPLE:
+            # Handle multiple choice with multiple correct answers
+            pred_letters = set(re.findall(r'[ABCD]', predicted))
+            correct_letters = set(re.findall(r'[ABCD]', correct))
+            return pred_letters == correct_letters
+        elif kind == NUMERICAL:
+            # Answers with a range of accepted values (mmJEE-Eval) are checked against that list
+            acceptable_values = _acceptable_values(question_data)
+            if acceptable_values is not None:
+                try:
+                    return float(predicted) in acceptable_values
+                except ValueError:
+                    pass
+
+            # First try exact match
+            if predicted == correct:
+                return True
+            # Try numerical comparison with tolerance
+            try:
+                pred_num = float(predicted)
+                correct_num = float(correct)
+                tolerance = abs(correct_num) * 0.01 if abs(correct_num) > 1 else 0.01
+                return abs(pred_num - correct_num) <= tolerance
+            except ValueError:
+                return predicted == correct
+
+        # Default exact match
+        return predicted == correct
+    except Exception as e:
+        logger.error(f"Error comparing answers: {e}")
+        return False
@@ -0,0 +1,285 @@
+import json
+import logging
+import os
+import pickle
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .accumulator import AccuracyAccumulator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EvaluationState:
+    """Persistent state for resuming evaluation"""
+    current_run: int
+    completed_questions: int
+    total_questions: int
+    all_run_summaries: List[Dict]
+    failed_questions: List[Dict]
+    start_time: float
+    last_save_time: float
+    current_run_results: List[Dict] = field(default_factory=list)  # Results for the current incomplete run
+    pending_run_results: Dict[int, List[Dict]] = field(default_factory=dict)  # Later runs started early (pipelining)
+    stats: AccuracyAccumulator = field(default_factory=AccuracyAccumulator)  # Running statistics of the completed runs
+
+
+def new_state(total_questions: int) -> EvaluationState:
+    """Create a fresh state for an evaluation of total_questions question attempts"""
+    now = time.time()
+    return EvaluationState(
+        current_run=1,
+        completed_questions=0,
+        total_questions=total_questions,
+        all_run_summaries=[],
+        failed_questions=[],
+        start_time=now,
+        last_save_time=now,
+        current_run_results=[],
+        pending_run_results={},
+        stats=AccuracyAccumulator(),
+    )
+
+
+def _upgrade_state(state: EvaluationState) -> EvaluationState:
+    """Fill in fields missing from state files written by older evaluator versions"""
+    if not hasattr(state, 'current_run_results'):
+        logger.info("Upgrading old state format...")
+        state.current_run_results = []
+    if not hasattr(state, 'failed_questions'):
+        state.failed_questions = []
+    if not hasattr(state, 'pending_run_results'):
+        state.pending_run_results = {}
+    if not hasattr(state, 'stats'):
+        state.stats = AccuracyAccumulator.from_run_summaries(state.all_run_summaries)
+    return state
+
+
+def run_file_name(run_summary: Dict) -> str:
+    """File name of a completed run in the results directory"""
+    return f"{run_summary['model']}_run_{run_summary['run_id']:02d}_{run_summary['timestamp']}.json"
+
+
+class StateStore:
+    """Evaluation state as a small JSON header plus an append-only journal of answered questions
+
+    Every finished question is one line appended to ``evaluation_journal.jsonl``
+    (fsynced every ``fsync_every`` lines), so a checkpoint costs the same after
+    thirty runs as after one. The header ``evaluation_state.json`` is the cursor:
+    current run, start time, failed questions and the run files already written.
+    When a run completes its run file becomes the record of its results and the
+    journal is compacted down to the runs still open. Pickled states written by
+    earlier versions are migrated on first load.
+    """
+
+    def __init__(self, directory: Path, fsync_every: int = 5):
+        self.directory = Path(directory)
+        self.header_file = self.directory / "evaluation_state.json"
+        self.journal_file = self.directory / "evaluation_journal.jsonl"
+        self.legacy_file = self.directory / "evaluation_state.pkl"
+        self.legacy_backup_file = self.legacy_file.with_suffix('.backup')
+        self.fsync_every = fsync_every
+        self._journal = None
+        self._unsynced = 0
+
+    @property
+    def state_file(self) -> Path:
+        return self.header_file
+
+    def exists(self) -> bool:
+        return self.header_file.exists() or self.legacy_file.exists() or self.legacy_backup_file.exists()
+
+    def load(self) -> Optional[EvaluationState]:
+        """Rebuild the state from header, run files and journal; None if there is nothing to resume"""
+        if not self.header_file.exists():
+            return self._migrate_legacy()
+        try:
+            with open(self.header_file, 'r', encoding='utf-8') as f:
+                header = json.load(f)
+
+            state = EvaluationState(
+                current_run=header['current_run'],
+                completed_questions=0,
+                total_questions=header['total_questions'],
+                all_run_summaries=[],
+                failed_questions=header['failed_questions'],
+                start_time=header['start_time'],
+                last_save_time=header['last_save_time'],
+            )
+            for name in header['run_files']:
+                with open(self.directory / name, 'r', encoding='utf-8') as f:
+                    state.all_run_summaries.append(json.load(f))
+            self._replay(state)
+        except Exception as e:
+            logger.error(f"Error loading state from {self.header_file.name}: {e}")
+            return None
+
+        state.completed_questions = (
+            sum(len(summary['results']) for summary in state.all_run_summaries)
+            + len(state.current_run_results)
+            + sum(len(results) for results in state.pending_run_results.values())
+        )
+        logger.info(f"Resumed from {self.header_file.name}: Run {state.current_run}, "
+                    f"{len(state.current_run_results)} questions into the run, "
+                    f"Total: {state.completed_questions}/{state.total_questions}")
+        return state
+
+    def _replay(self, state: EvaluationState):
+        """Apply the journal records of runs that were still open at the last compaction"""
+        if not self.journal_file.exists():
+            return
+        failed = {(entry['run_id'], entry['question_idx']) for entry in state.failed_questions}
+        with open(self.journal_file, 'rb') as f:
+            lines = f.readlines()
+        if lines and not lines[-1].endswith(b'\n'):
+            # A crash mid-append leaves the last line torn; cut it off so the next append starts a fresh line
+            logger.warning("Skipping incomplete journal record")
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(sum(len(line) for line in lines[:-1]))
+            lines.pop()
+
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping unreadable journal record")
+                continue
+
+            kind = record.pop('record')
+            run_id = record['run_id']
+            if run_id < state.current_run:
+                continue  # Already compacted into its run file
+            if kind == 'failed':
+                key = (run_id, record['question_idx'])
+                if key not in failed:
+                    failed.add(key)
+                    state.failed_questions.append(record)
+            elif run_id == state.current_run:
+                state.current_run_results.append(record)
+            else:
+                state.pending_run_results.setdefault(run_id, []).append(record)
+
+    def _load_legacy(self) -> Optional[EvaluationState]:
+        for path in (self.legacy_file, self.legacy_backup_file):
+            if not path.exists():
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    return _upgrade_state(pickle.load(f))
+            except Exception as e:
+                logger.error(f"Error loading state from {path.name}: {e}")
+        return None
+
+    def _migrate_legacy(self) -> Optional[EvaluationState]:
+        """Convert a pickled state from earlier versions into header and journal"""
+        state = self._load_legacy()
+        if state is None:
+            return None
+        for summary in state.all_run_summaries:
+            path = self.directory / run_file_name(summary)
+            if not path.exists():
+                write_json_atomic(path, summary)
+        self.compact(state)
+        logger.info(f"Migrated {self.legacy_file.name} to {self.header_file.name} + {self.journal_file.name}: "
+                    f"Run {state.current_run}, Total: {state.completed_questions}/{state.total_questions}")
+        return state
+
+    def append(self, kind: str, entry: Dict):
+        """Journal one answered ('result') or failed ('failed') question"""
+        if self._journal is None:
+            self._journal = open(self.journal_file, 'a', encoding='utf-8')
+        record = to_json_serializable({'record': kind, **entry})
+        self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        self._unsynced += 1
+        if self.fsync_every and self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        """Force journaled records to disk"""
+        if self._journal is not None and self._unsynced:
+            os.fsync(self._journal.fileno())
+        self._unsynced = 0
+
+    def save(self, state: EvaluationState):
+        """Write the header; its size depends on the number of runs, not of questions"""
+        state.last_save_time = time.time()
+        try:
+            self.sync()
+            write_json_atomic(self.header_file, {
+                'current_run': state.current_run,
+                'total_questions': state.total_questions,
+                'start_time': state.start_time,
+                'last_save_time': state.last_save_time,
+                'run_files': [run_file_name(summary) for summary in state.all_run_summaries],
+                'failed_questions': state.failed_questions,
+            })
+            logger.debug(f"State saved: Run {state.current_run}, {state.completed_questions}/{state.total_questions} questions")
+        except Exception as e:
+            logger.error(f"Error saving state: {e}")
+
+    def compact(self, state: EvaluationState):
+        """After a run file is written: point the header past it and keep only open runs in the journal"""
+        self.close()
+        self.save(state)
+        temp_file = self.journal_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            open_runs = [state.current_run_results] + [state.pending_run_results[run_id]
+                                                       for run_id in sorted(state.pending_run_results)]
+            for results in open_runs:
+                for result in results:
+                    f.write(json.dumps(to_json_serializable({'record': 'result', **result}), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        temp_file.replace(self.journal_file)
+
+    def close(self):
+        if self._journal is not None:
+            self.sync()
+            self._journal.close()
+            self._journal = None
+
+    def remove(self) -> List[Path]:
+        """Delete header, journal and any legacy pickles, returning the files removed"""
+        self.close()
+        removed = []
+        for path in (self.header_file, self.journal_file, self.legacy_file, self.legacy_backup_file):
+            if path.exists():
+                path.unlink()
+                removed.append(path)
+        return removed
+
+
+def to_json_serializable(obj):
+    """Convert numpy/pandas types to JSON serializable types"""
+    if isinstance(obj, dict):
+        return {key: to_json_serializable(value) for key, value in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [to_json_serializable(item) for item in obj]
+    elif isinstance(obj, np.generic):
+        return obj.item()
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, float) and np.isnan(obj):
+        return None
+    elif obj is pd.NA or obj is pd.NaT:
+        return None
+    return obj
+
+
+def write_json_atomic(path: Path, data: Dict):
+    """Write data as indented JSON through a temporary file so readers never see half a file"""
+    path = Path(path)
+    temp_file = path.with_name(path.name + '.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(to_json_serializable(data), f, indent=2, ensure_ascii=False)
+        # On disk before the rename, or a power loss can leave the new name pointing at an empty file
+        f.flush()
+        os.fsync(f.fileno())
+    temp_file.replace(path)
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from .accumulator import AccuracyAccumulator, RunningStats
+
+
+@dataclass(frozen=True)
+class StoppingRule:
+    """When to stop scheduling further runs of a model, checked after every completed run
+
+    Stops once the confidence interval of the mean run accuracy is at most
+    ``target_ci_width`` points wide, or the running mean moved less than
+    ``max_relative_change`` percent with the last run (the criteria
+    ``find_optimal_k`` applies after the fact), but never before ``min_runs``
+    runs. ``max_tokens`` and ``max_hours`` cap the spend regardless of
+    convergence. Criteria left at None are not checked.
+    """
+    target_ci_width: Optional[float] = 2.0  # Full width of the CI, in accuracy points
+    max_relative_change: Optional[float] = None  # Percent change of the running mean from the previous run
+    min_runs: int = 5
+    max_tokens: Optional[float] = None  # Total tokens over all runs (backends that report usage)
+    max_hours: Optional[float] = None  # Total run duration
+    confidence: float = 0.95
+
+    def ci_width(self, runs: RunningStats) -> float:
+        if runs.count < 2:
+            return float('inf')
+        # Identical runs give a zero SEM: the interval collapses and the estimate cannot get tighter
+        low, high = runs.confidence_interval(self.confidence)
+        return high - low
+
+    def check(self, stats: AccuracyAccumulator) -> Optional[str]:
+        """Reason to stop after the runs folded into stats so far, or None to keep going
+
+        Reads the evaluation state's running accumulator, so each check costs
+        the same however many runs and answers the sweep has.
+        """
+        k = stats.num_runs
+        if self.max_tokens is not None and stats.total_tokens >= self.max_tokens:
+            return f"token budget reached ({stats.total_tokens:,.0f} ≥ {self.max_tokens:,.0f})"
+        if self.max_hours is not None:
+            hours = stats.duration / 3600
+            if hours >= self.max_hours:
+                return f"time budget reached ({hours:.2f}h ≥ {self.max_hours:.2f}h)"
+        if k < max(self.min_runs, 2):
+            return None
+
+        if self.target_ci_width is not None:
+            width = self.ci_width(stats.runs)
+            if width <= self.target_ci_width:
+                return (f"{self.confidence*100:.0f}% CI width {width:.2f} ≤ {self.target_ci_width} "
+                        f"after {k} runs")
+        if self.max_relative_change is not None:
+            current = stats.runs.mean
+            previous = (current * k - stats.run_accuracies[-1]) / (k - 1)
+            change = abs(current - previous) / previous * 100 if previous > 0 else float('inf')
+            if change < self.max_relative_change:
+                return f"running mean changed {change:.2f}% < {self.max_relative_change}% with run {k}"
+        return None
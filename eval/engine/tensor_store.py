@@ -0,0 +1,247 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .batch_scoring import read_run_file, run_files
+from .correctness import SLICE_FIELDS, CorrectnessTensor
+from .state import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+TENSOR_STORE_VERSION = 1
+# One flat, append-only file per column; a run is the segment [offset, offset + count) of every file
+COLUMNS = {'correct': np.uint8, 'question': np.int16, 'latency': np.float32}
+COLUMN_FILES = {'correct': 'correct.u8', 'question': 'question.i16', 'latency': 'latency.f32'}
+MAX_QUESTIONS = np.iinfo(np.int16).max + 1
+
+
+def _signature(path: Path) -> List[int]:
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class TensorStore:
+    """Compact on-disk correctness of every model and run, opened with np.memmap instead of parsing run JSON
+
+    Every answered question is one row of three column files: ``correct.u8``
+    (uint8 verdict), ``question.i16`` (int16 index into ``questions.json``)
+    and ``latency.f32`` (float32 inference time). ``manifest.json`` lists the
+    runs, each a contiguous segment of rows, and the source files already
+    ingested, and is written last, so rows appended by an interrupted ingest
+    are ignored and overwritten by the next one. ``questions.json`` is the
+    question metadata table (subject, type, language, year, plus any columns
+    added with ``annotate``).
+
+    ``ingest`` is incremental: files whose size and mtime are unchanged are
+    skipped. A partial run is replaced when its partial file grows or its
+    completed run file appears; the superseded rows stay in the column files
+    unreferenced. One process should ingest into a store at a time.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest_file = self.directory / "manifest.json"
+        self.questions_file = self.directory / "questions.json"
+
+        manifest = {'rows': 0, 'runs': [], 'sources': {}}
+        if self.manifest_file.exists():
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != TENSOR_STORE_VERSION:
+                raise ValueError(f"{self.manifest_file} has version {manifest.get('version')}, "
+                                 f"expected {TENSOR_STORE_VERSION}; ingest into a new directory")
+        self.rows: int = manifest['rows']
+        self.run_entries: List[Dict] = manifest['runs']
+        self.sources: Dict[str, List[int]] = manifest['sources']
+
+        self.questions = pd.DataFrame({'question_id': pd.Series(dtype=object)})
+        if self.questions_file.exists():
+            with open(self.questions_file, 'r', encoding='utf-8') as f:
+                self.questions = pd.DataFrame(json.load(f))
+        self._maps: Dict[str, np.ndarray] = {}
+        self._open()
+
+    def column_file(self, column: str) -> Path:
+        return self.directory / COLUMN_FILES[column]
+
+    def _open(self):
+        self._maps = {column: np.memmap(self.column_file(column), dtype=dtype, mode='r', shape=(self.rows,))
+                      if self.rows else np.zeros(0, dtype=dtype) for column, dtype in COLUMNS.items()}
+
+    def close(self):
+        self._maps = {}
+
+    # --- ingest
+
+    def ingest(self, source: Union[str, Path, Iterable], model: Optional[str] = None,
+               include_partial: bool = True, fields: Sequence[str] = SLICE_FIELDS) -> int:
+        """Append the run files of a directory (or the given files) not ingested yet; returns how many were read
+
+        ``model`` overrides the model name stored in the run files (e.g. one
+        name per results folder); ``fields`` are the result fields copied into
+        the question table the first time a question is seen.
+        """
+        pending = [path for path in run_files(source, include_partial)
+                   if self.sources.get(str(path.resolve())) != _signature(path)]
+        if not pending:
+            return 0
+
+        question_index = {question_id: i for i, question_id in enumerate(self.questions['question_id'])}
+        new_questions = []
+        runs = {(entry['model'], entry['run_id']): i for i, entry in enumerate(self.run_entries)}
+
+        # Drop rows an interrupted ingest appended after the last manifest
+        self.close()
+        files = {}
+        for column, dtype in COLUMNS.items():
+            files[column] = open(self.column_file(column), 'ab')
+            files[column].truncate(self.rows * np.dtype(dtype).itemsize)
+        try:
+            for path in pending:
+                run = read_run_file(path)
+                key = (model or run['model'], run['run_id'])
+                if key in runs and run['partial'] and not self.run_entries[runs[key]]['partial']:
+                    self.sources[str(path.resolve())] = _signature(path)
+                    continue  # The run already completed; its partial file is stale
+
+                results = run['results']
+                for result in results:
+                    question_id = str(result.get('question_id'))
+                    if question_id not in question_index:
+                        question_index[question_id] = len(question_index)
+                        new_questions.append({'question_id': question_id,
+                                              **{field: result.get(field) for field in fields}})
+                if len(question_index) > MAX_QUESTIONS:
+                    raise ValueError(f"More than {MAX_QUESTIONS} questions do not fit the int16 question index")
+
+                correct = np.array([bool(r.get('is_correct')) for r in results], dtype=np.uint8)
+                columns = {
+                    'correct': correct,
+                    'question': np.array([question_index[str(r.get('question_id'))] for r in results],
+                                         dtype=np.int16),
+                    'latency': np.array([r.get('inference_time', np.nan) for r in results], dtype=np.float32),
+                }
+                for column, values in columns.items():
+                    files[column].write(values.tobytes())
+
+                entry = {'model': key[0], 'run_id': key[1], 'offset': self.rows, 'count': len(results),
+                         'partial': run['partial'], 'accuracy': float(correct.mean() * 100) if len(correct) else 0.0,
+                         'duration': run['duration'], 'timestamp': run['timestamp'], 'source': str(path)}
+                if key in runs:
+                    self.run_entries[runs[key]] = entry
+                else:
+                    runs[key] = len(self.run_entries)
+                    self.run_entries.append(entry)
+                self.rows += len(results)
+                self.sources[str(path.resolve())] = _signature(path)
+        finally:
+            for f in files.values():
+                f.close()
+
+        if new_questions and self.questions.empty:
+            self.questions = pd.DataFrame(new_questions)
+        elif new_questions:
+            self.questions = pd.concat([self.questions, pd.DataFrame(new_questions)], ignore_index=True)
+        self._save()
+        self._open()
+        logger.info(f"📦 Ingested {len(pending)} run files into {self.directory} "
+                    f"({self.rows:,} rows, {len(self.run_entries)} runs, {len(self.questions)} questions)")
+        return len(pending)
+
+    def annotate(self, metadata: pd.DataFrame, id_column: str = 'question_id', columns: Optional[Sequence[str]] = None):
+        """Add dataset columns (e.g. requires_image) to the question table, matched on question id"""
+        columns = [c for c in metadata.columns if c != id_column] if columns is None else list(columns)
+        extra = metadata.assign(**{id_column: metadata[id_column].astype(str)}).drop_duplicates(id_column, keep='last')
+        extra = extra.set_index(id_column)[columns]
+        self.questions = self.questions.drop(columns=[c for c in columns if c in self.questions.columns])
+        self.questions = self.questions.join(extra, on='question_id')
+        self._save()
+
+    def _save(self):
+        write_json_atomic(self.questions_file, {column: self.questions[column].tolist()
+                                                for column in self.questions.columns})
+        write_json_atomic(self.manifest_file, {'version': TENSOR_STORE_VERSION, 'rows': self.rows,
+                                               'runs': self.run_entries, 'sources': self.sources})
+
+    # --- queries
+
+    @property
+    def runs(self) -> pd.DataFrame:
+        return pd.DataFrame(self.run_entries, columns=['model', 'run_id', 'offset', 'count', 'partial', 'accuracy',
+                                                       'duration', 'timestamp', 'source'])
+
+    @property
+    def models(self) -> List[str]:
+        return sorted({entry['model'] for entry in self.run_entries})
+
+    def _entries(self, models: Optional[Sequence[str]] = None, include_partial: bool = True) -> List[Dict]:
+        return sorted((entry for entry in self.run_entries
+                       if (models is None or entry['model'] in models) and (include_partial or not entry['partial'])),
+                      key=lambda entry: (entry['model'], entry['run_id']))
+
+    def run(self, model: str, run_id: int) -> Dict[str, np.ndarray]:
+        """Zero-copy views of one run's columns"""
+        for entry in self.run_entries:
+            if entry['model'] == model and entry['run_id'] == run_id:
+                rows = slice(entry['offset'], entry['offset'] + entry['count'])
+                return {column: values[rows] for column, values in self._maps.items()}
+        raise KeyError(f"No run {run_id} of {model} in {self.directory}")
+
+    def _rows(self, entries: List[Dict]) -> np.ndarray:
+        if not entries:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([np.arange(entry['offset'], entry['offset'] + entry['count']) for entry in entries])
+
+    def frame(self, models: Optional[Sequence[str]] = None, include_partial: bool = True) -> pd.DataFrame:
+        """One row per answer (model, run_id, question_id, is_correct, inference_time and question metadata)
+
+        Model and the text metadata columns are categoricals, the other columns
+        come straight from the memory maps and the question table.
+        """
+        entries = self._entries(models, include_partial)
+        rows = self._rows(entries)
+        question = np.asarray(self._maps['question'][rows], dtype=np.int64)
+        counts = [entry['count'] for entry in entries]
+        frame = pd.DataFrame({
+            'model': pd.Categorical(np.repeat([entry['model'] for entry in entries], counts)),
+            'run_id': np.repeat(np.array([entry['run_id'] for entry in entries], dtype=np.int64), counts),
+            'is_correct': np.asarray(self._maps['correct'][rows], dtype=bool),
+            'inference_time': np.asarray(self._maps['latency'][rows]),
+        })
+        for column in self.questions.columns:
+            values = self.questions[column]
+            if values.dtype == object:
+                codes, categories = pd.factorize(values)
+                frame[column] = pd.Categorical.from_codes(codes[question], categories)
+            else:
+                frame[column] = values.to_numpy()[question]
+        return frame
+
+    def to_tensor(self, models: Optional[Sequence[str]] = None, include_partial: bool = True,
+                  fields: Sequence[str] = SLICE_FIELDS) -> CorrectnessTensor:
+        """CorrectnessTensor over every question of the store, without going through a predictions frame"""
+        entries = self._entries(models, include_partial)
+        model_names = sorted({entry['model'] for entry in entries})
+        run_ids = {model: [entry['run_id'] for entry in entries if entry['model'] == model] for model in model_names}
+        shape = (len(self.questions), max((len(ids) for ids in run_ids.values()), default=0), len(model_names))
+
+        correct = np.zeros(shape, dtype=bool)
+        observed = np.zeros(shape, dtype=bool)
+        for entry in entries:
+            m = model_names.index(entry['model'])
+            r = run_ids[entry['model']].index(entry['run_id'])
+            rows = slice(entry['offset'], entry['offset'] + entry['count'])
+            question = self._maps['question'][rows]
+            correct[question, r, m] = self._maps['correct'][rows].astype(bool)
+            observed[question, r, m] = True
+
+        present = [field for field in fields if field in self.questions.columns]
+        labels = self.questions.set_index('question_id')[present]
+        return CorrectnessTensor(correct, observed, self.questions['question_id'].tolist(), model_names,
+                                 run_ids, labels)
@@ -0,0 +1,267 @@
+"""Columnar results warehouse: run files converted to a Parquet dataset partitioned by model and run.
+
+Ingest is incremental (unchanged files are skipped) and can be repeated at any
+time; queries read only the partitions and row groups their filter can match::
+
+    python -m engine.warehouse ingest gemini25_evaluation_results o3_evaluation_results --root results_warehouse
+    python -m engine.warehouse query --root results_warehouse --filter "language == 'Hindi' and year == 2025" --by model
+
+Needs pyarrow.
+"""
+import argparse
+import ast
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Union
+from urllib.parse import quote
+
+import pandas as pd
+
+from .batch_scoring import read_run_file, run_files
+from .state import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+WAREHOUSE_VERSION = 1
+MANIFEST_NAME = '_ingested.json'
+# Low-cardinality text columns, stored dictionary-encoded
+DICTIONARY_COLUMNS = ('question_id', 'subject', 'question_type', 'language', 'paper', 'extraction_rule')
+# Rows are sorted on these within a run, so Parquet statistics let filters on them skip row groups
+SORT_COLUMNS = ('language', 'year', 'subject', 'question_type')
+ROW_GROUP_SIZE = 128
+
+COMPARISONS = {ast.Eq: '__eq__', ast.NotEq: '__ne__', ast.Lt: '__lt__', ast.LtE: '__le__',
+               ast.Gt: '__gt__', ast.GtE: '__ge__'}
+
+
+def _schema(dictionary: bool = True):
+    """Column types of a run table; DICTIONARY_COLUMNS are dictionary-encoded unless dictionary=False"""
+    import pyarrow as pa
+
+    fields = [
+        ('question_id', pa.string()), ('subject', pa.string()), ('question_type', pa.string()),
+        ('language', pa.string()), ('year', pa.int16()), ('paper', pa.string()), ('correct_answer', pa.string()),
+        ('predicted_answer', pa.string()), ('extraction_rule', pa.string()), ('is_correct', pa.bool_()),
+        ('inference_time', pa.float32()), ('total_tokens', pa.int32()), ('partial', pa.bool_()),
+        ('timestamp', pa.string()),
+    ]
+    return pa.schema([(name, pa.dictionary(pa.int32(), pa.string()) if dictionary and name in DICTIONARY_COLUMNS
+                       else column_type) for name, column_type in fields])
+
+
+def _optional_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _optional_str(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def run_table(run: Dict):
+    """Arrow table of one run (as read by read_run_file), sorted on SORT_COLUMNS"""
+    import pyarrow as pa
+
+    results = run['results']
+    columns = {
+        'question_id': [str(r.get('question_id')) for r in results],
+        'subject': [_optional_str(r.get('subject')) for r in results],
+        'question_type': [_optional_str(r.get('question_type')) for r in results],
+        'language': [_optional_str(r.get('language')) for r in results],
+        'year': [_optional_int(r.get('year')) for r in results],
+        'paper': [_optional_str(r.get('paper')) for r in results],
+        'correct_answer': [_optional_str(r.get('correct_answer')) for r in results],
+        'predicted_answer': [_optional_str(r.get('predicted_answer')) for r in results],
+        'extraction_rule': [_optional_str(r.get('extraction_rule')) for r in results],
+        'is_correct': [bool(r.get('is_correct')) for r in results],
+        'inference_time': [r.get('inference_time') for r in results],
+        'total_tokens': [_optional_int(r.get('total_tokens')) for r in results],
+        'partial': [run['partial']] * len(results),
+        'timestamp': [_optional_str(run['timestamp'])] * len(results),
+    }
+    # Arrow sorts plain strings only: sort first, then dictionary-encode
+    table = pa.Table.from_pydict(columns, schema=_schema(dictionary=False))
+    if len(table):
+        table = table.sort_by([(column, 'ascending') for column in SORT_COLUMNS])
+    return table.cast(_schema())
+
+
+class Warehouse:
+    """Parquet dataset of every ingested run, partitioned as ``model=<model>/run=<run_id>/``
+
+    Each run is one Parquet file, rewritten whole when it changes, with the
+    text columns dictionary-encoded and rows sorted by language, year, subject
+    and question type in small row groups. ``_ingested.json`` records the
+    size and mtime of every source file, so ingesting the same folders again
+    only reads new or grown files. Unfinished runs are ingested from their
+    partial files (rows flagged ``partial``) until the completed run file
+    replaces them; a partial file never overwrites a completed run.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manifest_file = self.root / MANIFEST_NAME
+        self.sources: Dict[str, Dict] = {}
+        if self.manifest_file.exists():
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != WAREHOUSE_VERSION:
+                raise ValueError(f"{self.manifest_file} has version {manifest.get('version')}, "
+                                 f"expected {WAREHOUSE_VERSION}; ingest into a new root")
+            self.sources = manifest['sources']
+
+    def partition(self, model: str, run_id: int) -> Path:
+        return self.root / f"model={quote(str(model), safe='')}" / f"run={int(run_id)}"
+
+    def _completed_runs(self) -> set:
+        return {(entry['model'], entry['run_id']) for entry in self.sources.values() if not entry['partial']}
+
+    def ingest(self, source: Union[str, Path, Iterable], model: Optional[str] = None,
+               include_partial: bool = True) -> int:
+        """Convert the run files of a directory (or the given files) that are new or changed; returns how many"""
+        import pyarrow.parquet as pq
+
+        completed = self._completed_runs()
+        written = 0
+        for path in run_files(source, include_partial):
+            key = str(path.resolve())
+            stat = os.stat(path)
+            signature = [stat.st_size, stat.st_mtime_ns]
+            if self.sources.get(key, {}).get('signature') == signature:
+                continue
+
+            run = read_run_file(path)
+            name = model or run['model']
+            run_id = _optional_int(run['run_id'])
+            if run_id is None:
+                logger.warning(f"Skipping {path}: no run id")
+                continue
+            entry = {'signature': signature, 'model': name, 'run_id': run_id, 'partial': run['partial'],
+                     'rows': len(run['results'])}
+            if run['partial'] and (name, run_id) in completed:
+                self.sources[key] = entry  # Stale partial file of a run that has completed
+                continue
+
+            partition = self.partition(name, run_id)
+            if partition.exists():
+                shutil.rmtree(partition)
+            partition.mkdir(parents=True)
+            temp_file = partition / 'part-0.parquet.tmp'
+            pq.write_table(run_table(run), temp_file, row_group_size=ROW_GROUP_SIZE, compression='zstd')
+            temp_file.replace(partition / 'part-0.parquet')
+
+            if not run['partial']:
+                completed.add((name, run_id))
+            self.sources[key] = entry
+            written += 1
+            # Record progress per file: a crash re-ingests at most the file being written
+            self._save()
+
+        if written:
+            logger.info(f"🗄️ Ingested {written} run files into {self.root}")
+        return written
+
+    def _save(self):
+        write_json_atomic(self.manifest_file, {'version': WAREHOUSE_VERSION, 'sources': self.sources})
+
+    def dataset(self):
+        """pyarrow dataset over every partition (model and run become columns)"""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        partitioning = ds.partitioning(pa.schema([('model', pa.string()), ('run', pa.int32())]), flavor='hive')
+        return ds.dataset(self.root, format='parquet', partitioning=partitioning,
+                          exclude_invalid_files=True, ignore_prefixes=['_', '.'])
+
+    def query(self, filter: Union[str, 'pyarrow.compute.Expression', None] = None,
+              columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Rows matching a filter such as "language == 'Hindi' and year == 2025", as a DataFrame
+
+        Filters on model and run skip whole partitions; filters on the sort
+        columns skip row groups by their statistics.
+        """
+        expression = parse_filter(filter) if isinstance(filter, str) else filter
+        table = self.dataset().to_table(columns=list(columns) if columns else None, filter=expression)
+        return table.to_pandas()
+
+    def accuracy(self, filter=None, by: Sequence[str] = ('model',)) -> pd.DataFrame:
+        """Answers, correct answers and accuracy (%) per group of the matching rows"""
+        by = list(by)
+        rows = self.query(filter, columns=[*by, 'is_correct'])
+        summary = rows.groupby(by, observed=True)['is_correct'].agg(['size', 'sum'])
+        summary.columns = ['answers', 'correct']
+        summary['accuracy'] = summary['correct'] / summary['answers'] * 100
+        return summary.reset_index()
+
+
+def _literal(node: ast.AST):
+    value = ast.literal_eval(node)
+    return list(value) if isinstance(value, (list, tuple, set)) else value
+
+
+def parse_filter(text: str):
+    """pyarrow expression of a Python-style filter over column names
+
+    Supports comparisons (==, !=, <, <=, >, >=, in, not in) of a column with a
+    literal, combined with and / or / not, e.g.
+    "language == 'Hindi' and year in (2024, 2025) and not is_correct".
+    """
+    import pyarrow.compute as pc
+
+    def convert(node: ast.AST):
+        if isinstance(node, ast.BoolOp):
+            values = [convert(value) for value in node.values]
+            combined = values[0]
+            for value in values[1:]:
+                combined = combined & value if isinstance(node.op, ast.And) else combined | value
+            return combined
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ~convert(node.operand)
+        if isinstance(node, ast.Name):
+            return pc.field(node.id) == True  # noqa: E712 - a boolean column on its own
+        if isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.left, ast.Name):
+            field, op, value = pc.field(node.left.id), node.ops[0], _literal(node.comparators[0])
+            if isinstance(op, ast.In):
+                return field.isin(value)
+            if isinstance(op, ast.NotIn):
+                return ~field.isin(value)
+            if type(op) in COMPARISONS:
+                return getattr(field, COMPARISONS[type(op)])(value)
+        raise ValueError(f"Unsupported filter expression: {ast.unparse(node)}")
+
+    return convert(ast.parse(text, mode='eval').body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    ingest = subparsers.add_parser('ingest', help="Convert new or changed run files")
+    ingest.add_argument('sources', nargs='+', help="Results directories or run files")
+    ingest.add_argument('--root', default='results_warehouse')
+    ingest.add_argument('--model', default=None, help="Model name to store instead of the one in the run files")
+    ingest.add_argument('--no-partial', action='store_true', help="Skip runs that have not completed")
+    query = subparsers.add_parser('query', help="Accuracy of the rows matching a filter")
+    query.add_argument('--root', default='results_warehouse')
+    query.add_argument('--filter', default=None, help="e.g. \"language == 'Hindi' and year == 2025\"")
+    query.add_argument('--by', nargs='+', default=['model'], help="Columns to group by")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    warehouse = Warehouse(args.root)
+    if args.command == 'ingest':
+        written = sum(warehouse.ingest(source, model=args.model, include_partial=not args.no_partial)
+                      for source in args.sources)
+        print(f"{written} run files ingested into {warehouse.root}")
+    else:
+        with pd.option_context('display.max_rows', None, 'display.width', 120):
+            print(warehouse.accuracy(args.filter, by=args.by).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# The shared evaluation engine lives in eval/engine
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from engine import MMJEE, Evaluator  # noqa: E402
+from engine.backends.random_baseline import RandomBaselineBackend  # noqa: E402
+
+
+class ScriptedBackend(RandomBaselineBackend):
+    """Random answers without latency, except for slow questions; no answer for failing ones
+
+    With ``stop_after`` set, the evaluator is asked to stop when that request is
+    sent. Requests already in flight still finish and are recorded, as after Ctrl-C.
+    """
+
+    def __init__(self, slow=(), fail=(), stop_after=None, num_workers=2, max_in_flight=3):
+        super().__init__(num_workers=num_workers, latency=None, max_in_flight=max_in_flight)
+        self.slow = set(slow)
+        self.fail = set(fail)
+        self.stop_after = stop_after
+        self.evaluator = None
+        self.calls = 0
+
+    async def generate(self, request):
+        self.calls += 1
+        if self.stop_after is not None and self.calls >= self.stop_after:
+            self.evaluator.stop_requested = True
+        await asyncio.sleep(0.05 if request.question_id in self.slow else 0.001)
+        if request.question_id in self.fail:
+            return None
+        return await super().generate(request)
+
+
+@pytest.fixture
+def questions():
+    """Ten image-only mmJEE questions"""
+    return pd.DataFrame([{'question_id': f'q{i}', 'question_type': 'MCQ-Single', 'answer': 'ABCD'[i % 4],
+                          'subject': 'Physics' if i % 2 else 'Chemistry', 'year': 2024, 'paper': 1,
+                          'language': 'English', 'image_filename': f'q{i}.png'} for i in range(10)])
+
+
+@pytest.fixture
+def make_evaluator(tmp_path, questions):
+    """Build an evaluator over the questions (in tmp_path by default); later calls with the same directory resume"""
+    def make(num_runs=3, pipeline_runs=False, partial_every=3, directory=None, **backend_options):
+        backend = ScriptedBackend(**backend_options)
+        evaluator = Evaluator(backend, questions, MMJEE, str(directory or tmp_path), 'scripted',
+                              num_runs=num_runs, random_seed=7, partial_every=partial_every,
+                              pipeline_runs=pipeline_runs)
+        backend.evaluator = evaluator
+        return evaluator
+    return make
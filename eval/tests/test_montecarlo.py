@@ -0,0 +1,66 @@
+"""Closed-form random baseline against RandomBaselineBackend answers scored by is_answer_correct"""
+import asyncio
+import math
+
+import numpy as np
+import pandas as pd
+
+from engine import MMJEE, extract_answer, is_answer_correct
+from engine.backends import GenerationRequest
+from engine.backends.random_baseline import RandomBaselineBackend
+from engine.montecarlo import SIMULATION_METHOD, RandomBaselineModel, format_random_baseline
+
+KEY = pd.DataFrame([
+    {'question_id': 'single', 'question_type': 'MCQ-Single', 'answer': 'B'},
+    {'question_id': 'matching', 'question_type': 'Matching', 'answer': 'D'},
+    {'question_id': 'multiple', 'question_type': 'MCQ-Multiple', 'answer': 'A, C'},
+    {'question_id': 'all', 'question_type': 'MCQ-Multiple', 'answer': 'ABCD'},
+    {'question_id': 'integer', 'question_type': 'Numerical', 'answer': '50'},
+    {'question_id': 'decimal', 'question_type': 'Numerical', 'answer': '0.5'},
+    {'question_id': 'range', 'question_type': 'Numerical', 'answer': '12', 'expanded_answer': '10-14',
+     'acceptable_values': '[10, 11, 12, 13, 14]'},
+    {'question_id': 'text', 'question_type': 'Numerical', 'answer': 'none'},
+])
+DRAWS = 10_000
+
+
+def _backend_hit_rates():
+    """Share of DRAWS random-backend responses per question that is_answer_correct accepts"""
+    backend = RandomBaselineBackend(latency=None)
+    verdicts = {}  # predicted -> is_answer_correct for the current question, which is deterministic
+
+    async def hit_rate(question_data):
+        question_id, question_type = question_data['question_id'], question_data['question_type']
+        kind = MMJEE.kind(question_type)
+        hits = 0
+        for run_seed in range(DRAWS):
+            request = GenerationRequest(prompt='', question_id=question_id, question_type=question_type, run_id=1,
+                                        run_seed=run_seed)
+            predicted = extract_answer(await backend.generate(request), kind)
+            if predicted not in verdicts:
+                verdicts[predicted] = is_answer_correct(predicted, question_data, MMJEE)
+            hits += verdicts[predicted]
+        verdicts.clear()
+        return hits / DRAWS
+
+    async def rates():
+        return [await hit_rate(question_data) for _, question_data in KEY.iterrows()]
+
+    return np.array(asyncio.run(rates()))
+
+
+def test_closed_form_matches_backend_answers_scored_by_is_answer_correct():
+    model = RandomBaselineModel(KEY, MMJEE)
+    observed = _backend_hit_rates()
+    for question_id, p, rate in zip(KEY['question_id'], model.hit_probability, observed):
+        tolerance = 4.5 * math.sqrt(p * (1 - p) / DRAWS) + 1e-3
+        assert abs(rate - p) <= tolerance, (question_id, p, rate)
+    assert model.hit_probability[KEY['question_id'].tolist().index('text')] == 0.0
+
+
+def test_simulation_is_centred_on_the_closed_form():
+    model = RandomBaselineModel(KEY, MMJEE)
+    summary = model.summary(num_runs=200_000, seed=1)
+    assert abs(summary['simulated_mean'] - model.expected_accuracy()) < 0.05
+    assert summary['simulation_method'] == SIMULATION_METHOD
+    assert SIMULATION_METHOD in format_random_baseline(summary)
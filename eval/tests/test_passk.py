@@ -0,0 +1,39 @@
+import math
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from engine.correctness import CorrectnessTensor
+from engine.passk import pass_at_k, run_metrics
+
+
+def _predictions(runs_per_model):
+    """Two questions per model; question q1 right in every run, q2 right in the first run only"""
+    rows = []
+    for model, runs in runs_per_model.items():
+        for run_id in range(1, runs + 1):
+            rows.append({'model': model, 'run_id': run_id, 'question_id': 'q1', 'is_correct': True, 'subject': 'x'})
+            rows.append({'model': model, 'run_id': run_id, 'question_id': 'q2', 'is_correct': run_id == 1,
+                         'subject': 'y'})
+    return pd.DataFrame(rows)
+
+
+def test_pass_at_k_is_nan_beyond_the_answered_runs():
+    estimates = pass_at_k(np.array([2, 4]), np.array([1, 1]), max_k=4)
+    assert np.allclose(estimates[1], [0.25, 0.5, 0.75, 1.0])
+    assert estimates[0, 0] == 0.5 and estimates[0, 1] == 1.0 and np.isnan(estimates[0, 2:]).all()
+
+
+def test_models_with_fewer_runs_than_max_k_get_nan_without_warnings():
+    tensor = CorrectnessTensor.from_predictions(_predictions({'long': 4, 'short': 2}), fields=('subject',))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        metrics = run_metrics(tensor, fields=('subject',)).set_index(['model', 'field', 'value'])
+
+    short = metrics.loc[('short', 'overall', 'all')]
+    assert short['pass@1'] == 75.0 and short['pass@2'] == 100.0
+    assert math.isnan(short['pass@3']) and math.isnan(short['pass@4'])
+    long = metrics.loc[('long', 'subject', 'y')]
+    assert long['pass@1'] == 25.0 and long['pass@4'] == 100.0
+    assert long['majority_vote'] == 0.0 and long['consistency'] == 75.0
@@ -0,0 +1,45 @@
+"""Pipelined runs: later runs answered early are held back, and runs close strictly in order, across a resume"""
+import asyncio
+import json
+
+
+def _answers(directory):
+    """(run_id, question_idx) -> (question_id, predicted answer) of every run file, and the run ids in file order"""
+    answers, run_ids = {}, []
+    for path in sorted(directory.glob('scripted_run_*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            run = json.load(f)
+        run_ids.append(run['run_id'])
+        for result in run['results']:
+            assert result['run_id'] == run['run_id']
+            answers[(run['run_id'], result['question_idx'])] = (result['question_id'], result['predicted_answer'])
+    return answers, run_ids
+
+
+def test_interrupted_pipelined_evaluation_resumes_to_complete_runs(tmp_path, make_evaluator):
+    # Slow questions keep run 1 open while the workers already answer run 2
+    slow = {'q0', 'q5'}
+    interrupted = make_evaluator(num_runs=3, pipeline_runs=True, slow=slow, stop_after=16,
+                                 directory=tmp_path / 'pipelined')
+    asyncio.run(interrupted.run_evaluation())
+    state = interrupted.state
+    assert any(state.pending_run_results.values()), "the interruption should leave a later run started early"
+    answered = len(state.current_run_results) + sum(len(results) for results in state.pending_run_results.values())
+    assert list((tmp_path / 'pipelined' / 'partial_results').iterdir())
+
+    resumed = make_evaluator(num_runs=3, pipeline_runs=True, slow=slow, directory=tmp_path / 'pipelined')
+    asyncio.run(resumed.run_evaluation())
+    assert resumed.backend.calls == 30 - sum(len(summary['results']) for summary in state.all_run_summaries) - answered
+    assert [summary['run_id'] for summary in resumed.state.all_run_summaries] == [1, 2, 3]
+    assert not list((tmp_path / 'pipelined' / 'partial_results').iterdir())
+
+    answers, run_ids = _answers(tmp_path / 'pipelined')
+    assert run_ids == [1, 2, 3]
+    for run_id in run_ids:
+        assert sorted(question_id for (run, _), (question_id, _) in answers.items() if run == run_id) == \
+            sorted(f'q{i}' for i in range(10))
+
+    # Same questions, order and answers as one uninterrupted sequential sweep
+    sequential = make_evaluator(num_runs=3, directory=tmp_path / 'sequential')
+    asyncio.run(sequential.run_evaluation())
+    assert answers == _answers(tmp_path / 'sequential')[0]
@@ -0,0 +1,57 @@
+"""GCRA rate limiting per API key, against an injected clock"""
+import pytest
+
+from engine.ratelimit import KeyRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_goes_out_at_once_then_requests_are_spaced():
+    clock = FakeClock()
+    limiter = KeyRateLimiter(60, burst=3, clock=clock)
+    assert [limiter.reserve() for _ in range(5)] == [0.0, 0.0, 0.0, 1.0, 2.0]
+    assert limiter.summary() == {'requests': 5, 'total_wait': 3.0, 'avg_wait': 0.6, 'max_wait': 2.0}
+
+
+def test_steady_state_spacing_and_idle_time_refills_only_the_burst():
+    clock = FakeClock()
+    limiter = KeyRateLimiter(120, clock=clock)
+    for _ in range(5):
+        assert limiter.ready_in() == 0.0
+        assert limiter.reserve() == 0.0
+        assert limiter.ready_in() == pytest.approx(0.5)
+        clock.now += 0.5
+
+    clock.now += 100.0
+    assert [limiter.reserve() for _ in range(3)] == pytest.approx([0.0, 0.5, 1.0])
+
+
+def test_token_budget_spaces_large_requests():
+    clock = FakeClock()
+    limiter = KeyRateLimiter(1000, tokens_per_minute=600, token_burst=100, clock=clock)
+    # Conformance is checked before charging: an idle bucket lets the first large request through
+    assert limiter.reserve(tokens=100) == 0.0
+    assert limiter.reserve(tokens=100) == pytest.approx(0.1)
+    assert limiter.reserve(tokens=100) == pytest.approx(10.1)
+    # The response used fewer tokens than estimated: the budget is credited back
+    limiter.settle(estimated_tokens=100, actual_tokens=50)
+    assert limiter.reserve(tokens=100) == pytest.approx(15.1)
+
+
+def test_keys_are_limited_independently():
+    clock = FakeClock()
+    busy, idle = (KeyRateLimiter(60, clock=clock) for _ in range(2))
+    assert [busy.reserve() for _ in range(3)] == [0.0, 1.0, 2.0]
+    busy.penalize(30.0)
+    assert busy.ready_in() == pytest.approx(30.0)
+    assert idle.ready_in() == 0.0 and idle.reserve() == 0.0
+
+    clock.now = 10.0
+    assert busy.reserve() == pytest.approx(20.0)
+    assert idle.reserve() == 0.0
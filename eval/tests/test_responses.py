@@ -0,0 +1,65 @@
+"""ResponseStore round trips, with zstd when installed and with the zlib fallback"""
+import asyncio
+import sys
+
+import pytest
+
+from engine.responses import ResponseStore
+
+LONG = "Let us think step by step. " * 40 + "\\boxed{B}"
+SHORT = "\\boxed{A}"
+HINDI = "अंतिम उत्तर: (ख) " * 20
+
+
+def _round_trip(store):
+    for question_id, text in (('q1', LONG), ('q2', SHORT), (3, HINDI)):
+        store.put('model', 1, question_id, text)
+    store.put('model', 2, 'q1', SHORT)
+
+    assert store.get('model', 1, 'q1') == LONG
+    assert store.get('model', 1, '3') == HINDI
+    assert store.get('model', 1, 'missing') is None
+    assert store.get_run('model', 1) == {'q1': LONG, 'q2': SHORT, '3': HINDI}
+    assert store.response_sizes('model', 1) == {'q1': len(LONG), 'q2': len(SHORT), '3': len(HINDI)}
+
+    results = store.fill([{'model': 'model', 'run_id': 2, 'question_id': 'q1'},
+                          {'model': 'model', 'run_id': 2, 'question_id': 'q9'}])
+    assert results == [{'model': 'model', 'run_id': 2, 'question_id': 'q1', 'full_response': SHORT},
+                       {'model': 'model', 'run_id': 2, 'question_id': 'q9'}]
+    stats = store.stats()
+    assert stats['responses'] == 4 and stats['ratio'] > 1
+
+
+def test_round_trip(tmp_path):
+    store = ResponseStore(tmp_path / 'responses.sqlite')
+    _round_trip(store)
+    store.close()
+    # Reopened, e.g. by the run loader
+    assert ResponseStore(tmp_path / 'responses.sqlite').get('model', 1, 'q1') == LONG
+
+
+def test_zlib_fallback_without_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'zstandard', None)
+    store = ResponseStore(tmp_path / 'responses.sqlite')
+    assert store.zstd is None
+    _round_trip(store)
+    codecs = dict(store.conn.execute("SELECT question_id, codec FROM responses WHERE run_id = 1").fetchall())
+    # Short responses do not shrink and are kept as they are
+    assert codecs == {'q1': 'zlib', 'q2': 'raw', '3': 'zlib'}
+
+    store.conn.execute("INSERT INTO responses VALUES ('model', 3, 'q1', 'zstd', 0, 1, x'00')")
+    with pytest.raises(RuntimeError, match='zstandard'):
+        store.get('model', 3, 'q1')
+    with pytest.raises(RuntimeError, match='zstandard'):
+        store.train_dictionary()
+
+
+def test_concurrent_puts_from_worker_threads(tmp_path):
+    store = ResponseStore(tmp_path / 'responses.sqlite')
+
+    async def put_all():
+        await asyncio.gather(*(asyncio.to_thread(store.put, 'model', 1, f'q{i}', f"{LONG} {i}")
+                               for i in range(200)))
+
+    asyncio.run(put_all())
+    assert store.get_run('model', 1) == {f'q{i}': f"{LONG} {i}" for i in range(200)}
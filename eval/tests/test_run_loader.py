@@ -0,0 +1,51 @@
+import json
+
+from engine.responses import ResponseStore
+from engine.run_loader import AllOf, LongerThan, _filter_key, is_incorrect, iter_results, load_runs
+
+
+def _write_run(directory, run_id, results, **header):
+    path = directory / f"o3_run_{run_id:02d}_20250101_000000.json"
+    path.write_text(json.dumps({'run_id': run_id, 'model': 'o3', **header, 'results': results}, indent=2))
+    return path
+
+
+def _results(count):
+    return [{'question_id': str(i), 'model': 'o3', 'run_id': 1, 'is_correct': i % 3 == 0,
+             'full_response': 'x' * (10 * i)} for i in range(count)]
+
+
+def test_filtered_stream_matches_json_load(tmp_path):
+    results = _results(20)
+    path = _write_run(tmp_path, 1, results, total_questions=20)
+    assert list(iter_results(path)) == results
+    assert list(iter_results(path, is_incorrect)) == [result for result in results if not result['is_correct']]
+    frame = load_runs(tmp_path, where=AllOf((is_incorrect, LongerThan(70))), run_fields=('total_questions',),
+                      workers=0)
+    assert frame['question_id'].tolist() == ['8', '10', '11', '13', '14', '16', '17', '19']
+    assert set(frame['total_questions']) == {20}
+
+
+def test_only_filters_with_a_stable_key_are_cached(tmp_path):
+    assert _filter_key(AllOf((is_incorrect, LongerThan(70)))) == _filter_key(AllOf((is_incorrect, LongerThan(70))))
+    assert _filter_key(LongerThan(70)) != _filter_key(LongerThan(80))
+    assert _filter_key(lambda result: True) is None
+
+    _write_run(tmp_path, 1, _results(10))
+    # Two lambdas share a qualname; each must be applied, not served from the other's cache entry
+    assert len(load_runs(tmp_path, where=lambda result: result['is_correct'], workers=0)) == 4
+    assert len(load_runs(tmp_path, where=lambda result: not result['is_correct'], workers=0)) == 6
+
+
+def test_longer_than_reads_lengths_from_the_response_store(tmp_path):
+    store = ResponseStore(tmp_path / 'responses.sqlite')
+    results = []
+    for result in _results(10):
+        store.put('o3', 1, result['question_id'], result.pop('full_response'))
+        results.append({**result, 'response_store': 'responses.sqlite'})
+    store.close()
+    path = _write_run(tmp_path, 1, results)
+
+    kept = [result['question_id'] for result in iter_results(path, AllOf((is_incorrect, LongerThan(70))))]
+    assert kept == ['8']
+    assert load_runs(tmp_path, where=LongerThan(70), workers=0)['question_id'].tolist() == ['8', '9']
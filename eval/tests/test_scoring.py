@@ -0,0 +1,137 @@
+"""Parity of the answer key and batch scorer with is_answer_correct, and of answer extraction"""
+import re
+
+import pandas as pd
+import pytest
+
+from engine import MMJEE, AnswerKey, BatchScorer, extract_answer, extract_answer_with_rule, is_answer_correct
+from engine.datasets import MULTIPLE, NUMERICAL, SINGLE
+
+QUESTIONS = pd.DataFrame([
+    {'question_id': 'single', 'question_type': 'MCQ-Single', 'answer': 'B'},
+    {'question_id': 'matching', 'question_type': 'Matching', 'answer': ' c '},
+    {'question_id': 'multiple', 'question_type': 'MCQ-Multiple', 'answer': 'A, C'},
+    {'question_id': 'numerical', 'question_type': 'Numerical', 'answer': '0.5'},
+    {'question_id': 'large', 'question_type': 'Numerical', 'answer': '250'},
+    {'question_id': 'range', 'question_type': 'Numerical', 'answer': '1.5', 'expanded_answer': '1.4-1.6',
+     'acceptable_values': '[1.4, 1.5, 1.6]'},
+    {'question_id': 'malformed', 'question_type': 'Numerical', 'answer': '2', 'expanded_answer': 'yes',
+     'acceptable_values': '[1.5, oops]'},
+    {'question_id': 'text', 'question_type': 'Numerical', 'answer': 'ABC'},
+])
+
+PREDICTIONS = ['A', 'B', ' b ', 'C', 'AC', 'CA', 'A,C', 'ACD', '', 'nan', 'inf', '0.5', '.5', '0.505', '0.52',
+               '252', '253', '247.5', '1.4', '1.45', '1.6', '2', '1.5', 'abc', 'ABC', 'x', '-0.5', '1e3']
+
+
+def _rows():
+    return [(question_data, predicted) for _, question_data in QUESTIONS.iterrows() for predicted in PREDICTIONS]
+
+
+def test_answer_key_matches_is_answer_correct():
+    key = AnswerKey.from_frame(QUESTIONS, MMJEE)
+    for question_data, predicted in _rows():
+        expected = is_answer_correct(predicted, question_data, MMJEE)
+        assert key.is_correct(question_data['question_id'], predicted) == expected, (question_data['question_id'],
+                                                                                     predicted)
+
+
+@pytest.mark.parametrize('question_id, predicted, expected', [
+    ('multiple', 'CA', True), ('numerical', '0.505', True), ('large', '252.5', True), ('large', '253', False),
+    ('range', '1.45', False), ('malformed', '2.01', True), ('text', 'abc', True),
+])
+def test_answer_key_verdicts(question_id, predicted, expected):
+    assert AnswerKey.from_frame(QUESTIONS, MMJEE).is_correct(question_id, predicted) is expected
+
+
+def test_batch_scorer_matches_is_answer_correct():
+    rows = _rows()
+    scored = BatchScorer(AnswerKey.from_frame(QUESTIONS, MMJEE)).score(
+        [question_data['question_id'] for question_data, _ in rows] + ['unknown'],
+        [predicted for _, predicted in rows] + ['A'])
+    expected = [is_answer_correct(predicted, question_data, MMJEE) for question_data, predicted in rows] + [False]
+    assert scored.tolist() == expected
+
+
+# (response, question id, extracted answer, rule)
+RESPONSES = [
+    ("Only (B) fits.\n\\boxed{B}", 'single', 'B', 'boxed'),
+    ("Draft \\boxed{A}, but rechecking the sign: \\boxed{B}", 'single', 'B', 'boxed'),
+    ("So the answer is \\boxed{B} and then \\boxed{C", 'single', 'B', 'boxed'),
+    ("\\boxed{B}\n\\boxed{ }", 'single', 'B', 'boxed'),
+    ("\\boxed{\\text{(A), (C)}}", 'multiple', 'AC', 'boxed'),
+    ("\\boxed{\\mathrm{C}}", 'matching', 'C', 'boxed'),
+    ("\\boxed{\\frac{1}{2}}", 'numerical', '0.5', 'boxed'),
+    ("\\boxed{-\\dfrac{3}{2}}", 'numerical', '-1.5', 'boxed'),
+    ("\\boxed{\\frac{1}{0}}", 'numerical', '1', 'boxed'),
+    ("\\boxed{(ख)}", 'single', 'B', 'boxed'),
+    ("\\boxed{ख}", 'single', 'B', 'boxed'),
+    ("\\boxed{क, घ}", 'multiple', 'AD', 'boxed'),
+    ("विकल्प देखें।\nअंतिम उत्तर: (ग)", 'matching', 'C', 'hindi:0'),
+    ("उत्तर है: (क) और (ग)", 'multiple', 'AC', 'hindi:1'),
+    ("\\boxed{२५०}", 'large', '250', 'boxed'),
+    ("\\boxed{$1.5$}", 'range', '1.5', 'boxed'),
+    ("Answer: 1.45\nTherefore, 1.6 is wrong", 'range', '1.45', 'pattern:1'),
+    ("Therefore, the value is 0.5", 'numerical', '0.5', 'pattern:4'),
+    ("Therefore, the Answer: B", 'single', 'B', 'pattern:1'),
+    ("Answer: A\nTherefore, C", 'single', 'A', 'pattern:1'),
+    ("Working...\n(C), (A)", 'multiple', 'AC', 'last_line'),
+]
+
+
+def _kind(question_id):
+    return MMJEE.kind(QUESTIONS.set_index('question_id').loc[question_id, 'question_type'])
+
+
+@pytest.mark.parametrize('response, question_id, answer, rule', RESPONSES)
+def test_extraction(response, question_id, answer, rule):
+    assert extract_answer_with_rule(response, _kind(question_id)) == (answer, rule)
+
+
+@pytest.mark.parametrize('response, question_id, answer, rule', RESPONSES)
+def test_scores_of_extracted_answers_agree(response, question_id, answer, rule):
+    question_data = QUESTIONS.set_index('question_id', drop=False).loc[question_id]
+    predicted = extract_answer(response, _kind(question_id))
+    expected = is_answer_correct(predicted, question_data, MMJEE)
+    assert AnswerKey.from_frame(QUESTIONS, MMJEE).is_correct(question_id, predicted) == expected
+    assert BatchScorer(AnswerKey.from_frame(QUESTIONS, MMJEE)).score([question_id], [predicted]).tolist() == [expected]
+
+
+def _previous_extract_answer(response_text, kind):
+    """extract_answer as it was before brace-aware extraction (first box, first pattern in list order)"""
+    boxed_match = re.search(r'\\boxed\{([^}]+)\}', response_text)
+    if boxed_match:
+        answer = boxed_match.group(1).strip()
+    else:
+        answer = None
+        for pattern in [r'\*\*Answer:\*\*\s*(.+)', r'Answer:\s*(.+)', r'Final answer:\s*(.+)',
+                        r'The answer is:\s*(.+)', r'Therefore,?\s*(.+)']:
+            match = re.search(pattern, response_text, re.IGNORECASE)
+            if match:
+                answer = match.group(1).strip()
+                break
+        if not answer:
+            answer = response_text.strip().split('\n')[-1].strip()
+    if kind == SINGLE:
+        match = re.search(r'[ABCD]', answer.upper())
+        return match.group(0) if match else answer[:10]
+    if kind == MULTIPLE:
+        letters = sorted(set(re.findall(r'[ABCD]', answer.upper())))
+        return ''.join(letters) if letters else answer[:20]
+    if kind == NUMERICAL:
+        number_match = re.search(r'-?\d+\.?\d*', answer)
+        return number_match.group(0) if number_match else answer[:20]
+    return answer[:50]
+
+
+@pytest.mark.parametrize('response, question_id', [
+    ("\\boxed{B}", 'single'), ("Reasoning...\n\\boxed{ C }", 'matching'), ("\\boxed{A, C}", 'multiple'),
+    ("**Answer:** (A) (C) (D)", 'multiple'), ("Final answer: 252", 'large'), ("\\boxed{1.4}", 'range'),
+    ("The answer is: 0.52", 'numerical'), ("Therefore, 250 J", 'large'), ("no marker\n\n1.5", 'range'),
+    ("Therefore, the Answer: B", 'single'),
+])
+def test_plain_responses_score_as_before(response, question_id):
+    question_data = QUESTIONS.set_index('question_id', drop=False).loc[question_id]
+    kind = _kind(question_id)
+    assert is_answer_correct(extract_answer(response, kind), question_data, MMJEE) == \
+        is_answer_correct(_previous_extract_answer(response, kind), question_data, MMJEE)
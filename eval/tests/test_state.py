@@ -0,0 +1,143 @@
+"""Checkpointing: header + journal, compaction, crash recovery and migration from pickled states"""
+import asyncio
+import json
+import pickle
+
+from engine.state import StateStore, new_state, run_file_name, write_json_atomic
+
+
+def _result(run_id, question_idx):
+    return {'run_id': run_id, 'question_idx': question_idx, 'question_id': f'q{question_idx}', 'is_correct': True}
+
+
+def _journal_runs(store):
+    with open(store.journal_file, 'r', encoding='utf-8') as f:
+        return [json.loads(line)['run_id'] for line in f]
+
+
+def _crash(evaluator):
+    """Run until the backend stops the evaluator, then die without the final header save"""
+    evaluator.save_state = lambda: None
+    asyncio.run(evaluator.run_evaluation())
+    evaluator.state_store.close()
+
+
+def _run_files(directory):
+    runs = {}
+    for path in sorted(directory.glob('scripted_run_*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            runs[path.name] = json.load(f)
+    return runs
+
+
+def test_resume_after_a_crash_mid_run_asks_only_the_open_questions(tmp_path, make_evaluator):
+    crashed = make_evaluator(num_runs=2, stop_after=14)
+    _crash(crashed)
+    assert crashed.state.current_run == 2
+    answered = {r['question_idx']: r for r in crashed.state.current_run_results}
+    assert 0 < len(answered) < 10
+
+    resumed = make_evaluator(num_runs=2)
+    assert resumed.state.current_run == 2
+    assert {r['question_idx']: r for r in resumed.state.current_run_results} == answered
+    asyncio.run(resumed.run_evaluation())
+
+    assert resumed.backend.calls == 10 - len(answered)
+    runs = _run_files(tmp_path)
+    assert len(runs) == 2
+    for run in runs.values():
+        assert sorted(r['question_idx'] for r in run['results']) == list(range(10))
+    run_2 = next(run for run in runs.values() if run['run_id'] == 2)
+    assert all(run_2['results'][idx] == result for idx, result in answered.items())
+
+
+def test_torn_last_journal_line_is_skipped_and_the_next_record_survives(tmp_path):
+    store = StateStore(tmp_path)
+    store.save(new_state(30))
+    for question_idx in range(3):
+        store.append('result', _result(1, question_idx))
+    store.close()
+    with open(store.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"record": "result", "run_id": 1, "quest')
+
+    store = StateStore(tmp_path)
+    state = store.load()
+    assert [r['question_idx'] for r in state.current_run_results] == [0, 1, 2]
+    store.append('result', _result(1, 3))
+    store.close()
+    assert [r['question_idx'] for r in StateStore(tmp_path).load().current_run_results] == [0, 1, 2, 3]
+
+
+def test_compaction_keeps_only_open_runs(tmp_path):
+    store = StateStore(tmp_path)
+    state = new_state(30)
+    for run_id in (1, 2, 3):
+        for question_idx in range(2):
+            store.append('result', _result(run_id, question_idx))
+    summary = {'run_id': 1, 'model': 'm', 'timestamp': '20250101_000000', 'accuracy': 100.0,
+               'results': [_result(1, 0), _result(1, 1)]}
+    write_json_atomic(tmp_path / run_file_name(summary), summary)
+    state.all_run_summaries.append(summary)
+    state.current_run = 2
+    state.current_run_results = [_result(2, 0), _result(2, 1)]
+    state.pending_run_results = {3: [_result(3, 0), _result(3, 1)]}
+
+    store.compact(state)
+    assert _journal_runs(store) == [2, 2, 3, 3]
+
+    loaded = StateStore(tmp_path).load()
+    assert loaded.current_run == 2 and loaded.completed_questions == 6
+    assert loaded.all_run_summaries == [summary]
+    assert loaded.current_run_results == state.current_run_results
+    assert loaded.pending_run_results == state.pending_run_results
+
+
+def test_pickled_state_is_migrated_and_resumed(tmp_path, make_evaluator):
+    crashed = make_evaluator(num_runs=2, stop_after=14, directory=tmp_path / 'old')
+    _crash(crashed)
+    legacy = crashed.state
+    answered = len(legacy.current_run_results)
+    # Pickles from older versions predate pipelining and the running statistics
+    del legacy.pending_run_results, legacy.stats
+    migrated_dir = tmp_path / 'migrated'
+    migrated_dir.mkdir()
+    with open(migrated_dir / 'evaluation_state.pkl', 'wb') as f:
+        pickle.dump(legacy, f)
+
+    resumed = make_evaluator(num_runs=2, directory=migrated_dir)
+    store = resumed.state_store
+    assert store.header_file.exists() and _journal_runs(store) == [2] * answered
+    assert (migrated_dir / run_file_name(legacy.all_run_summaries[0])).exists()
+    assert resumed.state.current_run == 2 and len(resumed.state.current_run_results) == answered
+
+    asyncio.run(resumed.run_evaluation())
+    assert resumed.backend.calls == 10 - answered
+    runs = _run_files(migrated_dir)
+    assert sorted(run['run_id'] for run in runs.values()) == [1, 2]
+    assert all(sorted(r['question_idx'] for r in run['results']) == list(range(10)) for run in runs.values())
+
+
+def test_failed_questions_are_not_duplicated_on_replay(tmp_path, make_evaluator):
+    failure = {'run_id': 1, 'question_idx': 4, 'question_id': 'q4'}
+    store = StateStore(tmp_path)
+    store.save(new_state(30))
+    # Journaled twice (the question failed again on a retry) and never saved into the header before a crash
+    store.append('failed', failure)
+    store.append('failed', failure)
+    store.close()
+    state = StateStore(tmp_path).load()
+    assert state.failed_questions == [failure]
+    StateStore(tmp_path).save(state)
+    assert StateStore(tmp_path).load().failed_questions == [failure]
+
+    evaluator = make_evaluator(num_runs=1, fail={'q3'}, directory=tmp_path / 'run')
+    asyncio.run(evaluator.run_evaluation())
+    assert [entry['question_id'] for entry in evaluator.state.failed_questions] == ['q3']
+    assert [entry['question_id'] for entry in StateStore(tmp_path / 'run').load().failed_questions] == ['q3']
+
+
+def test_header_is_on_disk_before_it_replaces_the_old_one(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr('engine.state.os.fsync', synced.append)
+    write_json_atomic(tmp_path / 'header.json', {'current_run': 2})
+    assert synced and json.loads((tmp_path / 'header.json').read_text()) == {'current_run': 2}
@@ -0,0 +1,24 @@
+from engine import AccuracyAccumulator, StoppingRule
+
+
+def _run(accuracy, tokens=0, duration=60.0):
+    return {'accuracy': accuracy, 'duration': duration, 'results': [{'is_correct': True, 'total_tokens': tokens}]}
+
+
+def test_stops_on_ci_width_after_min_runs():
+    rule = StoppingRule(target_ci_width=2.0, min_runs=3)
+    stats = AccuracyAccumulator()
+    reasons = []
+    for accuracy in [50.0, 50.2, 49.9, 50.1]:
+        stats.add_run(_run(accuracy))
+        reasons.append(rule.check(stats))
+    assert reasons[:2] == [None, None] and reasons[2].startswith('95% CI width')
+
+
+def test_budgets_use_running_totals():
+    stats = AccuracyAccumulator()
+    stats.add_run(_run(40.0, tokens=600, duration=1800))
+    stats.add_run(_run(60.0, tokens=500, duration=1800))
+    assert StoppingRule(target_ci_width=None, max_tokens=1000).check(stats).startswith('token budget')
+    assert StoppingRule(target_ci_width=None, max_hours=1.0).check(stats).startswith('time budget')
+    assert StoppingRule(target_ci_width=None, max_relative_change=1.0, min_runs=2).check(stats) is None
@@ -0,0 +1,25 @@
+from engine.scoring import StreamingExtractor
+
+
+def test_padding_in_the_chunk_that_closes_the_box_counts_towards_the_cut_off():
+    extractor = StreamingExtractor(stop_after_tokens=20)
+    assert extractor.feed("\\boxed{A}" + " pad" * 50)
+    assert extractor.cut_off and extractor.answer == 'A'
+    assert extractor.tokens_after_answer == 50
+
+
+def test_box_split_across_chunks():
+    extractor = StreamingExtractor(stop_after_tokens=5)
+    assert not extractor.feed("Thinking... \\bo")
+    assert not extractor.feed("xed{\\frac{1}")
+    assert not extractor.feed("{2}} ok")
+    assert extractor.answer == '\\frac{1}{2}'
+    assert extractor.feed(" padding" * 3)
+
+
+def test_a_new_box_resets_the_count():
+    extractor = StreamingExtractor(stop_after_tokens=10)
+    assert not extractor.feed("\\boxed{A}" + "x" * 36)
+    assert not extractor.feed("\\boxed{B}")
+    assert extractor.answer == 'B' and extractor.tokens_after_answer == 0
+    assert extractor.feed("y" * 40)